@@ -0,0 +1,145 @@
+#----------------------------------------------------------------------------
+# actions.py - action backends the routes file can name, discovered up front and imported on first use
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from functools import partial
+import importlib
+import os
+import pkgutil
+import threading
+import time
+
+# modules named backend_<name>.py next to this file provide the action <name>
+BACKEND_PREFIX='backend_'
+
+# action names routes.json has always used -> backend providing them
+ACTION_BACKENDS={'request': 'voicemonkey', 'presentation': 'presentation'}
+
+# backend standing in for one that cannot load here (no PowerPoint on Linux), only logs the actions
+FALLBACK_BACKEND='stub'
+
+def discoverBackends(directory=None):
+    """
+    discoverBackends() lists the backend modules without importing them
+
+    :param directory: where to look (defaults to the directory of this file)
+    :return: {backend name: module name}
+    """
+    if directory is None:
+        directory = os.path.dirname(os.path.abspath(__file__))
+    return {name[len(BACKEND_PREFIX):]: name for _, name, _ in pkgutil.iter_modules([directory])
+        if name.startswith(BACKEND_PREFIX)}
+
+class ActionBackends:
+    """
+    ActionBackends hands the router one function per action name. The module
+    behind an action is only imported and its backend set up when prepare()
+    is called for it (a mode using it was entered) or when it first runs, so
+    starting up never pays for PowerPoint, HTTP sessions or anything else the
+    session does not use. A backend that fails to load is replaced by the
+    stub, which logs the actions it is asked for
+
+    A backend module provides createBackend(name) returning an object with
+    run(argument, issuedAt=None), and optionally close() and counters(). createBackend() may
+    run on a background thread and run() on the frame loop, so a backend tied
+    to the thread that made it (COM) keeps its own worker thread
+    """
+
+    def __init__(self, aliases=ACTION_BACKENDS, fallback=FALLBACK_BACKEND, directory=None, verbose=True):
+        """
+        :param aliases: action name -> backend name, on top of every backend under its own name
+        :param fallback: backend used for one that cannot load (None = raise)
+        :param directory: where the backend modules are (defaults to the directory of this file)
+        :param verbose: print backends that could not load and actions that failed
+        """
+        self.modules = discoverBackends(directory)
+        self.names = {name: name for name in self.modules}
+        self.names.update({action: backend for action, backend in aliases.items() if backend in self.modules})
+        self.fallback = fallback if fallback in self.modules else None
+        self.verbose = verbose
+        self.backends = {}
+        self.locks = {name: threading.Lock() for name in self.modules}
+        self.loadTimes = {}
+        self.counts = {'runs': 0, 'failed': 0, 'fallbacks': 0}
+
+    def actions(self):
+        """
+        actions() builds the action registry CommandRouter compiles routes against
+
+        :return: action name -> function(argument)
+        """
+        return {action: partial(self.run, action) for action in self.names}
+
+    def prepare(self, actionNames):
+        """
+        prepare() loads the backends of actions on background threads, so the
+        first command of a mode does not wait for them
+
+        :param actionNames: actions about to be used
+        """
+        for name in set(self.names[action] for action in actionNames if action in self.names):
+            if name not in self.backends:
+                threading.Thread(target=self.backend, args=(name,), name='backend-' + name, daemon=True).start()
+
+    def backend(self, name):
+        """
+        backend() imports and sets up a backend the first time it is asked
+        for (callers asking while it loads wait for it)
+
+        :param name: backend name
+        :return: backend
+        """
+        backend = self.backends.get(name)
+        if backend is not None:
+            return backend
+        with self.locks[name]:
+            if name not in self.backends:
+                start = time.perf_counter()
+                try:
+                    backend = importlib.import_module(self.modules[name]).createBackend(name)
+                except Exception as error:
+                    if self.fallback is None or name == self.fallback:
+                        raise
+                    self.log('Warning: ' + name + ' actions unavailable (' + str(error) + '), using ' + self.fallback + '.')
+                    backend = importlib.import_module(self.modules[self.fallback]).createBackend(name)
+                    self.counts['fallbacks'] += 1
+                self.loadTimes[name] = time.perf_counter() - start
+                self.backends[name] = backend
+        return self.backends[name]
+
+    def run(self, action, argument=None, issuedAt=None):
+        """
+        run() issues an action, loading its backend first if needed; a failed
+        action is reported instead of stopping the frame loop
+
+        :param action: action name
+        :param argument: argument from the route (None when it has none)
+        :param issuedAt: time.perf_counter() the gesture was recognized at (None = now)
+        """
+        backend = self.backend(self.names[action])
+        self.counts['runs'] += 1
+        try:
+            backend.run(argument, issuedAt)
+        except Exception as error:
+            self.counts['failed'] += 1
+            self.log('Error: ' + action + ' action failed (' + str(error) + ').')
+
+    def close(self):
+        for backend in list(self.backends.values()):
+            if hasattr(backend, 'close'):
+                backend.close()
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def counters(self):
+        counters = dict(self.counts, loaded=sorted(self.backends),
+            load_ms={name: round(seconds*1e3, 1) for name, seconds in self.loadTimes.items()})
+        for name, backend in list(self.backends.items()):
+            if hasattr(backend, 'counters'):
+                counters[name] = backend.counters()
+        return counters
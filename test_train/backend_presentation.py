@@ -0,0 +1,114 @@
+#----------------------------------------------------------------------------
+# backend_presentation.py - action backend driving a PowerPoint slide show (Windows)
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import queue
+import threading
+import pythoncom
+import win32com.client
+
+# presentation opened when the first presentation action is needed
+## input your presentation here
+PRESENTATION_PATH=u'C:\\Users\\$USERNAME\\Downloads\\$NAME_OF_PRESENTATION.pptx'
+
+# slide show commands routes.json can name
+COMMANDS=('start', 'next', 'previous', 'exit')
+
+# seconds close() waits for the queued commands to finish
+CLOSE_TIMEOUT=5
+
+class PresentationBackend:
+    """
+    PresentationBackend opens the presentation in PowerPoint over COM and
+    runs the slide show commands routes.json names (start, next, previous, exit).
+    COM objects belong to the thread that created them, so PowerPoint is
+    opened and driven from one worker thread that initializes COM, and run()
+    only queues the command for it (it may be called from any thread)
+    """
+
+    def __init__(self, path=PRESENTATION_PATH):
+        """
+        :param path: presentation to open (read-only), raises when PowerPoint cannot open it
+        """
+        self.path = path
+        self.commands = queue.Queue()
+        self.ready = threading.Event()
+        self.error = None
+        self.runs = 0
+        self.failed = 0
+        self.thread = threading.Thread(target=self.comLoop, name='presentation-com', daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def comLoop(self):
+        """
+        comLoop() opens the presentation and runs queued commands, on the
+        one thread that touches COM
+        """
+        pythoncom.CoInitialize()
+        try:
+            try:
+                self.app = win32com.client.Dispatch("PowerPoint.Application")
+                self.presentation = self.app.Presentations.Open(FileName=self.path, ReadOnly=1)
+            except Exception as error:
+                self.error = error
+                return
+            finally:
+                self.ready.set()
+            while True:
+                command = self.commands.get()
+                if command is None:
+                    return
+                try:
+                    getattr(self, command)()
+                    self.runs += 1
+                except Exception as error:
+                    self.failed += 1
+                    print('Error: presentation ' + command + ' failed (' + str(error) + ').')
+        finally:
+            pythoncom.CoUninitialize()
+
+    def run(self, command, issuedAt=None):
+        """
+        run() queues a slide show command
+
+        :param command: 'start', 'next', 'previous' or 'exit'
+        :param issuedAt: time the gesture was recognized (unused)
+        """
+        if command not in COMMANDS:
+            raise ValueError('unknown presentation command: ' + str(command))
+        self.commands.put(command)
+
+    def start(self):
+        self.presentation.SlideShowSettings.Run()
+
+    def next(self):
+        self.presentation.SlideShowWindow.View.Next()
+
+    def previous(self):
+        self.presentation.SlideShowWindow.View.Previous()
+
+    def exit(self):
+        self.presentation.SlideShowWindow.View.Exit()
+        self.app.Quit()
+
+    def close(self):
+        self.commands.put(None)
+        self.thread.join(CLOSE_TIMEOUT)
+
+    def counters(self):
+        return {'runs': self.runs, 'failed': self.failed, 'queued': self.commands.qsize()}
+
+def createBackend(name):
+    """
+    createBackend() opens the presentation (called by ActionBackends on first use)
+
+    :param name: backend name it was loaded under
+    :return: PresentationBackend
+    """
+    return PresentationBackend()
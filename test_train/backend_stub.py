@@ -0,0 +1,46 @@
+#----------------------------------------------------------------------------
+# backend_stub.py - action backend that only logs, for machines without the real one and for trying routes
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+class StubBackend:
+    """
+    StubBackend prints the actions it is asked for instead of running them
+    """
+
+    def __init__(self, name, verbose=True):
+        """
+        :param name: action it stands in for
+        :param verbose: print every action
+        """
+        self.name = name
+        self.verbose = verbose
+        self.runs = 0
+        self.last = None
+
+    def run(self, argument=None, issuedAt=None):
+        """
+        run() logs the action
+
+        :param argument: argument from the route
+        :param issuedAt: time the gesture was recognized (unused)
+        """
+        self.runs += 1
+        self.last = argument
+        if self.verbose:
+            print('Action (stub): ' + self.name + ('' if argument is None else ' ' + repr(argument)))
+
+    def counters(self):
+        return {'runs': self.runs, 'last': self.last}
+
+def createBackend(name):
+    """
+    createBackend() sets up the stub (called by ActionBackends on first use,
+    and for backends that could not load)
+
+    :param name: action it stands in for
+    :return: StubBackend
+    """
+    return StubBackend(name)
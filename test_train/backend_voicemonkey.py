@@ -0,0 +1,41 @@
+#----------------------------------------------------------------------------
+# backend_voicemonkey.py - action backend sending VoiceMonkey/Alexa requests in the background
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from dispatch import ActionDispatcher
+
+class VoiceMonkeyBackend:
+    """
+    VoiceMonkeyBackend queues every request on an ActionDispatcher, so the
+    frame loop never waits on the network
+    """
+
+    def __init__(self):
+        self.dispatcher = ActionDispatcher().start()
+
+    def run(self, url, issuedAt=None):
+        """
+        run() queues an API call to Alexa's services/systems
+
+        :param url: VoiceMonkey API url call
+        :param issuedAt: time.perf_counter() the gesture was recognized at, latency is measured from it
+        """
+        self.dispatcher.request(url, issuedAt=issuedAt)
+
+    def close(self):
+        self.dispatcher.stop()
+
+    def counters(self):
+        return self.dispatcher.counters()
+
+def createBackend(name):
+    """
+    createBackend() sets up the backend (called by ActionBackends on first use)
+
+    :param name: backend name it was loaded under
+    :return: VoiceMonkeyBackend
+    """
+    return VoiceMonkeyBackend()
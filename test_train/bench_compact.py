@@ -0,0 +1,141 @@
+#----------------------------------------------------------------------------
+# bench_compact.py - memory and matching cost of compact float32 handNodes features against full distance matrices
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import time
+import numpy as np
+from bench_features import loadHandsData
+from bench_index import augmentHands, handNodes, errorTolerance
+from features import distanceMatrices, handNodeDistances, handNodeFeatures, handNodePairs
+from indexes import l1Distances
+from matcher import GestureMatcher
+
+# library sizes to sweep
+LIBRARY_SIZES=[1000, 10000, 100000, 1000000]
+
+# largest library also kept as full 21x21 matrices (3.5 KB per template)
+MAX_FULL_SIZE=100000
+
+# unknown gestures timed per library size
+NUM_QUERIES=20
+
+# library size and queries used to check every representation matches alike
+CHECK_SIZE=10000
+CHECK_QUERIES=500
+
+def main():
+    """
+    main() checks compact features match exactly like the handNodes block of
+    the full distance matrices, then reports the memory and per-frame cost of
+    feature extraction and of scanning the library in every representation
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    rng = np.random.default_rng(0)
+    checkAgreement(handsData, rng)
+    timeExtraction(handsData)
+
+    queries = augmentHands(handsData, NUM_QUERIES, rng)
+    print('\n{:>8} {:>14} {:>12} {:>10} {:>12} {:>9}'.format('size', 'templates', 'bytes/tmpl', 'MiB', 'scan ms', 'speedup'))
+    for size in LIBRARY_SIZES:
+        hands = augmentHands(handsData, size, rng)
+        rows = []
+        if size <= MAX_FULL_SIZE:
+            matrices = distanceMatrices(hands)
+            unknown = distanceMatrices(queries)
+            rows.append(('21x21 float64', matrices, lambda i: fullBlockErrors(matrices, unknown[i])))
+        wide = np.asarray(handNodeDistances(hands, handNodes), dtype=np.float64)
+        wideQueries = np.asarray(handNodeDistances(queries, handNodes), dtype=np.float64)
+        rows.append(('45 float64', wide, lambda i: l1Distances(wide, wideQueries[i])))
+        compact = handNodeDistances(hands, handNodes)
+        compactQueries = handNodeDistances(queries, handNodes)
+        rows.append(('45 float32', compact, lambda i: l1Distances(compact, compactQueries[i])))
+
+        baseline = None
+        for label, templates, scan in rows:
+            start = time.perf_counter()
+            for i in range(NUM_QUERIES):
+                scan(i)
+            elapsed = (time.perf_counter() - start)/NUM_QUERIES
+            baseline = baseline or elapsed
+            print('{:>8} {:>14} {:>12} {:>10.1f} {:>12.2f} {:>8.1f}x'.format(size, label, templates.nbytes//size,
+                templates.nbytes/2**20, elapsed*1e3, baseline/elapsed))
+        rows = templates = matrices = None
+
+def checkAgreement(handsData, rng):
+    """
+    checkAgreement() matches augmented hands against an augmented library the
+    way errorMargin() did (L1 over the full handNodes block of float64
+    matrices) and with compact float32 features in every backend
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param rng: numpy random generator
+    """
+    hands = augmentHands(handsData, CHECK_SIZE, rng)
+    names = ['gesture' + str(i % len(handsData)) for i in range(CHECK_SIZE)]
+    queryHands = np.concatenate((handsData, augmentHands(handsData, CHECK_QUERIES, rng)))
+    matrices = distanceMatrices(hands)
+    queries = distanceMatrices(queryHands)
+    assert np.array_equal(handNodeDistances(hands, handNodes), handNodeFeatures(matrices, handNodes))
+
+    rows, columns = handNodePairs(handNodes)
+    expected = []
+    worst = 0.
+    for query in queries:
+        errors = fullBlockErrors(matrices, query)
+        # the block is symmetric with a zero diagonal
+        triangle = 2*np.abs(matrices[:, rows, columns] - query[rows, columns]).sum(axis=1)
+        worst = max(worst, float(np.max(np.abs(errors - triangle)/np.maximum(errors, 1))))
+        best = int(np.argmin(errors))
+        expected.append(names[best] if errors[best] < errorTolerance else 'Unknown')
+    assert worst < 1e-12, worst
+
+    compact = handNodeDistances(hands, handNodes)
+    compactQueries = handNodeDistances(queryHands, handNodes)
+    for backend in ['brute', 'early', 'quantized']:
+        matcher = GestureMatcher(compact, names, handNodes, errorTolerance, backend)
+        gestures = [matcher.classify(query) for query in compactQueries]
+        differ = [i for i, (gesture, name) in enumerate(zip(gestures, expected)) if gesture != name]
+        assert not differ, (backend, [(expected[i], gestures[i]) for i in differ[:5]])
+    matcher = GestureMatcher(compact, names, handNodes, errorTolerance)
+    drift = max(float(np.max(np.abs(matcher.errors(query) - fullBlockErrors(matrices, matrixQuery))))
+        for query, matrixQuery in zip(compactQueries, queries))
+    print('{} queries against {} templates: same gestures as the full 21x21 blocks in every backend, '
+        'errors within {:.1e} (full block == 2x triangle to {:.0e})'.format(len(queries), CHECK_SIZE, drift, worst))
+
+def timeExtraction(handsData):
+    """
+    timeExtraction() times extracting the features of one frame and of the
+    whole recorded library through full matrices and compactly
+
+    :param handsData: (N, 21, 2) recorded hands
+    """
+    frame = handsData[:1]
+    for label, hands, repeats in [('per frame', frame, 2000), ('library of ' + str(len(handsData)), handsData, 200)]:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            handNodeFeatures(distanceMatrices(hands), handNodes)
+        full = (time.perf_counter() - start)/repeats
+        start = time.perf_counter()
+        for _ in range(repeats):
+            handNodeDistances(hands, handNodes)
+        compact = (time.perf_counter() - start)/repeats
+        print('{:<20} matrices {:>8.1f} us   handNodes pairs {:>8.1f} us   speedup {:>5.1f}x'.format(label,
+            full*1e6, compact*1e6, full/compact))
+
+def fullBlockErrors(matrices, unknownGesture):
+    """
+    fullBlockErrors() is errorMargin() against every template at once: L1
+    over the whole handNodes block of float64 distance matrices
+
+    :param matrices: (K, 21, 21) known distance matrices
+    :param unknownGesture: (21, 21) distance matrix of gesture from user
+    :return: gestureErrors (K,)
+    """
+    block = np.ix_(handNodes, handNodes)
+    return np.abs(matrices[:, block[0], block[1]] - unknownGesture[block]).sum(axis=(1, 2))
+
+if __name__ == "__main__":
+   main()
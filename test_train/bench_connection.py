@@ -0,0 +1,131 @@
+#----------------------------------------------------------------------------
+# bench_connection.py - reconnect behaviour against a local stream that drops (also mid-chunk), dies and stalls
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import inspect
+import threading
+import time
+from bench_mjpeg import syntheticFrames
+from connection import ConnectionManager, openURL
+from replay import ReplayServer
+
+# frames per second the stand-in camera sends
+SERVER_FPS=25
+
+# seconds each scenario streams for
+SCENARIO_SECONDS=6
+
+# seconds the camera is unreachable in the outage scenario
+OUTAGE_SECONDS=2
+
+def main():
+    """
+    main() streams from a local ReplayServer that drops connections, goes
+    away for a while or stops sending, and reports how the connection
+    manager recovers
+    """
+    frames = syntheticFrames(50)
+    print('{:<22} {:>8} {:>8} {:>11} {:>9} {:>14} {:>14} {:>7}'.format('scenario', 'frames', 'fps',
+        'reconnects', 'failures', 'last TTFF ms', 'max TTFF ms', 'stack'))
+    for name, scenario in [('drop every 25 frames', dropScenario), ('chunked drop mid-chunk', chunkedDropScenario),
+            ('outage', outageScenario), ('stall', stallScenario)]:
+        counters, fps, depths = scenario(frames)
+        print('{:<22} {:>8} {:>8.1f} {:>11} {:>9} {:>14} {:>14} {:>7}'.format(name, counters['frames'], fps,
+            counters['reconnects'], counters['failed_attempts'], str(counters['time_to_first_frame_ms']),
+            str(counters['max_time_to_first_frame_ms']), '{}-{}'.format(min(depths), max(depths))))
+
+def stream(url, seconds, during=None):
+    """
+    stream() reads from the stand-in camera for a while
+
+    :param url: live stream url
+    :param seconds: how long to read
+    :param during: function called once with the elapsed time on every frame
+    :return: counters, frames per second, call stack depths seen
+    """
+    connection = ConnectionManager(lambda: openURL(url, None), verbose=False)
+    stopEvent = threading.Event()
+    timer = threading.Timer(seconds, stopEvent.set)
+    timer.start()
+    depths = set()
+    start = time.perf_counter()
+    try:
+        for jpg in connection.frames(stopEvent):
+            # recursion would show up as a growing stack
+            depths.add(len(inspect.stack(0)))
+            if during is not None:
+                during(time.perf_counter() - start)
+    finally:
+        timer.cancel()
+    return connection.counters(), connection.framesRead/(time.perf_counter() - start), depths
+
+def dropScenario(frames):
+    """
+    dropScenario() closes every connection after a second of frames
+
+    :param frames: JPEG images
+    :return: counters, frames per second, stack depths
+    """
+    server = ReplayServer(frames, SERVER_FPS, dropAfter=SERVER_FPS).start()
+    try:
+        return stream(server.url, SCENARIO_SECONDS)
+    finally:
+        server.stop()
+
+def chunkedDropScenario(frames):
+    """
+    chunkedDropScenario() streams chunked like the ESP firmware and cuts every
+    connection off in the middle of a chunk after a second of frames
+
+    :param frames: JPEG images
+    :return: counters, frames per second, stack depths
+    """
+    server = ReplayServer(frames, SERVER_FPS, dropAfter=SERVER_FPS, chunked=True).start()
+    try:
+        counters, fps, depths = stream(server.url, SCENARIO_SECONDS)
+    finally:
+        server.stop()
+    assert counters['reconnects'] >= SCENARIO_SECONDS - 2, counters
+    return counters, fps, depths
+
+def outageScenario(frames):
+    """
+    outageScenario() takes the camera off the network for OUTAGE_SECONDS
+    and brings it back on the same port
+
+    :param frames: JPEG images
+    :return: counters, frames per second, stack depths
+    """
+    servers = [ReplayServer(frames, SERVER_FPS).start()]
+    port = servers[0].server_address[1]
+    outage = {'started': False}
+
+    def takeDown(elapsed):
+        if elapsed > 1 and not outage['started']:
+            outage['started'] = True
+            servers[0].stop()
+            threading.Timer(OUTAGE_SECONDS, lambda: servers.append(ReplayServer(frames, SERVER_FPS, port=port).start())).start()
+
+    try:
+        return stream(servers[0].url, SCENARIO_SECONDS, takeDown)
+    finally:
+        servers[-1].stop()
+
+def stallScenario(frames):
+    """
+    stallScenario() sends a frame now and then, so reads time out mid-stream
+
+    :param frames: JPEG images
+    :return: counters, frames per second, stack depths
+    """
+    server = ReplayServer(frames, 0.4).start()
+    try:
+        return stream(server.url, SCENARIO_SECONDS)
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+   main()
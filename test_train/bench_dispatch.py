@@ -0,0 +1,104 @@
+#----------------------------------------------------------------------------
+# bench_dispatch.py - action dispatch against a local stub of the VoiceMonkey API
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import requests
+from dispatch import ActionDispatcher
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    StubHandler answers every GET after a delay, failing some with a 503
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+            fail = server.failEvery and server.requests % server.failEvery == 0
+        time.sleep(server.delay)
+        body = b'{"status": "ok"}'
+        self.send_response(503 if fail else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    """
+    StubServer stands in for the VoiceMonkey trigger endpoint
+    """
+    daemon_threads = True
+
+    def __init__(self, delay, failEvery):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.delay = delay
+        self.failEvery = failEvery
+        self.requests = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def url(self, command):
+        return 'http://127.0.0.1:' + str(self.server_address[1]) + '/trigger?monkey=' + command
+
+def main():
+    """
+    main() fires a burst of gesture commands at the stub synchronously (the
+    old process_request) and through ActionDispatcher, and compares how long
+    the frame loop is blocked, connections opened and gesture-to-request latency
+    """
+    parser = argparse.ArgumentParser(description='Benchmark gesture action dispatch against a local stub.')
+    parser.add_argument('--commands', type=int, default=40)
+    parser.add_argument('--delay', type=float, default=0.2, help='seconds the stub takes to answer')
+    parser.add_argument('--fail-every', dest='failEvery', type=int, default=7, help='answer every Nth request with a 503')
+    parser.add_argument('--interval', type=float, default=0.05, help='seconds between commands')
+    args = parser.parse_args()
+
+    # a repeated command shows up as consecutive duplicates, like a held gesture
+    commands = ['light-on', 'light-on', 'next-slide', 'music-play', 'music-play', 'light-off']
+    sequence = [commands[i % len(commands)] for i in range(args.commands)]
+
+    stub = StubServer(args.delay, args.failEvery)
+    blocked = 0.
+    for command in sequence:
+        start = time.perf_counter()
+        try:
+            requests.get(stub.url(command))
+        except requests.RequestException:
+            pass
+        blocked = max(blocked, time.perf_counter() - start)
+        time.sleep(args.interval)
+    print('synchronous   requests {:>4}  connections {:>4}  max frame-loop block {:>8.1f} ms'.format(
+        stub.requests, len(stub.connections), blocked*1e3))
+    stub.shutdown()
+
+    stub = StubServer(args.delay, args.failEvery)
+    dispatcher = ActionDispatcher()
+    blocked = 0.
+    for command in sequence:
+        start = time.perf_counter()
+        dispatcher.request(stub.url(command))
+        blocked = max(blocked, time.perf_counter() - start)
+        time.sleep(args.interval)
+    dispatcher.join()
+    counters = dispatcher.counters()
+    dispatcher.stop()
+    print('dispatcher    requests {:>4}  connections {:>4}  max frame-loop block {:>8.1f} ms'.format(
+        stub.requests, len(stub.connections), blocked*1e3))
+    print('dispatcher    ' + str(counters))
+    stub.shutdown()
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,120 @@
+#----------------------------------------------------------------------------
+# bench_dynamics.py - per-frame latency and accuracy of motion gesture recognition
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import time
+import numpy as np
+from bench_features import loadHandsData
+from dynamics import DynamicRecognizer, DynamicTemplates, FRAME_TIME, HAND_NODES
+from features import distanceMatrices, handNodeFeatures
+
+# frames in a recorded swipe template
+TEMPLATE_FRAMES=15
+
+# palm sizes a swipe covers
+SWIPE_DISTANCE=3.
+
+# speeds live swipes are performed at, relative to the template
+SPEEDS=[0.6, 0.8, 1., 1.25, 1.6]
+
+# landmark jitter in pixels
+JITTER=3.
+
+# frames timed per latency measurement
+TIMED_FRAMES=2000
+
+def main():
+    """
+    main() measures how long a frame update takes for growing template sets
+    and ring buffer windows, then checks detections on synthetic swipes
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    rng = np.random.default_rng(0)
+    hand = handsData[len(handsData)//2]
+
+    print('{:>10} {:>14} {:>8} {:>12}'.format('templates', 'template frames', 'window', 'us/frame'))
+    for count in (2, 10, 50):
+        for window in (64, 1024):
+            templates = swipeTemplates(handsData, count, rng)
+            recognizer = DynamicRecognizer(templates, window=window)
+            stream, times = swipeClip(hand, (1, 0), TEMPLATE_FRAMES*4, rng)
+            features = handNodeFeatures(distanceMatrices(stream), HAND_NODES)
+            start = time.perf_counter()
+            for i in range(TIMED_FRAMES):
+                recognizer.update(stream[i % len(stream)], features[i % len(stream)], i*FRAME_TIME)
+            elapsed = (time.perf_counter() - start)/TIMED_FRAMES
+            print('{:>10} {:>14} {:>8} {:>12.1f}'.format(count, int(templates.lengths.sum()), window, elapsed*1e6))
+
+    templates = swipeTemplates(handsData, 2, rng)
+    print('\n{:<16} {}'.format('live motion', ' '.join('{:>6}x'.format(speed) for speed in SPEEDS)))
+    for name, direction in [('Right', (1, 0)), ('Left', (-1, 0)), ('Up (untrained)', (0, -1)), ('Hold still', (0, 0))]:
+        results = []
+        for speed in SPEEDS:
+            clip, times = swipeClip(hand, direction, int(round(TEMPLATE_FRAMES/speed)), rng)
+            # still frames around the motion, like a real stream
+            still = np.repeat(clip[:1], 10, axis=0)
+            after = np.repeat(clip[-1:], 10, axis=0)
+            stream = np.concatenate((still, clip, after))
+            results.append(runStream(templates, stream))
+        print('{:<16} {}'.format(name, ' '.join('{:>7}'.format(','.join(result) or '-') for result in results)))
+
+def swipeTemplates(handsData, count, rng):
+    """
+    swipeTemplates() builds Right/Left swipe templates from recorded hands
+
+    :param handsData: (K, 21, 2) landmark positions
+    :param count: number of templates
+    :param rng: random generator
+    :return: DynamicTemplates
+    """
+    clips = []
+    times = []
+    labels = []
+    for i in range(count):
+        # the trained pose with a little variation between recordings
+        hand = handsData[len(handsData)//2] + rng.normal(0, JITTER, (21, 2))
+        clip, clipTimes = swipeClip(hand, (1, 0) if i % 2 == 0 else (-1, 0), TEMPLATE_FRAMES, rng)
+        clips.append(clip)
+        times.append(clipTimes)
+        labels.append(i % 2)
+    return DynamicTemplates(np.concatenate(clips), np.concatenate(times), [len(clip) for clip in clips],
+        labels, ['Right', 'Left'], HAND_NODES)
+
+def swipeClip(hand, direction, frames, rng):
+    """
+    swipeClip() moves a hand across the frame with eased motion and jitter
+
+    :param hand: (21, 2) landmark positions
+    :param direction: unit (x, y) direction (0, 0 holds still)
+    :param frames: frames the motion takes
+    :param rng: random generator
+    :return: (frames, 21, 2) landmarks, (frames,) times
+    """
+    palm = np.linalg.norm(hand[0] - hand[9])
+    progress = (1 - np.cos(np.linspace(0, np.pi, frames)))/2
+    offsets = progress[:, np.newaxis]*np.asarray(direction, dtype=np.float64)*SWIPE_DISTANCE*palm
+    clip = hand[np.newaxis] + offsets[:, np.newaxis, :] + rng.normal(0, JITTER, (frames, 21, 2))
+    return clip, np.arange(frames)*FRAME_TIME
+
+def runStream(templates, stream):
+    """
+    runStream() feeds a stream of hands to a fresh recognizer
+
+    :param templates: DynamicTemplates
+    :param stream: (n, 21, 2) landmark positions
+    :return: gestures detected
+    """
+    recognizer = DynamicRecognizer(templates)
+    features = handNodeFeatures(distanceMatrices(stream), HAND_NODES)
+    detected = []
+    for i in range(len(stream)):
+        gesture = recognizer.update(stream[i], features[i], i*FRAME_TIME)
+        if gesture is not None:
+            detected.append(gesture)
+    return detected
+
+if __name__ == "__main__":
+   main()
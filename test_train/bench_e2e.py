@@ -0,0 +1,231 @@
+#----------------------------------------------------------------------------
+# bench_e2e.py - end-to-end benchmark suite over recorded MJPEG captures
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import json
+import queue
+import sys
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from features import handNodeDistances
+from library import openLibrary
+from matcher import GestureMatcher
+from mjpeg import MJPEGReader
+from pipeline import RecognitionPipeline
+from replay import CaptureStream
+
+# image size (same as testing.py)
+WIDTH=1280
+HEIGHT=720
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+# stages timed for every frame, in the order testing.py runs them
+STAGES=['parse', 'decode', 'rotate_resize', 'color', 'hands', 'distances', 'match']
+
+# share of the baseline FPS a run may lose before it counts as a regression
+FPS_TOLERANCE=0.2
+
+def main():
+    """
+    main() runs recorded captures headless through every recognition stage,
+    reports per-stage timings, FPS, latency percentiles and the recognized
+    gesture sequence, and optionally checks them against a saved baseline
+    """
+    parser = argparse.ArgumentParser(description='Headless end-to-end benchmark over recorded captures.')
+    parser.add_argument('captures', nargs='+', help='recorded MJPEG stream files')
+    parser.add_argument('--pipeline', action='store_true', help='also replay at recorded speed through RecognitionPipeline')
+    parser.add_argument('--json', default=None, help='write the results to this file')
+    parser.add_argument('--baseline', default=None, help='results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=FPS_TOLERANCE, help='allowed FPS loss against the baseline')
+    args = parser.parse_args()
+
+    library = openLibrary(handNodes)
+    matcher = GestureMatcher.fromFeatures(library.features, library.gestureNames(), handNodes, errorTolerance)
+    results = {}
+    for path in args.captures:
+        result = runCapture(path, matcher)
+        if args.pipeline:
+            result['pipeline'] = runPipeline(path, matcher)
+        results[path] = result
+        report(path, result)
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print('REGRESSION: ' + problem)
+        if problems:
+            sys.exit(1)
+        print('no regressions against ' + args.baseline)
+
+def runCapture(path, matcher):
+    """
+    runCapture() times each stage of every frame of a capture, unthrottled
+
+    :param path: capture file
+    :param matcher: GestureMatcher
+    :return: dict of results
+    """
+    timings = {stage: [] for stage in STAGES}
+    gestures = []
+    stream = CaptureStream(path, realtime=False)
+    reader = MJPEGReader(stream)
+    with mp.solutions.hands.Hands(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5) as hands:
+        start = time.perf_counter()
+        while True:
+            mark = time.perf_counter()
+            try:
+                jpg = reader.readFrame()
+            except ConnectionError:
+                break
+            mark = lap(timings['parse'], mark)
+            image = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            mark = lap(timings['decode'], mark)
+            image = cv2.resize(cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE), (480,640))
+            mark = lap(timings['rotate_resize'], mark)
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            mark = lap(timings['color'], mark)
+            handResults = hands.process(image)
+            mark = lap(timings['hands'], mark)
+            if not handResults.multi_hand_landmarks:
+                timings['distances'].append(0.)
+                timings['match'].append(0.)
+                gestures.append(None)
+                continue
+            myHand = [(int(landMark.x*WIDTH),int(landMark.y*HEIGHT)) for landMark in handResults.multi_hand_landmarks[-1].landmark]
+            unknownGesture = handNodeDistances(myHand, handNodes)[0]
+            mark = lap(timings['distances'], mark)
+            gestures.append(matcher.classify(unknownGesture))
+            lap(timings['match'], mark)
+        elapsed = time.perf_counter() - start
+    stream.close()
+
+    frames = len(gestures)
+    latencies = np.sum([timings[stage] for stage in STAGES], axis=0) if frames else np.zeros(1)
+    return {
+        'frames': frames,
+        'fps': frames/elapsed if elapsed else 0.,
+        'latency_p50_ms': percentile(latencies, 50),
+        'latency_p99_ms': percentile(latencies, 99),
+        'stages': {stage: {'mean_ms': float(np.mean(values))*1e3 if values else 0.,
+            'p50_ms': percentile(values, 50), 'p99_ms': percentile(values, 99)} for stage, values in timings.items()},
+        'gestures': gestureSequence(gestures),
+    }
+
+def runPipeline(path, matcher):
+    """
+    runPipeline() replays a capture at recorded speed through the threaded
+    RecognitionPipeline and measures capture-to-result latency
+
+    :param path: capture file
+    :param matcher: GestureMatcher
+    :return: dict of results
+    """
+    with mp.solutions.hands.Hands(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5) as hands:
+        def inference(jpg):
+            image = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            image = cv2.resize(cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE), (480,640))
+            handResults = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            if not handResults.multi_hand_landmarks:
+                return None, None
+            myHand = [(int(landMark.x*WIDTH),int(landMark.y*HEIGHT)) for landMark in handResults.multi_hand_landmarks[-1].landmark]
+            return myHand, matcher.classify(handNodeDistances(myHand, handNodes)[0])
+
+        pipeline = RecognitionPipeline(lambda: CaptureStream(path), inference).start()
+        latencies = []
+        try:
+            # the capture ends with the stream dropping, after which the pipeline would start over
+            while pipeline.connection.failedAttempts == 0:
+                try:
+                    pipeline.getResult(timeout=0.5)
+                except queue.Empty:
+                    continue
+                latencies.append(pipeline.latency)
+        finally:
+            pipeline.stop()
+        counters = pipeline.counters()
+    return {
+        'results': len(latencies),
+        'read_fps': counters['read_fps'],
+        'inference_fps': counters['inference_fps'],
+        'dropped_frames': counters['dropped_frames'],
+        'latency_p50_ms': percentile(latencies, 50),
+        'latency_p99_ms': percentile(latencies, 99),
+    }
+
+def lap(timing, mark):
+    """
+    lap() records the time since mark
+
+    :param timing: list the stage's seconds go into
+    :param mark: perf_counter() at the start of the stage
+    :return: perf_counter() now
+    """
+    now = time.perf_counter()
+    timing.append(now - mark)
+    return now
+
+def percentile(values, q):
+    return float(np.percentile(values, q))*1e3 if len(values) else 0.
+
+def gestureSequence(gestures):
+    """
+    gestureSequence() collapses per-frame gestures into runs
+
+    :param gestures: gesture per frame (None without a hand)
+    :return: list of [gesture, frames]
+    """
+    sequence = []
+    for gesture in gestures:
+        gesture = gesture or '-'
+        if sequence and sequence[-1][0] == gesture:
+            sequence[-1][1] += 1
+        else:
+            sequence.append([gesture, 1])
+    return sequence
+
+def report(path, result):
+    print(path)
+    print('  frames {}  {:.1f} fps  latency p50 {:.1f} ms  p99 {:.1f} ms'.format(result['frames'], result['fps'],
+        result['latency_p50_ms'], result['latency_p99_ms']))
+    print('  {:<14} {:>9} {:>9} {:>9}'.format('stage', 'mean ms', 'p50 ms', 'p99 ms'))
+    for stage, timing in result['stages'].items():
+        print('  {:<14} {:>9.2f} {:>9.2f} {:>9.2f}'.format(stage, timing['mean_ms'], timing['p50_ms'], timing['p99_ms']))
+    print('  gestures: ' + ' '.join('{}x{}'.format(gesture, count) for gesture, count in result['gestures']))
+    if 'pipeline' in result:
+        print('  pipeline: ' + str(result['pipeline']))
+
+def compare(results, baseline, tolerance):
+    """
+    compare() finds regressions against a saved run
+
+    :param results: results of this run
+    :param baseline: results of the saved run
+    :param tolerance: allowed FPS loss
+    :return: list of problems
+    """
+    problems = []
+    for path, result in results.items():
+        if path not in baseline:
+            continue
+        previous = baseline[path]
+        if result['gestures'] != previous['gestures']:
+            problems.append(path + ': recognized gesture sequence changed')
+        if result['fps'] < (1 - tolerance)*previous['fps']:
+            problems.append('{}: {:.1f} fps, baseline {:.1f} fps'.format(path, result['fps'], previous['fps']))
+    return problems
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,77 @@
+#----------------------------------------------------------------------------
+# bench_early.py - per-frame matcher cost of early-abandon scoring as the library grows
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import time
+import numpy as np
+from bench_features import loadHandsData
+from bench_index import augmentHands, handNodes, errorTolerance
+from features import distanceMatrices
+from matcher import GestureMatcher
+
+# library sizes to sweep
+LIBRARY_SIZES=[70, 500, 2000, 10000, 50000]
+
+# frames in the simulated stream
+STREAM_FRAMES=300
+
+# frames a gesture is held before the user changes it
+HOLD_FRAMES=25
+
+# landmark jitter between frames of a held gesture, in pixels
+FRAME_JITTER=2.
+
+def main():
+    """
+    main() feeds a stream of held gestures, like consecutive camera frames, to
+    the brute force and early-abandon matchers and checks every result agrees
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    rng = np.random.default_rng(0)
+    stream = distanceMatrices(heldStream(handsData, rng))
+
+    print('{:>8} {:>10} {:>12} {:>12} {:>12} {:>10}'.format('size', 'backend', 'match us', 'top-5 us', 'classify us', 'abandoned'))
+    for size in LIBRARY_SIZES:
+        library = distanceMatrices(augmentHands(handsData, size, rng))
+        names = ['gesture' + str(i % len(handsData)) for i in range(size)]
+        expected = None
+        for backend in ('brute', 'early'):
+            matcher = GestureMatcher(library, names, handNodes, errorTolerance, backend)
+            results = []
+            timings = []
+            for run in (lambda query: matcher.match(query),
+                    lambda query: matcher.match(query, topK=5),
+                    matcher.classify):
+                start = time.perf_counter()
+                results.append([run(query) for query in stream])
+                timings.append((time.perf_counter() - start)/len(stream))
+            # MatchResult errors are arrays, compare them as lists
+            results = [[result if isinstance(result, str) else result._replace(errors=list(result.errors))
+                for result in runResults] for runResults in results]
+            if expected is None:
+                expected = results
+            elif results != expected:
+                raise AssertionError(backend + ' disagrees with brute at size ' + str(size))
+            counters = matcher.index.counters() if hasattr(matcher.index, 'counters') else None
+            abandoned = '{:.1%}'.format(counters['abandon_rate']) if counters else '-'
+            print('{:>8} {:>10} {:>12.1f} {:>12.1f} {:>12.1f} {:>10}'.format(size, backend,
+                timings[0]*1e6, timings[1]*1e6, timings[2]*1e6, abandoned))
+
+def heldStream(handsData, rng):
+    """
+    heldStream() simulates a camera stream where each gesture is held for a
+    while with small jitter between frames
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param rng: numpy random generator
+    :return: (STREAM_FRAMES, 21, 2) hands
+    """
+    held = augmentHands(handsData, STREAM_FRAMES//HOLD_FRAMES + 1, rng)
+    stream = np.repeat(held, HOLD_FRAMES, axis=0)[:STREAM_FRAMES]
+    return np.rint(stream + rng.normal(0, FRAME_JITTER, stream.shape))
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,176 @@
+#----------------------------------------------------------------------------
+# bench_enrollment.py - insert and match cost of enrolling gestures into a running matcher
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+from bench_features import loadHandsData
+from bench_index import augmentHands, handNodes, errorTolerance
+from enrollment import ENROLL_FRAMES, GestureEnroller
+from features import distanceMatrices
+from indexes import buildIndex
+from library import LibraryWriter, loadLibrary, saveLibrary
+from matcher import GestureMatcher
+
+# library sizes reported while enrolling
+CHECKPOINTS=[1000, 5000, 20000]
+
+# backends compared (kdtree needs scipy)
+BACKENDS=['brute', 'early', 'quantized', 'kdtree']
+
+# frames classified at every checkpoint
+QUERIES=200
+
+# new gestures enrolled while another thread keeps matching
+CONCURRENT_GESTURES=50
+
+def main():
+    """
+    main() grows a matcher one enrollment at a time and reports the insert
+    cost against rebuilding the index, the matching cost as the library
+    grows, then checks matching stays correct while another thread enrolls
+    and that the background writer saves what was enrolled
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    rng = np.random.default_rng(0)
+    queries = distanceMatrices(augmentHands(handsData, QUERIES, rng))
+
+    print('{:>8} {:>10} {:>14} {:>12} {:>12}'.format('size', 'backend', 'insert us/enr', 'rebuild ms', 'classify us'))
+    for backend in BACKENDS:
+        try:
+            grow(handsData, queries, backend, rng)
+        except ImportError:
+            print('{:>8} {:>10} {:>14}'.format('-', backend, 'needs scipy'))
+    for backend in ['brute', 'early', 'quantized']:
+        concurrent(handsData, backend, np.random.default_rng(1))
+    writer(handsData, np.random.default_rng(2))
+
+def grow(handsData, queries, backend, rng):
+    """
+    grow() enrolls ENROLL_FRAMES templates at a time up to the last
+    checkpoint, then checks the grown index answers like a fresh brute scan
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param queries: distance matrices to classify
+    :param backend: index backend name
+    :param rng: numpy random generator
+    """
+    names = ['gesture' + str(i) for i in range(len(handsData))]
+    matcher = GestureMatcher(distanceMatrices(handsData), names, handNodes, errorTolerance, backend)
+    enroller = GestureEnroller(matcher, verbose=False)
+    inserts = []
+    for checkpoint in CHECKPOINTS:
+        while len(matcher) < checkpoint:
+            hands = augmentHands(handsData, ENROLL_FRAMES, rng)
+            enroller.enroll('gesture' + str(len(matcher) % len(handsData)), hands)
+            inserts.append(enroller.lastInsert)
+        features = matcher.index.vectors if hasattr(matcher.index, 'vectors') else matcher.index.tree.data
+        start = time.perf_counter()
+        buildIndex(backend, np.array(features))
+        rebuild = time.perf_counter() - start
+        start = time.perf_counter()
+        for query in queries:
+            matcher.classify(query)
+        classify = (time.perf_counter() - start)/len(queries)
+        print('{:>8} {:>10} {:>14.1f} {:>12.2f} {:>12.1f}'.format(len(matcher), backend, np.mean(inserts)*1e6,
+            rebuild*1e3, classify*1e6))
+        inserts = []
+
+    reference = GestureMatcher.fromFeatures(np.array(features), matcher.gestureNames, handNodes, errorTolerance)
+    for query in queries:
+        assert matcher.classify(query) == reference.classify(query), backend + ' disagrees with a rebuilt index'
+
+def concurrent(handsData, backend, rng):
+    """
+    concurrent() enrolls new gestures while a second thread classifies hands
+    that are exact copies of them: every answer has to be the gesture matched
+    before enrollment or the new one, and never go back once it was the new one
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param backend: index backend name
+    :param rng: numpy random generator
+    """
+    library = augmentHands(handsData, 2000, rng)
+    names = ['gesture' + str(i % len(handsData)) for i in range(len(library))]
+    matcher = GestureMatcher(distanceMatrices(library), names, handNodes, errorTolerance, backend)
+    # hands far enough from the library that only their own template matches exactly
+    newHands = augmentHands(handsData, CONCURRENT_GESTURES, rng)*1.5
+    newQueries = distanceMatrices(newHands)
+    before = [matcher.classify(query) for query in newQueries]
+    enroller = GestureEnroller(matcher, verbose=False)
+    seen = [set() for _ in newQueries]
+    failures = []
+    done = threading.Event()
+
+    def classifyLoop():
+        try:
+            while not done.is_set():
+                for i, query in enumerate(newQueries):
+                    gesture = matcher.classify(query)
+                    if gesture != before[i] and gesture != 'new' + str(i):
+                        failures.append((i, gesture))
+                    if gesture == before[i] and 'new' in seen[i] and before[i] != 'new' + str(i):
+                        failures.append((i, 'went back to ' + gesture))
+                    if gesture == 'new' + str(i):
+                        seen[i].add('new')
+        except Exception as error:
+            failures.append(('exception', repr(error)))
+
+    thread = threading.Thread(target=classifyLoop)
+    thread.start()
+    for i in range(CONCURRENT_GESTURES):
+        enroller.enroll('new' + str(i), newHands[i:i+1])
+        time.sleep(0.001)
+    done.set()
+    thread.join()
+    after = [matcher.classify(query) for query in newQueries]
+    assert not failures, failures[:5]
+    assert after == ['new' + str(i) for i in range(CONCURRENT_GESTURES)], after
+    print('{:<10} concurrent enroll/classify ok ({} gestures, {} seen while enrolling)'.format(backend,
+        CONCURRENT_GESTURES, sum('new' in s for s in seen)))
+
+def writer(handsData, rng):
+    """
+    writer() compares queuing enrolled templates with the background writer
+    to saving the library on the frame loop, and checks the saved bundle
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param rng: numpy random generator
+    """
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'gesture_library')
+    try:
+        hands = augmentHands(handsData, CHECKPOINTS[-1], rng)
+        names = ['gesture' + str(i % len(handsData)) for i in range(len(hands))]
+        saveLibrary(path, hands, names, handNodes)
+        library = loadLibrary(path)
+        matcher = GestureMatcher.fromFeatures(library.features, library.gestureNames(), handNodes, errorTolerance)
+        libraryWriter = LibraryWriter(path, library, flushDelay=0.2).start()
+        enroller = GestureEnroller(matcher, libraryWriter, verbose=False)
+        appends = []
+        for i in range(10):
+            enrolled = augmentHands(handsData, ENROLL_FRAMES, rng)
+            start = time.perf_counter()
+            enroller.enroll('new' + str(i), enrolled)
+            appends.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        saveLibrary(os.path.join(directory, 'blocking'), hands, names, handNodes)
+        blocking = time.perf_counter() - start
+        libraryWriter.stop()
+        saved = loadLibrary(path)
+        assert len(saved) == len(matcher), (len(saved), len(matcher))
+        assert saved.gestureNames() == matcher.gestureNames
+        print('\nenroll + queue for saving {:.2f} ms vs saving a {}-template library on the frame loop {:.0f} ms ({})'.format(
+            np.mean(appends)*1e3, len(hands), blocking*1e3, libraryWriter.counters()))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,104 @@
+#----------------------------------------------------------------------------
+# bench_extract.py - throughput and scaling of batch landmark extraction with the number of workers
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import tempfile
+import cv2
+import numpy as np
+from bench_mjpeg import multipartStream, syntheticFrames
+from extract import JOURNAL_SUFFIX, extractLibrary
+from library import loadLibrary
+
+# synthetic frames written per kind of input (JPEG folder, capture, video)
+FRAMES_PER_KIND=200
+
+def main():
+    """
+    main() extracts the same recordings with 1, 2, 4, ... workers up to the
+    CPU count, reporting frames per second and how close the scaling is to
+    linear, checks every run finds the same hands, and checks a run that
+    was cut short resumes to the same library
+    """
+    parser = argparse.ArgumentParser(description='Benchmark batch landmark extraction.')
+    parser.add_argument('--data', default=None, help='folder of gesture recordings (default: synthetic frames without hands)')
+    parser.add_argument('--no-rotate', dest='rotate', action='store_false')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        data = args.data or syntheticData(os.path.join(directory, 'data'))
+        output = os.path.join(directory, 'library')
+        counts = [1]
+        while counts[-1]*2 <= (os.cpu_count() or 1):
+            counts.append(counts[-1]*2)
+        if counts[-1] != os.cpu_count():
+            counts.append(os.cpu_count())
+
+        print('{:>8} {:>8} {:>8} {:>10} {:>12} {:>9} {:>11}'.format('workers', 'frames', 'hands', 'frames/s',
+            'per worker', 'speedup', 'efficiency'))
+        baseline = reference = None
+        for workers in counts:
+            counters = extractLibrary([data], output, workers, rotate=args.rotate, restart=True, verbose=False)
+            baseline = baseline or counters['frames_per_second']
+            speedup = counters['frames_per_second']/baseline
+            print('{:>8} {:>8} {:>8} {:>10.1f} {:>12.1f} {:>8.2f}x {:>10.0%}'.format(workers, counters['frames'],
+                counters['hands'], counters['frames_per_second'], counters['frames_per_second_per_worker'],
+                speedup, speedup/workers))
+            templates = libraryContents(output) if counters['templates'] else []
+            if reference is None:
+                reference = templates
+            assert templates == reference, 'runs with different worker counts found different hands'
+
+        # cut the journal short like a killed run, half of it plus a partial line
+        with open(output + JOURNAL_SUFFIX) as f:
+            lines = f.readlines()
+        with open(output + JOURNAL_SUFFIX, 'w') as f:
+            f.writelines(lines[:max(1, len(lines)//2)])
+            f.write(lines[-1][:len(lines[-1])//2])
+        counters = extractLibrary([data], output, counts[-1], rotate=args.rotate, verbose=False)
+        assert counters['resumed_units'] + counters['units'] == len(lines) - 1, counters
+        assert (libraryContents(output) if counters['templates'] else []) == reference, 'resumed run differs'
+        print('\nresume ok ({} units kept, {} extracted again)'.format(counters['resumed_units'], counters['units']))
+    finally:
+        shutil.rmtree(directory)
+
+def syntheticData(directory):
+    """
+    syntheticData() writes a folder of JPEGs, a recorded capture and a video,
+    each in its own gesture folder
+
+    :param directory: where to write them
+    :return: directory
+    """
+    frames = syntheticFrames(FRAMES_PER_KIND)
+    for name in ['Frames', 'Capture', 'Video']:
+        os.makedirs(os.path.join(directory, name))
+    for i, jpg in enumerate(frames):
+        with open(os.path.join(directory, 'Frames', 'frame{:04d}.jpg'.format(i)), 'wb') as f:
+            f.write(jpg)
+    with open(os.path.join(directory, 'Capture', 'capture.mjpeg'), 'wb') as f:
+        f.write(multipartStream(frames))
+    video = cv2.VideoWriter(os.path.join(directory, 'Video', 'clip.avi'), cv2.VideoWriter_fourcc(*'MJPG'), 25, (1280, 720))
+    for jpg in frames:
+        video.write(cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_COLOR))
+    video.release()
+    return directory
+
+def libraryContents(path):
+    """
+    libraryContents() reads a library as comparable values
+
+    :param path: bundle directory
+    :return: sorted (gesture name, landmarks) pairs
+    """
+    library = loadLibrary(path, mmap=False)
+    return sorted(zip(library.gestureNames(), map(lambda hand: hand.tobytes(), library.landmarks)))
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,85 @@
+#----------------------------------------------------------------------------
+# bench_features.py - micro-benchmark of the vectorized distance-matrix engine
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import csv
+import re
+import timeit
+import numpy as np
+from features import distanceMatrices
+
+# gesture library the benchmark runs against (run from repository root)
+GESTURE_DATA='./aggregate_gesture_data/gesture_data.csv'
+
+# how many times each measurement is repeated
+REPEATS=200
+
+def main():
+    """
+    main() times the per-frame and per-template cost of the original nested
+    loop implementation against the broadcast implementation
+    """
+    handsData = loadHandsData()
+    checkAgreement(handsData)
+
+    frame = handsData[0]
+    loopFrame = timeit.timeit(lambda: loopDistances(frame), number=REPEATS)/REPEATS
+    vectorFrame = timeit.timeit(lambda: distanceMatrices(frame)[0], number=REPEATS)/REPEATS
+    printResult('per frame', loopFrame, vectorFrame)
+
+    loopLibrary = timeit.timeit(lambda: [loopDistances(hand) for hand in handsData], number=REPEATS//10)/(REPEATS//10)
+    vectorLibrary = timeit.timeit(lambda: distanceMatrices(handsData), number=REPEATS//10)/(REPEATS//10)
+    printResult('per template', loopLibrary/len(handsData), vectorLibrary/len(handsData))
+    printResult('library of ' + str(len(handsData)), loopLibrary, vectorLibrary)
+
+def loadHandsData():
+    """
+    loadHandsData() reads raw landmark tuples from the gesture library
+
+    :return: handsData
+    """
+    with open(GESTURE_DATA, 'r', newline='') as f:
+        examples = list(csv.reader(f))
+    return [[tuple(map(int, re.findall(r'\d+', string[1:-1]))) for string in example] for example in examples]
+
+def checkAgreement(handsData):
+    """
+    checkAgreement() makes sure both implementations produce the same matrices
+
+    :param handsData: raw landmark tuples
+    """
+    reference = np.array([loopDistances(hand) for hand in handsData])
+    if not np.allclose(reference, distanceMatrices(handsData), rtol=0, atol=1e-12):
+        raise AssertionError('vectorized distance matrices differ from reference loop')
+
+def loopDistances(gestureDataPoints):
+    """
+    loopDistances() original per-element implementation kept as a reference
+
+    :param gestureDataPoints: hand node positions
+    :return: distanceMatrix
+    """
+    length = len(gestureDataPoints)
+    distanceMatrix = np.zeros([length, length], dtype='float')
+    palmSize=((gestureDataPoints[0][0]-gestureDataPoints[9][0])**2+(gestureDataPoints[0][1]-gestureDataPoints[9][1])**2)**(1./2.)
+    for row in range(0, length):
+        for column in range(0, length):
+            distanceMatrix[row][column]=(((gestureDataPoints[row][0]-gestureDataPoints[column][0])**2+(gestureDataPoints[row][1]-gestureDataPoints[column][1])**2)**(1./2.))/palmSize
+    return distanceMatrix
+
+def printResult(label, loopTime, vectorTime):
+    """
+    printResult() prints one benchmark line
+
+    :param label: what was measured
+    :param loopTime: seconds taken by the loop implementation
+    :param vectorTime: seconds taken by the vectorized implementation
+    """
+    print('{:<20} loop {:>9.1f} us   vectorized {:>9.1f} us   speedup {:>6.1f}x'.format(
+        label, loopTime*1e6, vectorTime*1e6, loopTime/vectorTime))
+
+if __name__ == "__main__":
+   main()
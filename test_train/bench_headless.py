@@ -0,0 +1,100 @@
+#----------------------------------------------------------------------------
+# bench_headless.py - per-frame cost of the display path vs headless recognition
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from headless import extractLandmarks, landmarkBuffer
+from replay import loadCapture
+
+# image size (same as testing.py)
+WIDTH=1280
+HEIGHT=720
+
+def main():
+    """
+    main() runs a recording through the display path testing.py always used
+    and through the headless path, reporting the time per frame of each and
+    checking both extract the same landmarks
+    """
+    parser = argparse.ArgumentParser(description='Compare display and headless recognition per frame.')
+    parser.add_argument('capture', help='recorded MJPEG stream file')
+    args = parser.parse_args()
+
+    frames = loadCapture(args.capture)
+    mp_drawing, mp_hands = mp.solutions.drawing_utils, mp.solutions.hands
+    displayHands, displayTime, renderTime = runDisplay(frames, mp_drawing, mp_hands)
+    headlessHands, headlessTime = runHeadless(frames, mp_hands)
+
+    same = all((a is None and b is None) or (a is not None and b is not None and np.array_equal(np.array(a), b))
+        for a, b in zip(displayHands, headlessHands))
+    print('frames {}'.format(len(frames)))
+    print('display   {:>8.2f} ms/frame  (drawing, colour round-trip and flip {:.2f} ms, imshow/waitKey not counted)'.format(
+        displayTime/len(frames)*1e3, renderTime/len(frames)*1e3))
+    print('headless  {:>8.2f} ms/frame'.format(headlessTime/len(frames)*1e3))
+    print('saved     {:>8.2f} ms/frame  (+ up to 5 ms of cv2.waitKey)'.format((displayTime - headlessTime)/len(frames)*1e3))
+    print('same landmarks: ' + str(same))
+
+def runDisplay(frames, mp_drawing, mp_hands):
+    """
+    runDisplay() recognizes frames the way testing.py does with a window
+
+    :param frames: JPEG images
+    :param mp_drawing: mediapipe drawing utilities
+    :param mp_hands: mediapipe hands solution
+    :return: landmarks per frame, total seconds, seconds spent on display work
+    """
+    hands = []
+    render = 0.
+    with mp_hands.Hands(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5) as context:
+        start = time.perf_counter()
+        for jpg in frames:
+            image = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            image = cv2.resize(cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE), (480,640))
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            handResults = context.process(image)
+            mark = time.perf_counter()
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            myHand = None
+            for hand_landmarks in handResults.multi_hand_landmarks or []:
+                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS,
+                    mp_drawing.DrawingSpec(color=(0, 22, 200), thickness=2, circle_radius=4),
+                    mp_drawing.DrawingSpec(color=(200, 50, 0), thickness=2, circle_radius=4))
+                myHand = [(int(landMark.x*WIDTH),int(landMark.y*HEIGHT)) for landMark in hand_landmarks.landmark]
+            cv2.flip(image, 1)
+            render += time.perf_counter() - mark
+            hands.append(myHand)
+        elapsed = time.perf_counter() - start
+    return hands, elapsed, render
+
+def runHeadless(frames, mp_hands):
+    """
+    runHeadless() recognizes frames the way recognizeHeadless() does
+
+    :param frames: JPEG images
+    :param mp_hands: mediapipe hands solution
+    :return: landmarks per frame, total seconds
+    """
+    hands = []
+    myHand = landmarkBuffer()
+    with mp_hands.Hands(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5) as context:
+        start = time.perf_counter()
+        for jpg in frames:
+            image = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            image = cv2.resize(cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE), (480,640))
+            handResults = context.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            if handResults.multi_hand_landmarks:
+                hands.append(extractLandmarks(handResults, myHand, WIDTH, HEIGHT).copy())
+            else:
+                hands.append(None)
+        elapsed = time.perf_counter() - start
+    return hands, elapsed
+
+if __name__ == "__main__":
+   main()
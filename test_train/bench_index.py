@@ -0,0 +1,79 @@
+#----------------------------------------------------------------------------
+# bench_index.py - library size sweep of the nearest-neighbour index backends
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import sys
+import time
+import numpy as np
+from bench_features import loadHandsData
+from features import distanceMatrices
+from indexes import BACKENDS
+from matcher import GestureMatcher
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+# library sizes to sweep
+LIBRARY_SIZES=[70, 1000, 10000, 100000]
+
+# unknown gestures timed per library size
+NUM_QUERIES=200
+
+def main():
+    """
+    main() grows a synthetic library from the recorded hands and reports build
+    time and query latency of every backend, checking they agree with brute force
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    rng = np.random.default_rng(0)
+    queries = distanceMatrices(augmentHands(handsData, NUM_QUERIES, rng))
+    backends = sys.argv[1:] or list(BACKENDS)
+
+    print('{:>8} {:>10} {:>12} {:>14} {:>14}'.format('size', 'backend', 'build ms', 'classify us', 'top-5 us'))
+    for size in LIBRARY_SIZES:
+        library = distanceMatrices(augmentHands(handsData, size, rng))
+        names = ['gesture' + str(i % len(handsData)) for i in range(size)]
+        expected = None
+        for backend in backends:
+            start = time.perf_counter()
+            matcher = GestureMatcher(library, names, handNodes, errorTolerance, backend)
+            buildTime = time.perf_counter() - start
+
+            start = time.perf_counter()
+            gestures = [matcher.classify(query) for query in queries]
+            classifyTime = (time.perf_counter() - start)/len(queries)
+
+            start = time.perf_counter()
+            nearest = [matcher.match(query, topK=5).index for query in queries]
+            matchTime = (time.perf_counter() - start)/len(queries)
+
+            if expected is None:
+                expected = (gestures, nearest)
+            elif (gestures, nearest) != expected:
+                raise AssertionError(backend + ' disagrees with ' + backends[0] + ' at size ' + str(size))
+            print('{:>8} {:>10} {:>12.1f} {:>14.1f} {:>14.1f}'.format(size, backend, buildTime*1e3, classifyTime*1e6, matchTime*1e6))
+
+def augmentHands(handsData, count, rng):
+    """
+    augmentHands() creates count hands by rotating, scaling and jittering the
+    recorded hands
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param count: number of hands to create
+    :param rng: numpy random generator
+    :return: (count, 21, 2) hands
+    """
+    hands = handsData[np.arange(count) % len(handsData)]
+    angles = rng.normal(0, 0.15, count)
+    cos, sin = np.cos(angles), np.sin(angles)
+    rotation = np.stack([np.stack([cos, -sin], -1), np.stack([sin, cos], -1)], -2)
+    centre = hands.mean(axis=1, keepdims=True)
+    hands = np.einsum('nij,nkj->nki', rotation, hands - centre)*rng.uniform(0.8, 1.2, (count, 1, 1)) + centre
+    return np.rint(hands + rng.normal(0, 6, hands.shape))
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,77 @@
+#----------------------------------------------------------------------------
+# bench_library.py - startup load time of CSV vs binary gesture library
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import csv
+import os
+import tempfile
+import time
+import numpy as np
+from bench_features import loadHandsData
+from bench_index import augmentHands
+from features import distanceMatrices
+from library import loadLibrary, readCSV, saveLibrary
+from matcher import GestureMatcher
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+# library sizes to sweep
+LIBRARY_SIZES=[70, 1000, 10000, 100000]
+
+def main():
+    """
+    main() writes libraries of growing size in both formats and times how long
+    it takes to get from files on disk to a ready GestureMatcher
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    rng = np.random.default_rng(0)
+    print('{:>8} {:>12} {:>12} {:>12} {:>12} {:>9}'.format('size', 'csv KiB', 'csv ms', 'bundle KiB', 'bundle ms', 'speedup'))
+    with tempfile.TemporaryDirectory() as directory:
+        for size in LIBRARY_SIZES:
+            hands = augmentHands(handsData, size, rng).astype(int)
+            names = ['gesture' + str(i % 14) for i in range(size)]
+            dataPath = os.path.join(directory, 'gesture_data.csv')
+            namesPath = os.path.join(directory, 'gesture_names.csv')
+            libraryPath = os.path.join(directory, 'gesture_library')
+            writeCSV(hands, names, dataPath, namesPath)
+            saveLibrary(libraryPath, hands, names, handNodes)
+
+            start = time.perf_counter()
+            csvHands, csvNames = readCSV(dataPath, namesPath)
+            csvMatcher = GestureMatcher(distanceMatrices(csvHands), csvNames, handNodes, errorTolerance)
+            csvTime = time.perf_counter() - start
+
+            start = time.perf_counter()
+            library = loadLibrary(libraryPath, handNodes)
+            bundleMatcher = GestureMatcher.fromFeatures(library.features, library.gestureNames(), handNodes, errorTolerance)
+            bundleTime = time.perf_counter() - start
+
+            query = distanceMatrices(hands[size//2])[0]
+            if csvMatcher.match(query).index != bundleMatcher.match(query).index:
+                raise AssertionError('CSV and library matchers disagree')
+            bundleSize = sum(os.path.getsize(os.path.join(libraryPath, name)) for name in os.listdir(libraryPath))
+            print('{:>8} {:>12.0f} {:>12.1f} {:>12.0f} {:>12.1f} {:>8.0f}x'.format(size,
+                (os.path.getsize(dataPath) + os.path.getsize(namesPath))/1024, csvTime*1e3,
+                bundleSize/1024, bundleTime*1e3, csvTime/bundleTime))
+
+def writeCSV(hands, names, dataPath, namesPath):
+    """
+    writeCSV() writes hands in the format saveToCSV() in training.py uses
+
+    :param hands: (K, 21, 2) landmark positions
+    :param names: gesture name per template
+    :param dataPath: CSV of landmark tuples
+    :param namesPath: CSV of gesture names
+    """
+    with open(dataPath, 'w', newline='') as f:
+        csv.writer(f).writerows([[tuple(point) for point in hand.tolist()] for hand in hands])
+    with open(namesPath, 'w', newline='') as f:
+        csv.writer(f).writerows([names])
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,102 @@
+#----------------------------------------------------------------------------
+# bench_matcher.py - benchmark of the batched template matcher
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import csv
+import timeit
+import numpy as np
+from bench_features import loadHandsData
+from features import distanceMatrices
+from matcher import GestureMatcher
+
+# gesture names matching the benchmark library (run from repository root)
+GESTURE_NAMES='./aggregate_gesture_data/gesture_names.csv'
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+# how many times each measurement is repeated
+REPEATS=200
+
+def main():
+    """
+    main() checks the batched matcher against the original per-template loop
+    and times both on the recorded library
+    """
+    handsData = loadHandsData()
+    with open(GESTURE_NAMES, newline='') as f:
+        gestNames = list(csv.reader(f))[0]
+    knownGestures = list(distanceMatrices(handsData))
+    matcher = GestureMatcher(knownGestures, gestNames, handNodes, errorTolerance)
+
+    queries = makeQueries(handsData)
+    checkAgreement(queries, matcher, knownGestures, gestNames)
+
+    query = queries[len(queries)//2]
+    loopTime = timeit.timeit(lambda: loopMatch(query, knownGestures, gestNames), number=REPEATS)/REPEATS
+    batchTime = timeit.timeit(lambda: matcher.match(query), number=REPEATS)/REPEATS
+    print('{} templates   loop {:>9.1f} us   batched {:>9.1f} us   speedup {:>6.1f}x'.format(
+        len(matcher), loopTime*1e6, batchTime*1e6, loopTime/batchTime))
+
+    result = matcher.match(query, topK=5)
+    print('top-5 for sample query:', ', '.join('{} ({:.2f})'.format(name, error) for name, error in zip(result.names, result.errors)))
+
+def makeQueries(handsData):
+    """
+    makeQueries() builds unknown gestures by jittering the recorded hands
+
+    :param handsData: raw landmark tuples
+    :return: distance matrices of the jittered hands
+    """
+    rng = np.random.default_rng(0)
+    landmarks = np.repeat(np.asarray(handsData, dtype=np.float64), 5, axis=0)
+    landmarks += rng.normal(0, 8, landmarks.shape)
+    return list(distanceMatrices(np.rint(landmarks)))
+
+def checkAgreement(queries, matcher, knownGestures, gestNames):
+    """
+    checkAgreement() makes sure the matcher gives the same answer as the loop
+
+    :param queries: unknown gestures
+    :param matcher: GestureMatcher under test
+    :param knownGestures: distance matrices of the library
+    :param gestNames: names of the library
+    """
+    for query in queries:
+        expected = loopMatch(query, knownGestures, gestNames)
+        for gesture in (matcher.match(query).gesture, matcher.classify(query)):
+            if gesture != expected:
+                raise AssertionError('matcher returned ' + gesture + ' but loop returned ' + expected)
+
+def loopMatch(unknownGesture, knownGestures, gestureNames):
+    """
+    loopMatch() original matchGesture/errorMargin logic kept as a reference
+
+    :param unknownGesture: gesture from user
+    :param knownGestures: gestures that were already trained
+    :param gestureNames: gesture names that were trained
+    :return: gesture
+    """
+    gestureErrors=[]
+    for i in range(0,len(gestureNames)):
+        currError=0
+        for row in handNodes:
+            for column in handNodes:
+                currError += abs(knownGestures[i][row][column]-unknownGesture[row][column])
+        gestureErrors.append(currError)
+    minimumError=gestureErrors[0]
+    minIndex=0
+    for i in range(0, len(gestureErrors)):
+        if gestureErrors[i]<minimumError:
+            minimumError=gestureErrors[i]
+            minIndex=i
+    if minimumError<errorTolerance:
+        return gestureNames[minIndex]
+    return 'Unknown'
+
+if __name__ == "__main__":
+   main()
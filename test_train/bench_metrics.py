@@ -0,0 +1,64 @@
+#----------------------------------------------------------------------------
+# bench_metrics.py - cost of instrumenting the recognition loop
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import time
+from bench_features import loadHandsData
+from features import distanceMatrices
+from metrics import Metrics
+
+# calls timed per variant
+CALLS=100000
+
+def main():
+    """
+    main() times findDistances()-sized work raw, with metrics disabled and
+    with metrics enabled, and how long exporting the metrics takes
+    """
+    myHand = loadHandsData()[0]
+
+    def findDistances(gestureDataPoints):
+        return distanceMatrices(gestureDataPoints)[0]
+
+    def noop():
+        return None
+
+    disabled = Metrics(enabled=False)
+    enabled = Metrics()
+    if disabled.timed('find_distances')(findDistances) is not findDistances:
+        raise AssertionError('disabled metrics must leave functions undecorated')
+
+    print('{:<28} {:>12} {:>12} {:>12}'.format('call', 'raw us', 'disabled us', 'enabled us'))
+    for name, function, args in [('empty function', noop, ()), ('findDistances', findDistances, (myHand,))]:
+        raw = timeCalls(function, args)
+        off = timeCalls(disabled.timed(name)(function), args)
+        on = timeCalls(enabled.timed(name)(function), args)
+        print('{:<28} {:>12.2f} {:>12.2f} {:>12.2f}'.format(name, raw*1e6, off*1e6, on*1e6))
+
+    enabled.collect('pipeline', lambda: {'dropped_frames': 3, 'reconnects': 1, 'latency_ms': 12.5})
+    start = time.perf_counter()
+    text = enabled.prometheus()
+    print('prometheus export {:.2f} ms ({} lines)'.format((time.perf_counter() - start)*1e3, text.count('\n')))
+    start = time.perf_counter()
+    snapshot = enabled.snapshot()
+    print('json snapshot     {:.2f} ms'.format((time.perf_counter() - start)*1e3))
+    print(snapshot['timers'])
+
+def timeCalls(function, args):
+    """
+    timeCalls() measures the average time of a call
+
+    :param function: function to call
+    :param args: arguments
+    :return: seconds per call
+    """
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        function(*args)
+    return (time.perf_counter() - start)/CALLS
+
+if __name__ == "__main__":
+   main()
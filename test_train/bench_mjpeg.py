@@ -0,0 +1,126 @@
+#----------------------------------------------------------------------------
+# bench_mjpeg.py - throughput benchmark of the MJPEG stream parser
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import io
+import struct
+import sys
+import time
+import cv2
+import numpy as np
+from mjpeg import MJPEGReader
+
+# same boundary and part header as esp_camera.ino
+PART_BOUNDARY=b'123456789000000000000987654321'
+STREAM_BOUNDARY=b'\r\n--' + PART_BOUNDARY + b'\r\n'
+STREAM_PART=b'Content-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
+# set buffer size
+CAMERA_BUFFER_SIZE=4096
+
+# frames in the synthetic stream
+NUM_FRAMES=300
+
+def main():
+    """
+    main() compares the original find/slice loop with MJPEGReader on a
+    recorded stream file (first argument) or on synthetic streams
+    """
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            streams = {sys.argv[1]: (f.read(), None)}
+    else:
+        frames = syntheticFrames(NUM_FRAMES)
+        streams = {
+            'with headers': (multipartStream(frames, headers=True), frames),
+            'no headers': (multipartStream(frames, headers=False), frames),
+        }
+    for label, (data, frames) in streams.items():
+        print(label + ' (' + str(len(data)//1024) + ' KiB)')
+        for name, parse in (('find/slice', findSliceFrames), ('MJPEGReader', readerFrames)):
+            start = time.perf_counter()
+            parsed = parse(io.BufferedReader(io.BytesIO(data)))
+            elapsed = time.perf_counter() - start
+            line = '  {:<12} {:>7.1f} MB/s {:>9.0f} frames/s'.format(name, len(data)/elapsed/1e6, len(parsed)/elapsed)
+            if frames is not None:
+                line += '   intact frames {}/{}'.format(sum(1 for a, b in zip(parsed, frames) if a == b), len(frames))
+            print(line)
+
+def syntheticFrames(count):
+    """
+    syntheticFrames() encodes camera-sized JPEGs that each carry an EXIF
+    thumbnail, like many camera firmwares produce
+
+    :param count: number of frames
+    :return: list of JPEG bytes
+    """
+    rng = np.random.default_rng(0)
+    base = cv2.resize(rng.integers(0, 255, (90, 160, 3), dtype=np.uint8), (1280, 720))
+    thumbnail = cv2.imencode('.jpg', cv2.resize(base, (160, 90)))[1].tobytes()
+    exif = b'Exif\x00\x00' + thumbnail
+    app1 = b'\xff\xe1' + struct.pack('>H', len(exif) + 2) + exif
+    frames = []
+    for i in range(count):
+        image = np.roll(base, 4*i, axis=1)
+        jpg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+        frames.append(jpg[:2] + app1 + jpg[2:])
+    return frames
+
+def multipartStream(frames, headers=True):
+    """
+    multipartStream() lays frames out the way the ESP-EYE sends them
+
+    :param frames: list of JPEG bytes
+    :param headers: include the part headers (otherwise bare concatenated JPEGs)
+    :return: stream bytes
+    """
+    parts = []
+    for jpg in frames:
+        if headers:
+            parts.append(STREAM_PART % len(jpg))
+        parts.append(jpg)
+        if headers:
+            parts.append(STREAM_BOUNDARY)
+    return b''.join(parts)
+
+def findSliceFrames(liveStream):
+    """
+    findSliceFrames() original read loop kept as a reference
+
+    :param liveStream: file-like stream
+    :return: list of frames
+    """
+    frames = []
+    bitSequence=b''
+    while True:
+        data = liveStream.read(CAMERA_BUFFER_SIZE)
+        if not data:
+            return frames
+        bitSequence+=data
+        jpgHead=bitSequence.find(b'\xff\xd8')
+        jpgEnd=bitSequence.find(b'\xff\xd9')
+        if jpgHead>-1 and jpgEnd>-1:
+            frames.append(bitSequence[jpgHead:jpgEnd+2])
+            bitSequence=bitSequence[jpgEnd+2:]
+
+def readerFrames(liveStream):
+    """
+    readerFrames() reads every frame with MJPEGReader
+
+    :param liveStream: file-like stream
+    :return: list of frames
+    """
+    frames = []
+    reader = MJPEGReader(liveStream, CAMERA_BUFFER_SIZE)
+    try:
+        while True:
+            # copy only so frames can be compared after the run
+            frames.append(bytes(reader.readFrame()))
+    except ConnectionError:
+        return frames
+
+if __name__ == "__main__":
+   main()
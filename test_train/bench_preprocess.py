@@ -0,0 +1,123 @@
+#----------------------------------------------------------------------------
+# bench_preprocess.py - imageSetup's decode/rotate/resize/convert vs FramePreprocessor
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from bench_mjpeg import syntheticFrames
+from preprocess import FramePreprocessor
+from replay import loadCapture
+
+# frames per measurement
+FRAME_COUNT=100
+
+# camera resolutions to try when no capture is given (ESP-EYE OV2640 modes)
+CAMERA_SIZES=[(640, 480), (1280, 720), (1600, 1200)]
+
+# MediaPipe input sizes to try
+MODEL_SIZES=[(480, 640), (240, 320)]
+
+def main():
+    """
+    main() times the per-frame preprocessing the old imageSetup() did against
+    FramePreprocessor, with and without reduced-size decoding, and measures
+    how much memory each allocates per frame
+    """
+    parser = argparse.ArgumentParser(description='Benchmark frame preprocessing.')
+    parser.add_argument('capture', nargs='?', default=None, help='recorded MJPEG stream file (synthetic frames otherwise)')
+    args = parser.parse_args()
+
+    if args.capture is not None:
+        sets = [('capture', loadCapture(args.capture)[:FRAME_COUNT])]
+    else:
+        base = syntheticFrames(FRAME_COUNT)
+        sets = [('{}x{}'.format(*size), [resizeJPEG(jpg, size) for jpg in base]) for size in CAMERA_SIZES]
+
+    print('{:<10} {:<9} {:<16} {:>9} {:>11} {:>9} {:>10}'.format('frames', 'model', 'path', 'ms/frame', 'KiB/frame', 'arrays', 'diff'))
+    for name, frames in sets:
+        for modelSize in MODEL_SIZES:
+            reference = [legacySetup(jpg, modelSize)[0] for jpg in frames[:5]]
+            for label, setup in [('imageSetup', lambda jpg: legacySetup(jpg, modelSize)),
+                    ('fused', fusedSetup(modelSize, False)), ('fused+reduced', fusedSetup(modelSize, True))]:
+                seconds, allocated, arrays = measure(setup, frames)
+                # mean absolute pixel difference from the old path
+                diff = np.mean([np.abs(setup(jpg)[0].astype(int) - ref).mean() for jpg, ref in zip(frames[:5], reference)])
+                print('{:<10} {:<9} {:<16} {:>9.2f} {:>11.0f} {:>9.1f} {:>10.2f}'.format(name, '{}x{}'.format(*modelSize),
+                    label, seconds*1e3, allocated/1024, arrays, diff))
+
+def legacySetup(jpg, size):
+    """
+    legacySetup() is imageSetup() before FramePreprocessor
+
+    :param jpg: JPEG image
+    :param size: MediaPipe input size
+    :return: BGR image, RGB image, new arrays made
+    """
+    image=cv2.imdecode(np.frombuffer(jpg,dtype=np.uint8),cv2.IMREAD_UNCHANGED)
+    image = cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    image=cv2.resize(image,size)
+    rgbImage = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    image = cv2.cvtColor(rgbImage, cv2.COLOR_RGB2BGR)
+    return image, rgbImage, 5
+
+def fusedSetup(size, reducedDecode):
+    """
+    fusedSetup() wraps a FramePreprocessor like imageSetup() uses it
+
+    :param size: MediaPipe input size
+    :param reducedDecode: decode at reduced size when possible
+    :return: function taking a JPEG and returning BGR image, RGB image, new arrays made
+    """
+    preprocessor = FramePreprocessor(size, reducedDecode=reducedDecode)
+    buffers = preprocessor.resized + preprocessor.bgr + preprocessor.rgb
+
+    def setup(jpg):
+        image, rgbImage = preprocessor.process(jpg)
+        fresh = 1 + sum(not any(np.shares_memory(output, buffer) for buffer in buffers) for output in (image, rgbImage))
+        return image, rgbImage, fresh
+    return setup
+
+def measure(setup, frames):
+    """
+    measure() times a setup function and the memory it allocates per frame
+
+    :param setup: function taking a JPEG
+    :param frames: JPEG images
+    :return: seconds per frame, bytes allocated per frame (peak), new arrays per frame
+    """
+    setup(frames[0])
+    start = time.perf_counter()
+    for jpg in frames:
+        setup(jpg)
+    seconds = (time.perf_counter() - start)/len(frames)
+
+    peaks = []
+    arrays = []
+    tracemalloc.start()
+    for jpg in frames[:10]:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        arrays.append(setup(jpg)[2])
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return seconds, float(np.mean(peaks)), float(np.mean(arrays))
+
+def resizeJPEG(jpg, size):
+    """
+    resizeJPEG() re-encodes a frame at another camera resolution
+
+    :param jpg: JPEG image
+    :param size: (width, height)
+    :return: JPEG image
+    """
+    image = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return cv2.imencode('.jpg', cv2.resize(image, size), [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+if __name__ == "__main__":
+   main()
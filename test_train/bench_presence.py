@@ -0,0 +1,166 @@
+#----------------------------------------------------------------------------
+# bench_presence.py - skip and missed-detection rates of the presence gate on replayed streams
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import time
+import cv2
+import numpy as np
+from dynamics import FRAME_TIME
+from presence import PresenceGate
+from preprocess import FramePreprocessor
+from replay import loadRecording
+
+# motion areas to sweep (fraction of the check image)
+MOTION_AREAS=[0.002, 0.01, 0.03]
+
+# synthetic scene: seconds of (empty, hand entering, held still, moving, leaving, empty)
+SCENE_SECONDS=[4, 0.6, 3, 1.5, 0.6, 4]
+
+# synthetic camera size (width, height)
+SCENE_SIZE=(640, 480)
+
+def main():
+    """
+    main() labels every frame of a capture with MediaPipe (or uses a synthetic
+    scene with known hand presence), then replays the frames through the
+    presence gate at several sensitivities and reports how many frames skip
+    MediaPipe and how many frames with a hand were skipped
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the presence gate.')
+    parser.add_argument('capture', nargs='?', default=None, help='recorded MJPEG stream file (synthetic scene otherwise)')
+    args = parser.parse_args()
+
+    if args.capture is not None:
+        frames, times = loadRecording(args.capture)
+        if times is None:
+            times = np.arange(len(frames))*FRAME_TIME
+        truth, handsTime = labelFrames(frames)
+        print('{} frames, {} with a hand, hands.process {:.1f} ms/frame'.format(len(frames), int(truth.sum()), handsTime*1e3))
+    else:
+        frames, times, truth = syntheticScene(np.random.default_rng(0))
+        print('{} synthetic frames, {} with a hand'.format(len(frames), int(truth.sum())))
+
+    print('{:>8} {:>6} {:>10} {:>10} {:>10} {:>12} {:>10}'.format('area', 'skin', 'skip', 'missed', 'false run', 'onset delay', 'gate us'))
+    for skinOnly in (False, True):
+        for motionArea in MOTION_AREAS:
+            gate = PresenceGate(motionArea=motionArea, skinOnly=skinOnly)
+            ran, gateTime = replay(gate, frames, times, truth)
+            skipRate = 1 - ran.mean()
+            missed = (truth & ~ran).sum()/max(1, truth.sum())
+            falseRun = (ran & ~truth).sum()/max(1, (~truth).sum())
+            delays = onsetDelays(truth, ran)
+            print('{:>8} {:>6} {:>10.1%} {:>10.1%} {:>10.1%} {:>12} {:>10.1f}'.format(motionArea, 'on' if skinOnly else 'off',
+                skipRate, missed, falseRun, ','.join(str(delay) for delay in delays) or '-', gateTime*1e6))
+
+def replay(gate, frames, times, truth):
+    """
+    replay() runs the gate over a stream, feeding back the labelled hand
+    presence for the frames it lets through, like MediaPipe would
+
+    :param gate: PresenceGate
+    :param frames: JPEG images
+    :param times: seconds each frame arrived at
+    :param truth: (n,) whether MediaPipe finds a hand in each frame
+    :return: (n,) frames that went through, seconds per gate check
+    """
+    ran = np.zeros(len(frames), dtype=bool)
+    start = time.perf_counter()
+    for i, jpg in enumerate(frames):
+        ran[i] = gate.shouldRun(jpg, times[i])
+        if ran[i]:
+            gate.record(bool(truth[i]))
+    return ran, (time.perf_counter() - start)/len(frames)
+
+def onsetDelays(truth, ran):
+    """
+    onsetDelays() counts the frames from each hand appearing until MediaPipe
+    ran on a frame with it
+
+    :param truth: (n,) whether MediaPipe finds a hand in each frame
+    :param ran: (n,) frames that went through the gate
+    :return: frames per appearance ('x' when the hand was never seen)
+    """
+    delays = []
+    starts = np.flatnonzero(truth & ~np.concatenate(([False], truth[:-1])))
+    for start in starts:
+        end = start
+        while end < len(truth) and truth[end]:
+            end += 1
+        seen = np.flatnonzero(ran[start:end])
+        delays.append(int(seen[0]) if len(seen) else 'x')
+    return delays
+
+def labelFrames(frames):
+    """
+    labelFrames() runs MediaPipe on every frame, like testing.py without a gate
+
+    :param frames: JPEG images
+    :return: (n,) whether a hand was found, seconds per hands.process
+    """
+    import mediapipe as mp
+    preprocessor = FramePreprocessor()
+    truth = np.zeros(len(frames), dtype=bool)
+    elapsed = 0.
+    with mp.solutions.hands.Hands(model_complexity=0, min_detection_confidence=0.5,
+            min_tracking_confidence=0.5) as hands:
+        for i, jpg in enumerate(frames):
+            rgbImage = preprocessor.process(jpg)[1]
+            start = time.perf_counter()
+            handResults = hands.process(rgbImage)
+            elapsed += time.perf_counter() - start
+            truth[i] = bool(handResults.multi_hand_landmarks)
+    return truth, elapsed/max(1, len(frames))
+
+def syntheticScene(rng):
+    """
+    syntheticScene() films a skin coloured hand shape entering a textured,
+    slightly noisy room, holding still, moving and leaving
+
+    :param rng: numpy random generator
+    :return: JPEG images, times, (n,) whether the hand is in view
+    """
+    width, height = SCENE_SIZE
+    room = cv2.GaussianBlur(rng.integers(40, 200, (height, width, 3), dtype=np.uint8), (0, 0), 6)
+    counts = [int(round(seconds/FRAME_TIME)) for seconds in SCENE_SECONDS]
+    outside = (-0.25*width, 0.5*height)
+    centre = (0.5*width, 0.55*height)
+    path = [outside]*counts[0]
+    path += [tuple(np.add(outside, np.subtract(centre, outside)*t)) for t in np.linspace(0, 1, counts[1])]
+    path += [centre]*counts[2]
+    path += [(centre[0] + 0.15*width*np.sin(t), centre[1]) for t in np.linspace(0, 2*np.pi, counts[3])]
+    path += [tuple(np.add(centre, np.subtract(outside, centre)*t)) for t in np.linspace(0, 1, counts[4])]
+    path += [outside]*counts[5]
+
+    frames = []
+    truth = np.zeros(len(path), dtype=bool)
+    for i, (x, y) in enumerate(path):
+        image = room.copy()
+        drawHand(image, (int(x), int(y)), int(0.12*height))
+        # sensor noise and a little exposure drift
+        image = cv2.add(image, rng.normal(np.sin(i/40.)*2, 2, image.shape).astype(np.int16), dtype=cv2.CV_8U)
+        frames.append(cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes())
+        # MediaPipe needs most of the hand in view
+        truth[i] = x > 0.05*width
+    return frames, np.arange(len(path))*FRAME_TIME, truth
+
+def drawHand(image, centre, palm):
+    """
+    drawHand() draws a palm with five fingers
+
+    :param image: BGR image drawn on
+    :param centre: palm centre (x, y)
+    :param palm: palm radius in pixels
+    """
+    skin = (120, 160, 220)
+    cv2.circle(image, centre, palm, skin, -1)
+    for angle in np.linspace(-0.9, 0.9, 4):
+        tip = (int(centre[0] + 2.2*palm*np.sin(angle)), int(centre[1] - 2.2*palm*np.cos(angle)))
+        cv2.line(image, centre, tip, skin, max(1, palm//3))
+    cv2.line(image, centre, (int(centre[0] - 1.6*palm), int(centre[1] - 0.3*palm)), skin, max(1, palm//3))
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,95 @@
+#----------------------------------------------------------------------------
+# bench_roi.py - full-frame vs region-of-interest hand detection on a recording
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from features import handNodeDistances
+from library import openLibrary
+from matcher import GestureMatcher
+from replay import loadCapture
+from roi import ROITracker
+
+# image size (same as testing.py)
+WIDTH=1280
+HEIGHT=720
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+def main():
+    """
+    main() runs a recorded stream through MediaPipe on full frames and with
+    ROITracker, reporting FPS and how often both modes agree
+    """
+    parser = argparse.ArgumentParser(description='Compare full-frame and ROI hand detection on a recorded stream.')
+    parser.add_argument('capture', help='recorded MJPEG stream file')
+    args = parser.parse_args()
+
+    frames = [prepare(jpg) for jpg in loadCapture(args.capture)]
+    library = openLibrary(handNodes)
+    matcher = GestureMatcher.fromFeatures(library.features, library.gestureNames(), handNodes, errorTolerance)
+
+    fullHands, fullGestures, fullTime = runMode(frames, matcher, None)
+    tracker = ROITracker()
+    roiHands, roiGestures, roiTime = runMode(frames, matcher, tracker)
+
+    detected = [full is not None for full in fullHands]
+    bothDetected = [i for i in range(len(frames)) if fullHands[i] is not None and roiHands[i] is not None]
+    errors = [np.abs(np.array(fullHands[i]) - np.array(roiHands[i])).mean() for i in bothDetected]
+    print('frames {}  hand in {} (full frame)'.format(len(frames), sum(detected)))
+    print('full frame  {:>7.1f} fps'.format(len(frames)/fullTime))
+    print('roi         {:>7.1f} fps   {}'.format(len(frames)/roiTime, tracker.counters()))
+    print('detection agreement  {:.1f}%'.format(100*np.mean([(full is None) == (roi is None) for full, roi in zip(fullHands, roiHands)])))
+    print('gesture agreement    {:.1f}%'.format(100*np.mean([full == roi for full, roi in zip(fullGestures, roiGestures)])))
+    if errors:
+        print('mean landmark difference {:.1f} px'.format(float(np.mean(errors))))
+
+def prepare(jpg):
+    """
+    prepare() decodes, rotates and resizes a frame like imageSetup() does
+
+    :param jpg: JPEG image
+    :return: BGR image
+    """
+    image=cv2.imdecode(np.frombuffer(jpg,dtype=np.uint8),cv2.IMREAD_UNCHANGED)
+    image = cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    return cv2.resize(image,(480,640))
+
+def runMode(frames, matcher, tracker):
+    """
+    runMode() recognizes every frame with a fresh Hands context
+
+    :param frames: BGR images
+    :param matcher: GestureMatcher
+    :param tracker: ROITracker, None for full-frame detection
+    :return: hands, gestures, seconds taken
+    """
+    hands = []
+    gestures = []
+    with mp.solutions.hands.Hands(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5) as context:
+        start = time.perf_counter()
+        for image in frames:
+            if tracker is None:
+                handResults = context.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            else:
+                handResults = tracker.process(context, image)
+            if not handResults.multi_hand_landmarks:
+                hands.append(None)
+                gestures.append(None)
+                continue
+            myHand = [(int(landMark.x*WIDTH),int(landMark.y*HEIGHT)) for landMark in handResults.multi_hand_landmarks[-1].landmark]
+            hands.append(myHand)
+            gestures.append(matcher.classify(handNodeDistances(myHand, handNodes)[0]))
+        elapsed = time.perf_counter() - start
+    return hands, gestures, elapsed
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,89 @@
+#----------------------------------------------------------------------------
+# bench_router.py - cost of issuing a command through the routing table and the if-chain it replaced
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import time
+from router import CommandRouter
+
+# commands issued when timing a lookup
+LOOKUPS=100000
+
+# Alexa request of the smart home Thumb-up
+THUMB_UP_URL='https://api.voicemonkey.io/trigger?access_token=$ACCESS_TOKEN'
+
+def main():
+    """
+    main() times issuing commands through the routing table against the
+    if-chain it replaced (test_router.py checks what they issue)
+    """
+    timeLookups()
+
+def legacyHandle(commandMode, myGesture, request, presentation):
+    """
+    legacyHandle() is the if-chain testing.py used before the routing table
+    (without its prints)
+    """
+    if(commandMode == 'One'):
+        if(myGesture == 'Thumb-up'):
+            request(THUMB_UP_URL)
+        if(myGesture == 'Thumb-down'):
+            request('')
+        if(myGesture == 'Go'):
+            request('')
+        if(myGesture == 'Rock'):
+            request('')
+    if(commandMode == 'Two'):
+        if(myGesture == 'Go'):
+            presentation['start']()
+        if(myGesture == 'Thumb-up'):
+            presentation['next']()
+        if(myGesture == 'Thumb-down'):
+            presentation['previous']()
+        if(myGesture == 'Rock'):
+            presentation['exit']()
+    if(commandMode == 'Three'):
+        if(myGesture == 'One'):
+            request('')
+        if(myGesture == 'Rock'):
+            request('')
+        if(myGesture == 'Go'):
+            request('')
+        if(myGesture == 'Thumb-up'):
+            request('')
+        if(myGesture == 'Thumb-down'):
+            request('')
+
+def timeLookups():
+    """
+    timeLookups() times issuing commands through the table and the if-chain
+    (microseconds either way, next to milliseconds per matched frame)
+    """
+    actions = {'request': lambda url: None, 'presentation': {command: (lambda: None) for command in ['start', 'next', 'previous', 'exit']}}
+    router = CommandRouter(actions, verbose=False)
+    commands = [('Three', 'Thumb-down'), ('Two', 'Rock'), ('One', 'Thumb-up'), ('Four', 'Go')]*(LOOKUPS//4)
+    start = time.perf_counter()
+    for commandMode, myGesture in commands:
+        router.handle(commandMode, myGesture)
+    table = (time.perf_counter() - start)/len(commands)
+    routes = router.routes[0]
+    start = time.perf_counter()
+    for commandMode, myGesture in commands:
+        route = routes.get((commandMode, myGesture))
+        if route is not None:
+            route[0](*route[1])
+    lookup = (time.perf_counter() - start)/len(commands)
+    start = time.perf_counter()
+    for commandMode, myGesture in commands:
+        legacyHandle(commandMode, myGesture, actions['request'], actions['presentation'])
+    chain = (time.perf_counter() - start)/len(commands)
+    print('\n{:<12} {:>10}'.format('dispatch', 'us/command'))
+    print('{:<12} {:>10.2f}'.format('if-chain', chain*1e6))
+    print('{:<12} {:>10.2f}'.format('table', lookup*1e6))
+    # with banners, Unknown checks and counters like testing.py issues them
+    print('{:<12} {:>10.2f}'.format('handle()', table*1e6))
+
+if __name__ == "__main__":
+   main()
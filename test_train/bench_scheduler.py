@@ -0,0 +1,101 @@
+#----------------------------------------------------------------------------
+# bench_scheduler.py - inference work and issued commands with and without adaptive scheduling
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import time
+import cv2
+import mediapipe as mp
+from bench_roi import prepare
+from commands import CommandState
+from features import handNodeDistances
+from library import openLibrary
+from matcher import GestureMatcher
+from replay import CAMERA_FPS, loadCapture
+from scheduler import InferenceScheduler
+
+# image size (same as testing.py)
+WIDTH=1280
+HEIGHT=720
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+def main():
+    """
+    main() replays a recorded stream on a simulated clock, once recognizing
+    every frame and once with InferenceScheduler, and compares how much
+    inference ran against which commands came out
+    """
+    parser = argparse.ArgumentParser(description='Compare every-frame and adaptive inference on a recorded stream.')
+    parser.add_argument('capture', help='recorded MJPEG stream file')
+    parser.add_argument('--fps', type=float, default=CAMERA_FPS, help='frame rate of the recording')
+    args = parser.parse_args()
+
+    frames = [prepare(jpg) for jpg in loadCapture(args.capture)]
+    library = openLibrary(handNodes)
+    matcher = GestureMatcher.fromFeatures(library.features, library.gestureNames(), handNodes, errorTolerance)
+
+    fullCommands, fullRuns, fullTime, _ = runMode(frames, args.fps, matcher, adaptive=False)
+    adaptiveCommands, adaptiveRuns, adaptiveTime, scheduler = runMode(frames, args.fps, matcher, adaptive=True)
+
+    print('frames {}  ({:.1f} s at {} fps)'.format(len(frames), len(frames)/args.fps, args.fps))
+    print('{:<10} {:>11} {:>11} {:>9}'.format('mode', 'inferences', 'cpu s', 'commands'))
+    print('{:<10} {:>11} {:>11.2f} {:>9}'.format('every', fullRuns, fullTime, len(fullCommands)))
+    print('{:<10} {:>11} {:>11.2f} {:>9}'.format('adaptive', adaptiveRuns, adaptiveTime, len(adaptiveCommands)))
+    print('scheduler ' + str(scheduler.counters()))
+    print('every frame: ' + formatCommands(fullCommands))
+    print('adaptive:    ' + formatCommands(adaptiveCommands))
+    same = [command for command, _ in fullCommands] == [command for command, _ in adaptiveCommands]
+    print('same command sequence: ' + str(same))
+    if same and fullCommands:
+        delays = [late - early for (_, early), (_, late) in zip(fullCommands, adaptiveCommands)]
+        print('mean command delay {:.0f} ms, max {:.0f} ms'.format(1e3*sum(delays)/len(delays), 1e3*max(delays)))
+
+def runMode(frames, fps, matcher, adaptive):
+    """
+    runMode() feeds frames through MediaPipe and CommandState on a simulated clock
+
+    :param frames: BGR images
+    :param fps: frame rate the frames were recorded at
+    :param matcher: GestureMatcher
+    :param adaptive: skip frames with InferenceScheduler
+    :return: commands with their frame time, inferences run, seconds spent in inference, scheduler
+    """
+    commands = CommandState(verbose=False)
+    commands.preFrameTime = 0.
+    scheduler = InferenceScheduler(commands.deadline) if adaptive else None
+    issued = []
+    runs = 0
+    busy = 0.
+    with mp.solutions.hands.Hands(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5) as hands:
+        for i, image in enumerate(frames):
+            now = i/fps
+            if scheduler is not None and not scheduler.shouldRun(now):
+                continue
+            start = time.perf_counter()
+            handResults = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            myHand = None
+            myGesture = None
+            if handResults.multi_hand_landmarks:
+                myHand = [(int(landMark.x*WIDTH),int(landMark.y*HEIGHT)) for landMark in handResults.multi_hand_landmarks[-1].landmark]
+                myGesture = matcher.classify(handNodeDistances(myHand, handNodes)[0])
+            if scheduler is not None:
+                scheduler.record(myHand, myGesture)
+            busy += time.perf_counter() - start
+            runs += 1
+            if myGesture is not None:
+                update = commands.update(myGesture, now)
+                if update.command is not None:
+                    issued.append((update.command, now))
+    return issued, runs, busy, scheduler
+
+def formatCommands(issued):
+    return ', '.join('{}/{}@{:.1f}s'.format(mode, gesture, at) for (mode, gesture), at in issued) or '-'
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,74 @@
+#----------------------------------------------------------------------------
+# bench_server.py - load test: how many glasses one box can serve
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import time
+from replay import CAMERA_FPS, ReplayServer, loadCapture
+from server import StreamServer, loadLibrary
+
+# share of the camera frame rate a device must keep to count as sustained
+SUSTAINED_RATIO=0.9
+
+def main():
+    """
+    main() replays a recorded capture to N simulated glasses at once, for
+    growing N, and reports per-device FPS and latency
+    """
+    parser = argparse.ArgumentParser(description='Replay N recorded streams through the stream server.')
+    parser.add_argument('capture', help='recorded MJPEG stream file')
+    parser.add_argument('--max-devices', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15, help='seconds per step')
+    parser.add_argument('--fps', type=float, default=CAMERA_FPS, help='frame rate of each replayed stream')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    replay = ReplayServer(loadCapture(args.capture), fps=args.fps).start()
+    library = loadLibrary()
+    sustained = 0
+    print('{:>8} {:>10} {:>12} {:>12} {:>14} {:>14}'.format('devices', 'total fps', 'min dev fps', 'drop %', 'p50 ms', 'p99 ms'))
+    try:
+        devices = 1
+        while devices <= args.max_devices:
+            counters = runStep(replay.url, devices, args.duration, args.workers, library)
+            totalFps = sum(c['processed'] for c in counters)/args.duration
+            minFps = min(c['processed'] for c in counters)/args.duration
+            read = sum(c['read'] for c in counters)
+            dropped = 100*(1 - sum(c['processed'] for c in counters)/read) if read else 0
+            print('{:>8} {:>10.1f} {:>12.1f} {:>12.1f} {:>14.1f} {:>14.1f}'.format(devices, totalFps, minFps, dropped,
+                max(c['latency_p50_ms'] for c in counters), max(c['latency_p99_ms'] for c in counters)))
+            if minFps >= SUSTAINED_RATIO*args.fps:
+                sustained = devices
+            devices *= 2
+    finally:
+        replay.stop()
+    print('glasses sustained at {:.0f}% of {} fps: {}'.format(SUSTAINED_RATIO*100, args.fps, sustained))
+
+def runStep(url, devices, duration, workers, library):
+    """
+    runStep() serves the replayed stream to a number of devices for a while
+
+    :param url: replay server url
+    :param devices: number of simulated glasses
+    :param duration: seconds to run
+    :param workers: worker processes
+    :param library: loaded gesture library
+    :return: per-device counters
+    """
+    server = StreamServer([url + '?device=' + str(i) for i in range(devices)], workers, library).start()
+    # give the workers time to load MediaPipe before measuring
+    time.sleep(3)
+    start = [(device.framesRead, device.stats.count) for device in server.devices]
+    time.sleep(duration)
+    counters = server.counters()
+    server.stop()
+    for counter, (read, processed) in zip(counters, start):
+        counter['read'] -= read
+        counter['processed'] -= processed
+    return counters
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,187 @@
+#----------------------------------------------------------------------------
+# bench_smoothing.py - time-to-command and false triggers of the hold timer vs landmark filtering and voting
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import csv
+import time
+import numpy as np
+from bench_features import loadHandsData
+from commands import CommandState
+from features import distanceMatrices
+from matcher import GestureMatcher
+from smoothing import GestureVote, LandmarkFilter
+
+# same settings as testing.py
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+errorTolerance=20
+
+# gesture names of the recorded hands
+GESTURE_NAMES='./aggregate_gesture_data/gesture_names.csv'
+
+# gestures the user shows, in order (the first picks the command mode)
+SCRIPT=['Two', 'One', 'Three', 'Four', 'Thumb-up', 'Rock', 'Five', 'Go']
+
+# seconds each gesture is held, and the hand is away or changing between gestures
+HOLD_SECONDS=5.
+GAP_SECONDS=1.
+TRANSITION_SECONDS=0.4
+
+# frames per second of the replayed stream
+STREAM_FPS=25
+
+# landmark noise in pixels, and how often MediaPipe misplaces the hand badly
+JITTER=10
+GLITCH_RATE=0.1
+GLITCH_JITTER=40.
+
+# scripted sessions replayed (with different noise) per configuration
+SESSIONS=20
+
+def main():
+    """
+    main() replays a scripted session of held gestures, changes and pauses
+    through the matcher and the command logic, with and without landmark
+    filtering and voting, and reports how long each gesture took to become a
+    command and how many commands fired for a gesture that was not shown
+    """
+    handsData = np.asarray(loadHandsData(), dtype=np.float64)
+    with open(GESTURE_NAMES, 'r', newline='') as f:
+        names = next(csv.reader(f))
+    matcher = GestureMatcher(distanceMatrices(handsData), names, handNodes, errorTolerance)
+    sessions = [scriptedStream(handsData, names, np.random.default_rng(seed)) for seed in range(SESSIONS)]
+
+    print('{} sessions of {} gestures held {:.0f} s each\n'.format(SESSIONS, len(SCRIPT), HOLD_SECONDS))
+    print('{:<22} {:>10} {:>10} {:>11} {:>10} {:>8} {:>9} {:>8} {:>10}'.format('config', 'frame acc', 'flicker/s',
+        'mean TTC s', 'max TTC s', 'missed', 'commands', 'false', 'filter us'))
+    for label, smooth, vote in [('hold timer (current)', False, False), ('hold timer + filter', True, False),
+            ('vote', False, True), ('filter + vote', True, True)]:
+        correct = flips = heldFrames = missed = commandCount = false = 0
+        delays = []
+        filterTimes = []
+        for hands, truth, starts in sessions:
+            times = np.arange(len(hands))/STREAM_FPS
+            events, matched, filterTime = replay(matcher, hands, truth, times, smooth, vote)
+            held = [gesture is not None for gesture in truth]
+            heldFrames += sum(held)
+            correct += sum(matched[i] == truth[i] for i in range(len(truth)) if held[i])
+            flips += sum(matched[i] != matched[i-1] for i in range(1, len(matched)) if held[i] and held[i-1])
+            sessionDelays, sessionMissed = timeToCommand(events, starts)
+            delays += sessionDelays
+            missed += sessionMissed
+            commandCount += len(events)
+            # accepted while a different gesture (or none) was being shown
+            false += sum(gesture != truth[min(len(truth) - 1, int(round(t*STREAM_FPS)))] for t, gesture in events)
+            filterTimes.append(filterTime)
+        print('{:<22} {:>10.1%} {:>10.2f} {:>11} {:>10} {:>8} {:>9} {:>8} {:>10}'.format(label, correct/heldFrames,
+            flips/(heldFrames/STREAM_FPS), '{:.2f}'.format(np.mean(delays)) if delays else '-',
+            '{:.2f}'.format(max(delays)) if delays else '-', missed, commandCount, false,
+            '{:.1f}'.format(np.mean(filterTimes)*1e6) if smooth else '-'))
+
+def replay(matcher, hands, truth, times, smooth, vote):
+    """
+    replay() runs the stream through matching and command logic like testing.py
+
+    :param matcher: GestureMatcher
+    :param hands: landmarks per frame (None without a hand)
+    :param truth: gesture shown per frame (None when away or changing)
+    :param times: seconds of every frame
+    :param smooth: filter the landmarks
+    :param vote: use a GestureVote instead of the hold timer
+    :return: [(time, gesture)] accepted (mode picks and commands), gesture matched per frame, filter seconds per frame
+    """
+    commands = CommandState(verbose=False, vote=GestureVote() if vote else None)
+    commands.preFrameTime = 0.
+    smoother = LandmarkFilter()
+    events = []
+    matched = []
+    filterTime = 0.
+    for hand, now in zip(hands, times):
+        if hand is None:
+            smoother.reset()
+            matched.append(None)
+            if vote:
+                commands.update(None, now)
+            continue
+        if smooth:
+            start = time.perf_counter()
+            hand = smoother.filter(hand, now)
+            filterTime += time.perf_counter() - start
+        myGesture = matcher.classify(distanceMatrices(hand)[0])
+        matched.append(myGesture)
+        mode = commands.commandMode
+        update = commands.update(myGesture, now)
+        if update.command is not None:
+            events.append((now, update.command[1]))
+        elif commands.commandMode != mode and commands.commandMode:
+            events.append((now, myGesture if not vote else commands.heldGesture))
+    return events, matched, filterTime/max(1, sum(hand is not None for hand in hands))
+
+def timeToCommand(events, starts):
+    """
+    timeToCommand() finds how long each scripted gesture took to be accepted
+
+    :param events: [(time, gesture)] accepted
+    :param starts: [(time, gesture, end time)] of every held gesture
+    :return: seconds per gesture that was accepted, gestures never accepted
+    """
+    delays = []
+    missed = 0
+    for start, gesture, end in starts:
+        accepted = [t for t, name in events if name == gesture and start <= t <= end]
+        if accepted:
+            delays.append(accepted[0] - start)
+        else:
+            missed += 1
+    return delays, missed
+
+def scriptedStream(handsData, names, rng):
+    """
+    scriptedStream() films the SCRIPT: each gesture held with jitter and
+    occasional glitches, alternating between a pause without a hand and a
+    direct change of pose
+
+    :param handsData: (N, 21, 2) recorded hands
+    :param names: gesture name of every recorded hand
+    :param rng: numpy random generator
+    :return: landmarks per frame (None without a hand), gesture shown per frame, [(start, gesture, end)]
+    """
+    hands = []
+    truth = []
+    starts = []
+    previous = None
+    for i, gesture in enumerate(SCRIPT):
+        # a different recording of the gesture than the first one
+        hand = handsData[[j for j, name in enumerate(names) if name == gesture][-1]]
+        if previous is not None and i % 2 == 0:
+            for t in np.linspace(0, 1, int(TRANSITION_SECONDS*STREAM_FPS)):
+                hands.append(noisy(previous + (hand - previous)*t, rng))
+                truth.append(None)
+        elif i > 0:
+            hands += [None]*int(GAP_SECONDS*STREAM_FPS)
+            truth += [None]*int(GAP_SECONDS*STREAM_FPS)
+        start = len(hands)/STREAM_FPS
+        for frame in range(int(HOLD_SECONDS*STREAM_FPS)):
+            # the hand drifts a little while it is held
+            drift = 8*np.array([np.sin(frame/STREAM_FPS*2), np.cos(frame/STREAM_FPS*1.3)])
+            hands.append(noisy(hand + drift, rng))
+            truth.append(gesture)
+        starts.append((start, gesture, len(hands)/STREAM_FPS))
+        previous = hand
+    return hands, truth, starts
+
+def noisy(hand, rng):
+    """
+    noisy() adds MediaPipe-like landmark noise
+
+    :param hand: (21, 2) landmarks
+    :param rng: numpy random generator
+    :return: (21, 2) landmarks
+    """
+    jitter = GLITCH_JITTER if rng.random() < GLITCH_RATE else JITTER
+    return np.rint(hand + rng.normal(0, jitter, hand.shape))
+
+if __name__ == "__main__":
+   main()
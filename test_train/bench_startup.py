@@ -0,0 +1,168 @@
+#----------------------------------------------------------------------------
+# bench_startup.py - import time and time to the first recognized frame of testing.py, headless
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from bench_mjpeg import multipartStream, syntheticFrames
+
+# modules testing.py used to import up front, now loaded when first needed
+LAZY_MODULES=['mediapipe', 'requests', 'win32com', 'pythoncom', 'dispatch', 'backend_voicemonkey', 'backend_presentation']
+
+# frames in the synthetic capture replayed when no capture is given
+CAPTURE_FRAMES=100
+
+# seconds to wait for the first frame before giving up on a run
+FIRST_FRAME_TIMEOUT=60
+
+# seconds the camera takes to answer, added to every connection (a replayed file answers at once)
+CONNECT_DELAY=0.5
+
+# runs testing.py headless on a recorded capture, in a fresh interpreter
+DRIVER = '''
+import sys, time
+start = time.perf_counter()
+import testing
+print('Imported: ' + repr(time.perf_counter() - start), flush=True)
+testing.HEADLESS = True
+testing.REPLAY_PATH = sys.argv[1]
+testing.OVERLAP_STARTUP = sys.argv[2] == 'overlapped'
+testing.STATS_INTERVAL = 3600
+connect = testing.connectToStream
+def slowConnect():
+    time.sleep(float(sys.argv[3]))
+    return connect()
+testing.connectToStream = slowConnect
+testing.main()
+'''
+
+def main():
+    """
+    main() measures how long importing testing.py takes and which heavy
+    modules it leaves out, then starts it headless on a capture several
+    times with overlapped and one-after-the-other startup and reports the
+    time of every step up to the first frame through the model
+    """
+    parser = argparse.ArgumentParser(description='Benchmark testing.py startup (headless).')
+    parser.add_argument('--capture', default=None, help='recorded MJPEG capture to replay (default: synthetic frames)')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--connect-delay', dest='connectDelay', type=float, default=CONNECT_DELAY,
+        help='seconds added to connecting to the stream')
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)),
+        os.environ.get('PYTHONPATH')])))
+    importTimes(root, environment)
+
+    directory = tempfile.mkdtemp()
+    try:
+        capture = args.capture
+        if capture is None:
+            capture = os.path.join(directory, 'capture.mjpeg')
+            with open(capture, 'wb') as f:
+                f.write(multipartStream(syntheticFrames(CAPTURE_FRAMES)))
+        print('\n{:<12} {:>9} {:>9} {:>10} {:>9} {:>12} {:>10}'.format('startup', 'import s', 'model s', 'library s',
+            'stream s', 'in main s', 'total s'))
+        for mode in ['sequential', 'overlapped']:
+            runs = [firstFrame(root, environment, capture, mode, args.connectDelay) for _ in range(args.runs)]
+            median = {key: sorted(run[key] for run in runs)[len(runs)//2] for key in runs[0]}
+            print('{:<12} {:>9.3f} {:>9.3f} {:>10.3f} {:>9.3f} {:>12.3f} {:>10.3f}'.format(mode, median['import_s'],
+                median['model_s'], median['library_s'], median['stream_s'], median['first_frame_s'], median['total_s']))
+    finally:
+        shutil.rmtree(directory)
+
+def importTimes(root, environment):
+    """
+    importTimes() imports testing.py in a fresh interpreter with -X importtime,
+    checks the lazily loaded modules stayed out and reports the slowest
+    imports, next to importing what testing.py used to import eagerly
+
+    :param root: repository root (testing.py reads its data relative to it)
+    :param environment: environment with test_train on PYTHONPATH
+    """
+    check = 'import sys, testing; print([name for name in {!r} if name in sys.modules])'.format(LAZY_MODULES)
+    loaded = subprocess.run([sys.executable, '-c', check], cwd=root, env=environment, capture_output=True, text=True)
+    assert loaded.returncode == 0, loaded.stderr
+    assert ast.literal_eval(loaded.stdout.strip()) == [], 'imported up front: ' + loaded.stdout.strip()
+
+    print('{:<40} {:>10}'.format('import', 'ms'))
+    timings = {}
+    for label, code in [('testing', 'import testing'), ('testing + mediapipe + requests (before)',
+            'import testing, mediapipe, requests')]:
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=root, env=environment,
+            capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        timings[label] = parseImportTimes(result.stderr)
+        print('{:<40} {:>10.1f}'.format(label, sum(timings[label][0].values())/1e3))
+    print('slowest imports of testing')
+    for name, cumulative in sorted(timings['testing'][1].items(), key=lambda item: -item[1])[:8]:
+        print('  {:<38} {:>10.1f}'.format(name, cumulative/1e3))
+
+def parseImportTimes(stderr):
+    """
+    parseImportTimes() reads the cumulative time of the top-level imports
+    and of the modules they import directly from -X importtime output
+
+    :param stderr: output of python -X importtime
+    :return: [{module: microseconds} of top-level imports, {module: microseconds} one level down]
+    """
+    levels = [{}, {}]
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # nested imports are indented two spaces per level under the module importing them
+        depth = (len(name) - len(name.lstrip()) - 1)//2
+        if depth < len(levels):
+            levels[depth][name.strip()] = int(cumulative)
+    return levels
+
+def firstFrame(root, environment, capture, mode, connectDelay):
+    """
+    firstFrame() starts testing.py headless on the capture and waits for its
+    startup report on the first frame, then quits it
+
+    :param root: repository root
+    :param environment: environment with test_train on PYTHONPATH
+    :param capture: MJPEG capture replayed as the stream
+    :param mode: 'overlapped' or 'sequential'
+    :param connectDelay: seconds added to connecting to the stream
+    :return: {'import_s', 'model_s', 'library_s', 'stream_s', 'first_frame_s', 'total_s'}
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-u', '-c', DRIVER, capture, mode, str(connectDelay)], cwd=root, env=environment,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    result = {}
+    output = []
+    try:
+        for line in process.stdout:
+            output.append(line)
+            if line.startswith('Imported: '):
+                result['import_s'] = float(line.split(': ', 1)[1])
+            if line.startswith('Startup: '):
+                result.update(ast.literal_eval(line.split(': ', 1)[1]))
+                result['total_s'] = time.perf_counter() - start
+                break
+            assert time.perf_counter() - start < FIRST_FRAME_TIMEOUT, 'no frame within ' + str(FIRST_FRAME_TIMEOUT) + ' s'
+        assert 'total_s' in result, 'testing.py exited before the first frame:\n' + ''.join(output[-20:])
+        process.stdin.write('quit\n')
+        process.stdin.flush()
+        process.wait(timeout=FIRST_FRAME_TIMEOUT)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return result
+
+if __name__ == "__main__":
+   main()
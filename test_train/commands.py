@@ -0,0 +1,167 @@
+#----------------------------------------------------------------------------
+# commands.py - command-mode state shared by testing.py and the stream server
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from collections import namedtuple
+import time
+
+# seconds a gesture has to be held before it is acted on
+HOLD_TIME=4
+
+# gesture that resets the command mode
+RESET_GESTURE='Stop'
+
+# states of the command mode state machine
+## AWAITING_MODE: the next accepted gesture picks the command mode
+## IN_MODE: accepted gestures are issued as commands in that mode
+AWAITING_MODE='awaiting_mode'
+IN_MODE='in_mode'
+
+# outcome of one recognized frame
+## label: gesture to draw on the frame (or None)
+## command: (commandMode, gesture) to issue to the system (or None)
+CommandUpdate = namedtuple('CommandUpdate', ['label', 'command'])
+
+class CommandState:
+    """
+    CommandState is the command mode state machine. It decides when a
+    recognized gesture is accepted: after it was held for HOLD_TIME, or with a
+    GestureVote as soon as the vote agrees on it (HOLD_TIME then only spaces
+    out repeats of a gesture that stays up). Accepted gestures move it along
+
+        AWAITING_MODE + 'Unknown' / RESET_GESTURE -> AWAITING_MODE
+        AWAITING_MODE + gesture                   -> IN_MODE (gesture is the mode)
+        IN_MODE       + 'Unknown'                 -> IN_MODE (asks to re-enter)
+        IN_MODE       + RESET_GESTURE             -> AWAITING_MODE (never waits to be held)
+        IN_MODE       + gesture                   -> IN_MODE, issues (mode, gesture)
+
+    Motion gestures (swipes) are reported on the one frame they are completed
+    in, so they are accepted right away, without the vote or the timer
+    """
+
+    def __init__(self, holdTime=HOLD_TIME, verbose=True, vote=None, onMode=None, motionGestures=()):
+        """
+        :param holdTime: seconds between accepted gestures
+        :param verbose: print mode changes like testing.py always has
+        :param vote: GestureVote deciding when a gesture is held (None = HOLD_TIME timer)
+        :param onMode: function called with the command mode when one is picked (optional)
+        :param motionGestures: names of the motion gestures, accepted on the frame they are reported
+        """
+        self.holdTime = holdTime
+        self.verbose = verbose
+        self.vote = vote
+        self.onMode = onMode
+        self.motionGestures = frozenset(motionGestures)
+        self.state = AWAITING_MODE
+        self.commandMode = ''
+        self.preFrameTime = time.time()
+        self.heldGesture = None
+
+    def reset(self):
+        self.state = AWAITING_MODE
+        self.commandMode = ''
+        # gestures seen before the reset do not carry over into the next mode
+        self.heldGesture = None
+        if self.vote is not None:
+            self.vote.reset()
+
+    def update(self, myGesture, now=None):
+        """
+        update() feeds the gesture matched in a frame that had a hand in it
+
+        :param myGesture: matched gesture name or 'Unknown' (None for a frame
+            without a hand, only used by the vote)
+        :param now: time of the frame (defaults to time.time())
+        :return: CommandUpdate
+        """
+        now = time.time() if now is None else now
+        if myGesture in self.motionGestures:
+            # a completed motion is only reported once, holding it is not possible
+            accepted = True
+        elif self.vote is None:
+            # track time that passed
+            accepted = now - self.preFrameTime > self.holdTime
+        else:
+            myGesture, accepted = self.voted(myGesture, now)
+            if myGesture is None:
+                return CommandUpdate(None, None)
+        label = myGesture if self.state == IN_MODE and myGesture != 'Unknown' else None
+        if self.state == IN_MODE and myGesture == RESET_GESTURE:
+            accepted = True
+        if not accepted:
+            return CommandUpdate(label, None)
+        # track time from start of when command is sent
+        self.preFrameTime = now
+        return CommandUpdate(label, self.transition(myGesture))
+
+    def voted(self, myGesture, now):
+        """
+        voted() accepts a gesture the moment the vote settles on it, and again
+        every holdTime while it stays up
+
+        :param myGesture: matched gesture name, 'Unknown' or None
+        :param now: time of the frame
+        :return: gesture the vote agrees on (None when undecided or no hand), accepted
+        """
+        myGesture, confident = self.vote.update(myGesture, now)
+        if not confident:
+            return None, False
+        if myGesture != self.heldGesture:
+            # a new gesture (or the hand going away) is acted on right away
+            self.heldGesture = myGesture
+            return myGesture, myGesture is not None
+        return myGesture, myGesture is not None and now - self.preFrameTime > self.holdTime
+
+    def transition(self, myGesture):
+        """
+        transition() moves the state machine on an accepted gesture
+
+        :param myGesture: accepted gesture name or 'Unknown'
+        :return: (commandMode, gesture) to issue, None when nothing is issued
+        """
+        if self.state == AWAITING_MODE:
+            if myGesture == 'Unknown' or myGesture == RESET_GESTURE:
+                return None
+            self.commandMode = myGesture
+            self.state = IN_MODE
+            self.log('COMMAND MODE = ' + self.commandMode)
+            if self.onMode is not None:
+                self.onMode(self.commandMode)
+            return None
+        if(myGesture == 'Unknown'):
+            self.log('Re-enter gesture!')
+            return None
+        if(checkForReset(myGesture, self.verbose)):
+            self.reset()
+            return None
+        return (self.commandMode, myGesture)
+
+    def deadline(self):
+        """
+        deadline() tells when the gesture being held is accepted
+
+        :return: time the current hold window closes
+        """
+        return self.preFrameTime + self.holdTime
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+def checkForReset(myGesture, verbose=True):
+    """
+    checkForReset() checks if the gesture resets the command mode
+
+    :param myGesture: matched gesture name
+    :param verbose: print the reset message
+    :return: boolean
+    """
+    if(myGesture == RESET_GESTURE):
+        if verbose:
+            print("Resetting system...issue new command mode in " + str(HOLD_TIME) + " seconds")
+        return True
+    else:
+        return False
@@ -0,0 +1,161 @@
+#----------------------------------------------------------------------------
+# connection.py - persistent live stream connection with in-place reconnects
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from http.client import HTTPException
+import random
+import socket
+import time
+from urllib.request import urlopen
+from mjpeg import MJPEGReader
+
+# seconds to wait for the camera to accept a connection, and for a read once streaming,
+# before the connection counts as dead (25 frames at 25 FPS)
+STREAM_TIMEOUT=1
+
+# errors that mean the stream is gone and should be reopened (a chunked response cut
+# off mid-chunk raises http.client.IncompleteRead, which is not an OSError)
+STREAM_ERRORS=(OSError, HTTPException)
+
+# first wait between reconnect attempts, doubled after every failure up to MAX_BACKOFF
+INITIAL_BACKOFF=0.25
+MAX_BACKOFF=8
+
+# fraction of each wait that is randomized so clients do not reconnect in lockstep
+BACKOFF_JITTER=0.5
+
+def openURL(url, ctx, timeout=STREAM_TIMEOUT):
+    """
+    openURL() connects to a live stream, the timeout stays on its socket so
+    a stalled read raises instead of blocking
+
+    :param url: live stream url
+    :param ctx: SSL context
+    :param timeout: seconds to wait for the connection and for every read
+    :return: live stream (raises OSError when the camera cannot be reached)
+    """
+    return urlopen(url, context=ctx, timeout=timeout)
+
+class ConnectionManager:
+    """
+    ConnectionManager hands out the frames of a live stream for as long as it
+    is asked to, reconnecting in place when the stream drops or stalls. Failed
+    attempts back off exponentially with jitter, and the time from losing the
+    stream (or starting) to the next frame is measured
+    """
+
+    def __init__(self, openStream, chunkSize=4096, initialBackoff=INITIAL_BACKOFF, maxBackoff=MAX_BACKOFF,
+            jitter=BACKOFF_JITTER, verbose=True):
+        """
+        :param openStream: function returning a connected live stream (raises OSError or HTTPException on failure)
+        :param chunkSize: bytes requested per stream read
+        :param initialBackoff: seconds to wait after the first failure
+        :param maxBackoff: longest wait between attempts
+        :param jitter: fraction of the wait that is randomized
+        :param verbose: print connection errors
+        """
+        self.openStream = openStream
+        self.chunkSize = chunkSize
+        self.initialBackoff = initialBackoff
+        self.maxBackoff = maxBackoff
+        self.jitter = jitter
+        self.verbose = verbose
+        self.failures = 0
+        self.connected = False
+        self.connects = 0
+        self.reconnects = 0
+        self.failedAttempts = 0
+        self.framesRead = 0
+        self.timeToFirstFrame = None
+        self.maxTimeToFirstFrame = 0.
+        self.downtime = 0.
+
+    def backoff(self):
+        """
+        backoff() picks how long to wait before the next attempt
+
+        :return: seconds
+        """
+        delay = min(self.maxBackoff, self.initialBackoff*2**max(0, self.failures - 1))
+        return delay*(1 - self.jitter*random.random())
+
+    def failed(self, error):
+        """
+        failed() records a failed attempt or a dropped stream
+
+        :param error: exception raised
+        """
+        self.failures += 1
+        self.failedAttempts += 1
+        if self.verbose:
+            if isinstance(error, socket.timeout):
+                print("Error: timeout error encountered.")
+            else:
+                print("Error: check connection to live stream.")
+
+    def frames(self, stopEvent=None):
+        """
+        frames() yields the stream's JPEGs, reconnecting whenever it drops
+
+        :param stopEvent: threading.Event that ends the stream (None = until the caller stops)
+        :return: generator of JPEGs (each only valid until the next one)
+        """
+        downSince = time.perf_counter()
+        while stopEvent is None or not stopEvent.is_set():
+            try:
+                liveStream = self.openStream()
+            except STREAM_ERRORS as error:
+                self.failed(error)
+                self.wait(stopEvent)
+                continue
+            if self.connects:
+                self.reconnects += 1
+            self.connects += 1
+            reader = MJPEGReader(liveStream, self.chunkSize)
+            try:
+                while stopEvent is None or not stopEvent.is_set():
+                    jpg = reader.readFrame()
+                    if downSince is not None:
+                        self.firstFrame(time.perf_counter() - downSince)
+                        downSince = None
+                    self.framesRead += 1
+                    yield jpg
+            except STREAM_ERRORS as error:
+                self.failed(error)
+            finally:
+                self.connected = False
+                close = getattr(liveStream, 'close', None)
+                if close is not None:
+                    close()
+            if downSince is None:
+                downSince = time.perf_counter()
+            self.wait(stopEvent)
+
+    def firstFrame(self, elapsed):
+        """
+        firstFrame() records a (re)connection that delivered a frame
+
+        :param elapsed: seconds since the stream was lost or first asked for
+        """
+        self.connected = True
+        self.failures = 0
+        self.timeToFirstFrame = elapsed
+        self.maxTimeToFirstFrame = max(self.maxTimeToFirstFrame, elapsed)
+        self.downtime += elapsed
+
+    def wait(self, stopEvent):
+        delay = self.backoff()
+        if stopEvent is None:
+            time.sleep(delay)
+        else:
+            stopEvent.wait(delay)
+
+    def counters(self):
+        return {'connected': self.connected, 'connects': self.connects, 'reconnects': self.reconnects,
+            'failed_attempts': self.failedAttempts, 'frames': self.framesRead,
+            'time_to_first_frame_ms': round(self.timeToFirstFrame*1e3, 1) if self.timeToFirstFrame is not None else None,
+            'max_time_to_first_frame_ms': round(self.maxTimeToFirstFrame*1e3, 1),
+            'downtime_s': round(self.downtime, 2)}
@@ -0,0 +1,178 @@
+#----------------------------------------------------------------------------
+# dispatch.py - asynchronous, pooled dispatch of gesture actions (VoiceMonkey/Alexa)
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from collections import OrderedDict, deque
+import threading
+import time
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeout in seconds for each request
+REQUEST_TIMEOUT=(2, 5)
+
+# attempts per action before giving up
+MAX_ATTEMPTS=3
+
+# seconds before the first retry, doubled for every later one
+BACKOFF=0.25
+
+# actions waiting to be sent before the oldest is dropped
+OUTBOX_SIZE=16
+
+# latencies kept for percentiles
+LATENCY_WINDOW=500
+
+class ActionDispatcher:
+    """
+    ActionDispatcher sends gesture actions from a small pool of worker threads
+    over one persistent HTTP session, so a slow endpoint never blocks the frame
+    loop. Actions wait in a bounded outbox where a command that is already
+    waiting is not queued twice
+    """
+
+    def __init__(self, numWorkers=2, timeout=REQUEST_TIMEOUT, maxAttempts=MAX_ATTEMPTS,
+            backoff=BACKOFF, outboxSize=OUTBOX_SIZE):
+        """
+        :param numWorkers: threads sending requests
+        :param timeout: (connect, read) timeout per request
+        :param maxAttempts: attempts per action
+        :param backoff: seconds before the first retry
+        :param outboxSize: actions waiting before the oldest is dropped
+        """
+        self.numWorkers = numWorkers
+        self.timeout = timeout
+        self.maxAttempts = maxAttempts
+        self.backoff = backoff
+        self.outboxSize = outboxSize
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=numWorkers, pool_maxsize=numWorkers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # url -> time the gesture was issued, in the order they were queued
+        self.outbox = OrderedDict()
+        self.condition = threading.Condition()
+        self.threads = []
+        self.stopped = False
+        self.counts = {'sent': 0, 'failed': 0, 'retries': 0, 'coalesced': 0, 'dropped': 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.inFlight = 0
+
+    def start(self):
+        with self.condition:
+            if not self.threads:
+                for i in range(self.numWorkers):
+                    thread = threading.Thread(target=self.workerLoop, name='dispatch-' + str(i), daemon=True)
+                    thread.start()
+                    self.threads.append(thread)
+        return self
+
+    def stop(self, wait=True):
+        """
+        stop() lets the workers finish what is queued and exit
+
+        :param wait: block until they have exited
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+        self.session.close()
+
+    def request(self, url, issuedAt=None):
+        """
+        request() queues a GET request and returns immediately
+
+        :param url: VoiceMonkey API url call
+        :param issuedAt: time the gesture was recognized (defaults to now)
+        :return: False when the action was coalesced with one already waiting
+        """
+        if not url:
+            print('No url configured for this gesture.')
+            return False
+        self.start()
+        with self.condition:
+            if url in self.outbox:
+                self.counts['coalesced'] += 1
+                return False
+            if len(self.outbox) >= self.outboxSize:
+                self.outbox.popitem(last=False)
+                self.counts['dropped'] += 1
+            self.outbox[url] = time.perf_counter() if issuedAt is None else issuedAt
+            self.condition.notify()
+        return True
+
+    def workerLoop(self):
+        """
+        workerLoop() sends queued requests until the dispatcher is stopped
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.outbox or self.stopped)
+                if not self.outbox:
+                    return
+                url, issuedAt = self.outbox.popitem(last=False)
+                self.inFlight += 1
+            ok = self.send(url)
+            with self.condition:
+                self.inFlight -= 1
+                self.counts['sent' if ok else 'failed'] += 1
+                if ok:
+                    self.latencies.append(time.perf_counter() - issuedAt)
+                self.condition.notify_all()
+
+    def send(self, url):
+        """
+        send() makes the request, retrying with exponential backoff on
+        connection errors, timeouts and server errors
+
+        :param url: VoiceMonkey API url call
+        :return: boolean (request succeeded)
+        """
+        for attempt in range(self.maxAttempts):
+            if attempt:
+                with self.condition:
+                    self.counts['retries'] += 1
+                time.sleep(self.backoff*2**(attempt - 1))
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                response.close()
+                if response.status_code < 400:
+                    return True
+                if response.status_code < 500:
+                    # the request itself is wrong, sending it again will not help
+                    print('Error: request rejected (' + str(response.status_code) + ').')
+                    return False
+            except requests.RequestException as error:
+                print('Error: request failed (' + type(error).__name__ + ').')
+        return False
+
+    def join(self, timeout=None):
+        """
+        join() waits until every queued action has been sent or given up on
+
+        :param timeout: seconds to wait
+        :return: boolean (outbox drained)
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.outbox and not self.inFlight, timeout)
+
+    def counters(self):
+        """
+        counters() reports send counts and gesture-to-request latency
+
+        :return: dict of counters
+        """
+        with self.condition:
+            counters = dict(self.counts)
+            counters['queued'] = len(self.outbox)
+            latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        counters['latency_p50_ms'] = round(float(np.percentile(latencies, 50))*1e3, 1)
+        counters['latency_p99_ms'] = round(float(np.percentile(latencies, 99))*1e3, 1)
+        return counters
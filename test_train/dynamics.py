@@ -0,0 +1,292 @@
+#----------------------------------------------------------------------------
+# dynamics.py - streaming recognition of motion gestures (swipes) with subsequence DTW
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import time
+import numpy as np
+from features import handNodeDistances, landmarkArray, palmSizes
+from library import LABELS_FILE, LANDMARKS_FILE, META_FILE, replaceDirectory
+
+# version of the bundle layout written by saveTemplates()
+FORMAT_VERSION=1
+
+# default location (run from repository root)
+DYNAMIC_LIBRARY_PATH='./aggregate_gesture_data/dynamic_library'
+
+# which hand nodes to extract data from (same as testing.py)
+HAND_NODES=[0,4,5,9,13,17,8,12,16,20]
+
+# files making up a dynamic library bundle (besides meta.json, landmarks.npy and labels.npy)
+## landmarks.npy: (frames of all clips, 21, 2) int32 landmark positions, clip after clip
+## times.npy: (frames of all clips,) float64 seconds since the clip started
+## lengths.npy: (clips,) int32 frames per clip
+## labels.npy: (clips,) int32 index into the label names
+TIMES_FILE='times.npy'
+LENGTHS_FILE='lengths.npy'
+
+# frames of features and palm trajectory kept by the recognizer
+WINDOW_FRAMES=64
+
+# landmarks averaged into the palm centre that is tracked (wrist and finger bases)
+PALM_CENTRE_NODES=[0,5,9,13,17]
+
+# frame interval palm velocities are expressed in (25 fps camera)
+FRAME_TIME=1/25
+
+# weight of the hand shape and of the palm motion in the per-frame cost
+SHAPE_WEIGHT=1.
+MOTION_WEIGHT=4.
+
+# mean cost (per live and template frame) below which a template counts as performed
+MATCH_THRESHOLD=0.5
+
+# palm sizes the palm has to travel for a motion gesture
+MIN_TRAVEL=1.
+
+# how much slower or faster than its template a motion may be performed
+MAX_STRETCH=2.
+
+# seconds after a detection before the next one
+REFRACTORY_TIME=1.
+
+def palmMotion(landmarks, times):
+    """
+    palmMotion() calculates palm centre velocity for a run of frames, in palm
+    sizes per FRAME_TIME (the first frame has none)
+
+    :param landmarks: (n, 21, 2) landmark positions
+    :param times: (n,) frame times in seconds
+    :return: centres (n, 2), velocities (n, 2)
+    """
+    centres = landmarks[:, PALM_CENTRE_NODES].mean(axis=1)
+    velocities = np.zeros_like(centres)
+    if len(centres) > 1:
+        elapsed = np.maximum(np.diff(times), 1e-3)
+        velocities[1:] = np.diff(centres, axis=0)/palmSizes(landmarks[1:])[:, np.newaxis]*(FRAME_TIME/elapsed)[:, np.newaxis]
+    return centres, velocities
+
+def frameVectors(features, velocities):
+    """
+    frameVectors() combines hand shape and palm motion into the vectors DTW
+    compares (L1 distance between two of them is the per-frame cost)
+
+    :param features: (n, k) handNodes features
+    :param velocities: (n, 2) palm velocities
+    :return: (n, k + 2) vectors
+    """
+    return np.hstack((features*(SHAPE_WEIGHT/features.shape[1]), velocities*MOTION_WEIGHT))
+
+class DynamicTemplates:
+    """
+    DynamicTemplates holds recorded motion gesture clips as one array of
+    frame vectors, clip after clip, so a live frame is compared against every
+    frame of every template in a single broadcast
+    """
+
+    def __init__(self, landmarks, times, lengths, labels, labelNames, handNodes):
+        """
+        :param landmarks: (frames, 21, 2) landmark positions of all clips
+        :param times: (frames,) seconds since each clip started
+        :param lengths: (clips,) frames per clip
+        :param labels: (clips,) index into labelNames
+        :param labelNames: gesture names
+        :param handNodes: key nodes to compute features for
+        """
+        self.landmarks = np.asarray(landmarks, dtype=np.float64)
+        self.times = np.asarray(times, dtype=np.float64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.labelNames = list(labelNames)
+        self.handNodes = list(handNodes)
+        offsets = np.concatenate(([0], np.cumsum(self.lengths)))
+        features = handNodeDistances(self.landmarks, handNodes)
+        vectors = []
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            _, velocities = palmMotion(self.landmarks[start:end], self.times[start:end])
+            vectors.append(frameVectors(features[start:end], velocities))
+        self.vectors = np.vstack(vectors) if vectors else np.zeros((0, features.shape[-1] + 2))
+        # template and position within it of every frame
+        self.owner = np.repeat(np.arange(len(self.lengths)), self.lengths)
+        self.position = np.arange(len(self.vectors)) - offsets[:-1][self.owner]
+        self.ends = offsets[1:] - 1
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def gestureNames(self):
+        return [self.labelNames[label] for label in self.labels]
+
+def saveTemplates(path, clips, clipTimes, gestureNames, handNodes, metadata=None):
+    """
+    saveTemplates() writes recorded clips as a dynamic library bundle,
+    replacing any bundle at path in one step
+
+    :param path: bundle directory
+    :param clips: list of (n, 21, 2) landmark positions
+    :param clipTimes: list of (n,) frame times per clip
+    :param gestureNames: gesture name per clip
+    :param handNodes: key nodes the features use
+    :param metadata: extra JSON-serializable information to keep
+    """
+    if len(clips) != len(gestureNames) or len(clips) != len(clipTimes):
+        raise ValueError('need one gesture name and time list per clip')
+    labelNames = list(dict.fromkeys(gestureNames))
+    landmarks = np.concatenate([np.asarray(clip, dtype=np.int32).reshape(-1, 21, 2) for clip in clips])
+    times = np.concatenate([np.asarray(clip, dtype=np.float64) - clip[0] for clip in clipTimes])
+    meta = {
+        'version': FORMAT_VERSION,
+        'count': len(clips),
+        'handNodes': [int(node) for node in handNodes],
+        'labelNames': labelNames,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metadata': metadata or {},
+    }
+
+    temporary = path + '.tmp'
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+    np.save(os.path.join(temporary, LANDMARKS_FILE), landmarks)
+    np.save(os.path.join(temporary, TIMES_FILE), times)
+    np.save(os.path.join(temporary, LENGTHS_FILE), np.array([len(clip) for clip in clips], dtype=np.int32))
+    np.save(os.path.join(temporary, LABELS_FILE), np.array([labelNames.index(name) for name in gestureNames], dtype=np.int32))
+    with open(os.path.join(temporary, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    replaceDirectory(temporary, path)
+
+def loadTemplates(path=DYNAMIC_LIBRARY_PATH, handNodes=None):
+    """
+    loadTemplates() opens a dynamic library bundle
+
+    :param path: bundle directory
+    :param handNodes: key nodes the caller matches on (None keeps the stored ones)
+    :return: DynamicTemplates
+    """
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError('unsupported dynamic library version: ' + str(meta.get('version')))
+    return DynamicTemplates(np.load(os.path.join(path, LANDMARKS_FILE)), np.load(os.path.join(path, TIMES_FILE)),
+        np.load(os.path.join(path, LENGTHS_FILE)), np.load(os.path.join(path, LABELS_FILE)),
+        meta['labelNames'], meta['handNodes'] if handNodes is None else handNodes)
+
+class DynamicRecognizer:
+    """
+    DynamicRecognizer spots motion gestures in the live stream with
+    subsequence DTW (a match may start at any frame). Every frame updates one
+    cost column from the previous one, so the work per frame only depends on
+    the total template length. A live frame may stay on a template frame,
+    advance one or skip one, which bounds the allowed speed difference.
+    Recent frame vectors and palm positions are kept in a ring buffer
+    """
+
+    def __init__(self, templates, threshold=MATCH_THRESHOLD, minTravel=MIN_TRAVEL, maxStretch=MAX_STRETCH,
+            window=WINDOW_FRAMES, refractoryTime=REFRACTORY_TIME):
+        """
+        :param templates: DynamicTemplates
+        :param threshold: mean cost per live and template frame a match has to stay below
+        :param minTravel: palm sizes the palm has to travel during a match
+        :param maxStretch: most a motion may be slower or faster than its template
+        :param window: frames kept in the ring buffer (at least maxStretch times the longest template)
+        :param refractoryTime: seconds after a detection before the next one
+        """
+        self.templates = templates
+        self.threshold = threshold
+        self.minTravel = minTravel
+        self.maxStretch = maxStretch
+        self.refractoryTime = refractoryTime
+        longest = int(templates.lengths.max()) if len(templates) else 0
+        self.window = max(window, int(np.ceil(maxStretch*longest)) + 1)
+        size = len(templates.vectors)
+        position = templates.position
+        # previous cell when advancing one or skipping one template frame (clamped, masked below)
+        self.stepFrom = np.maximum(np.arange(size) - 1, 0)
+        self.skipFrom = np.maximum(np.arange(size) - 2, 0)
+        self.firstFrame = position == 0
+        self.noSkip = position < 2
+        self.maxFrames = maxStretch*templates.lengths[templates.owner]
+        self.minFrames = templates.lengths/maxStretch
+        self.vectors = np.zeros((self.window, templates.vectors.shape[1]))
+        self.centres = np.zeros((self.window, 2))
+        self.frame = 0
+        self.lastTime = None
+        self.refractoryUntil = 0.
+        self.detections = 0
+        self.reset()
+
+    def reset(self):
+        """
+        reset() forgets partial matches (hand lost or gesture detected)
+        """
+        self.costs = np.full(len(self.templates.vectors), np.inf)
+        self.starts = np.zeros(len(self.templates.vectors), dtype=np.int64)
+        self.lastTime = None
+
+    def update(self, myHand, features, now):
+        """
+        update() feeds the next frame's hand
+
+        :param myHand: hand landmark positions (None when no hand was found)
+        :param features: handNodes features of the hand
+        :param now: time of the frame
+        :return: motion gesture name when one was just completed, otherwise None
+        """
+        if myHand is None or not len(self.templates):
+            self.reset()
+            return None
+        hand = landmarkArray(myHand)
+        slot = self.frame % self.window
+        centre = hand[0, PALM_CENTRE_NODES].mean(axis=0)
+        palm = max(float(palmSizes(hand)[0]), 1e-6)
+        # same velocity palmMotion() gives template frames
+        velocity = np.zeros(2)
+        if self.lastTime is not None:
+            previous = (self.frame - 1) % self.window
+            velocity = (centre - self.centres[previous])/palm*(FRAME_TIME/max(now - self.lastTime, 1e-3))
+        self.vectors[slot] = frameVectors(np.asarray(features, dtype=np.float64).reshape(1, -1), velocity[np.newaxis])[0]
+        self.centres[slot] = centre
+        self.lastTime = now
+
+        # one DTW column: stay on a template frame, advance one or skip one,
+        # weighted by the frames each move covers so short paths are not favoured
+        cost = np.abs(self.templates.vectors - self.vectors[slot]).sum(axis=1)
+        stay = self.costs + cost
+        step = np.where(self.firstFrame, np.inf, self.costs[self.stepFrom] + 2*cost)
+        skip = np.where(self.noSkip, np.inf, self.costs[self.skipFrom] + 3*cost)
+        candidates = np.stack((stay, step, skip))
+        choice = np.argmin(candidates, axis=0)
+        columns = np.arange(len(cost))
+        starts = np.stack((self.starts, self.starts[self.stepFrom], self.starts[self.skipFrom]))[choice, columns]
+        costs = candidates[choice, columns]
+        # a match can start on any frame
+        costs[self.firstFrame] = 2*cost[self.firstFrame]
+        starts[self.firstFrame] = self.frame
+        costs[self.frame - starts + 1 > self.maxFrames] = np.inf
+        self.costs, self.starts = costs, starts
+        self.frame += 1
+
+        if now < self.refractoryUntil:
+            return None
+        ends = self.templates.ends
+        frames = self.frame - self.starts[ends]
+        # every path weighs live frames plus template frames
+        scores = np.where(frames >= self.minFrames, self.costs[ends]/(frames + self.templates.lengths), np.inf)
+        best = int(np.argmin(scores))
+        if scores[best] >= self.threshold:
+            return None
+        startSlot = self.starts[ends[best]] % self.window
+        travel = np.linalg.norm(centre - self.centres[startSlot])/palm
+        if travel < self.minTravel:
+            return None
+        self.detections += 1
+        self.refractoryUntil = now + self.refractoryTime
+        self.reset()
+        return self.templates.labelNames[self.templates.labels[best]]
+
+    def counters(self):
+        return {'motion_templates': len(self.templates), 'motion_detections': self.detections}
@@ -0,0 +1,115 @@
+#----------------------------------------------------------------------------
+# enrollment.py - add gestures to a running matcher from live landmarks
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import threading
+import time
+import numpy as np
+from features import handNodeDistances, landmarkArray
+
+# frames of landmarks kept per enrollment
+ENROLL_FRAMES=20
+
+# keep every nth frame with a hand, so the samples are not all the same pose
+ENROLL_STRIDE=3
+
+class GestureEnroller:
+    """
+    GestureEnroller adds templates to a GestureMatcher while it is matching:
+    capture() starts recording the next frames with a hand under a gesture
+    name, observe() is fed the landmarks of every matched frame, and the
+    recorded landmarks are added to the matcher in place and handed to a
+    LibraryWriter to be saved in the background
+    """
+
+    def __init__(self, matcher, writer=None, frames=ENROLL_FRAMES, stride=ENROLL_STRIDE, verbose=True):
+        """
+        :param matcher: GestureMatcher to add templates to
+        :param writer: LibraryWriter saving the templates (None = only in memory)
+        :param frames: frames kept per enrollment
+        :param stride: keep every nth frame with a hand
+        :param verbose: print when an enrollment starts and ends
+        """
+        self.matcher = matcher
+        self.writer = writer
+        self.frames = frames
+        self.stride = stride
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.name = None
+        self.samples = []
+        self.seen = 0
+        self.enrollments = 0
+        self.templates = 0
+        self.lastInsert = None
+
+    def capture(self, name):
+        """
+        capture() records the gesture shown over the next frames as name
+        (safe to call from any thread)
+
+        :param name: gesture name to enroll
+        """
+        if not name:
+            raise ValueError('need a gesture name to enroll')
+        with self.lock:
+            self.name = name
+            self.samples = []
+            self.seen = 0
+        if self.verbose:
+            print('Enrolling ' + name + ', hold the gesture in view...')
+
+    def observe(self, myHand):
+        """
+        observe() is called with the landmarks of every frame with a hand and
+        keeps them while an enrollment is recording
+
+        :param myHand: (21, 2) hand landmark positions (copied, the caller may reuse it)
+        :return: templates added by this frame (0 while recording or idle)
+        """
+        with self.lock:
+            if self.name is None:
+                return 0
+            self.seen += 1
+            if (self.seen - 1) % self.stride:
+                return 0
+            self.samples.append(np.array(landmarkArray(myHand)[0]))
+            if len(self.samples) < self.frames:
+                return 0
+            name, samples = self.name, self.samples
+            self.name = None
+            self.samples = []
+        return self.enroll(name, samples)
+
+    def enroll(self, name, handsData):
+        """
+        enroll() adds landmark samples of one gesture to the matcher and
+        queues them to be saved
+
+        :param name: gesture name
+        :param handsData: (N, 21, 2) landmark positions
+        :return: number of templates added
+        """
+        # the library stores int32 pixels, so the matcher indexes exactly what a restart loads
+        landmarks = np.rint(landmarkArray(handsData)).astype(np.int32)
+        names = [name]*len(landmarks)
+        start = time.perf_counter()
+        self.matcher.add(handNodeDistances(landmarks, self.matcher.handNodes), names)
+        self.lastInsert = time.perf_counter() - start
+        if self.writer is not None:
+            self.writer.append(landmarks, names)
+        self.enrollments += 1
+        self.templates += len(landmarks)
+        if self.verbose:
+            print('Enrolled ' + name + ' (' + str(len(landmarks)) + ' templates, ' + str(len(self.matcher)) + ' known)')
+        return len(landmarks)
+
+    def counters(self):
+        with self.lock:
+            recording = self.name
+            recorded = len(self.samples)
+        return {'enrollments': self.enrollments, 'templates': self.templates, 'recording': recording,
+            'recorded': recorded, 'last_insert_ms': round(self.lastInsert*1e3, 3) if self.lastInsert is not None else None}
@@ -0,0 +1,417 @@
+#----------------------------------------------------------------------------
+# extract.py - batch landmark extraction from recorded captures, videos and JPEG folders
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+from collections import namedtuple
+import json
+import multiprocessing
+import os
+import threading
+import time
+import cv2
+import mediapipe as mp
+from headless import extractLandmarks, landmarkBuffer
+from library import HAND_NODES, saveLibrary
+from mjpeg import MJPEGReader
+from preprocess import OUTPUT_SIZE, FramePreprocessor
+from replay import CaptureStream
+
+# image size landmarks are scaled to (same as testing.py and training.py)
+WIDTH=1280
+HEIGHT=720
+
+# library the extracted templates are written to (train_offline.py --bundle takes it)
+OUTPUT_PATH='./aggregate_gesture_data/extracted_library'
+
+# progress journal kept next to the output, a rerun skips everything it lists
+JOURNAL_SUFFIX='.progress.jsonl'
+
+# files picked up, by extension
+JPEG_EXTENSIONS={'.jpg', '.jpeg'}
+CAPTURE_EXTENSIONS={'.mjpeg', '.mjpg', '.capture'}
+VIDEO_EXTENSIONS={'.mp4', '.avi', '.mov', '.mkv'}
+
+# frames of a capture or video per task (an interrupted run redoes at most one task per worker)
+SEGMENT_FRAMES=250
+
+# JPEG files per task
+BATCH_FILES=64
+
+# tasks read ahead per worker (bounds the capture frames held in memory)
+TASKS_PER_WORKER=2
+
+# seconds between progress reports
+REPORT_INTERVAL=5
+
+# part of a file handled as one resumable unit
+## key: unique name in the journal, label: gesture name of its hands
+## kind: 'jpeg', 'capture' or 'video', start/count: frames of a capture or video (count -1 = to the end)
+Unit = namedtuple('Unit', ['key', 'label', 'kind', 'path', 'start', 'count', 'stride'])
+
+# per-process state of a pool worker
+workerState = {}
+
+def main():
+    """
+    main() extracts hand landmarks from every capture, video and JPEG under
+    the given paths on a pool of processes and writes them as a gesture
+    library, labelled by the folder each file is in
+    """
+    parser = argparse.ArgumentParser(description='Extract hand landmarks from recordings into a gesture library.')
+    parser.add_argument('inputs', nargs='+', help='files or folders (gesture name = folder the file is in)')
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    parser.add_argument('--label', default=None, help='gesture name of every input instead of the folder names')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='processes running MediaPipe (default: CPU cores)')
+    parser.add_argument('--stride', type=int, default=1, help='keep every nth frame of captures and videos')
+    parser.add_argument('--no-rotate', dest='rotate', action='store_false', help='frames are upright already (not from the ESP-EYE)')
+    parser.add_argument('--restart', action='store_true', help='ignore the progress of earlier runs')
+    args = parser.parse_args()
+    counters = extractLibrary(args.inputs, args.output, args.workers, args.stride, args.rotate, args.label, args.restart)
+    print(json.dumps(counters))
+
+def extractLibrary(inputs, output=OUTPUT_PATH, workers=None, stride=1, rotate=True, label=None, restart=False, verbose=True):
+    """
+    extractLibrary() extracts everything the journal does not list yet and
+    writes the library from the whole journal
+
+    :param inputs: files or folders
+    :param output: library bundle to write
+    :param workers: processes running MediaPipe (None = CPU cores)
+    :param stride: keep every nth frame of captures and videos
+    :param rotate: rotate frames like imageSetup (ESP-EYE frames are sideways)
+    :param label: gesture name of every input (None = folder names)
+    :param restart: forget earlier progress
+    :param verbose: print progress
+    :return: counters
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    settings = {'stride': stride, 'rotate': rotate, 'width': WIDTH, 'height': HEIGHT}
+    journalPath = output + JOURNAL_SUFFIX
+    entries = readJournal(journalPath, settings, restart)
+    counters = {'workers': workers, 'resumed_units': len(entries)}
+    with openJournal(journalPath, settings) as journal:
+        try:
+            counters.update(extract(inputs, entries, journal, workers, stride, rotate, label, verbose))
+        except KeyboardInterrupt:
+            counters['interrupted'] = True
+            print('Interrupted, run again to continue where it stopped.')
+    landmarks = [hand for key in sorted(entries) for hand in entries[key]['landmarks']]
+    names = [entries[key]['label'] for key in sorted(entries) for _ in entries[key]['landmarks']]
+    counters['templates'] = len(landmarks)
+    if landmarks:
+        saveLibrary(output, landmarks, names, HAND_NODES, {'source': 'extract', 'units': len(entries), 'stride': stride})
+        if verbose:
+            print('Wrote ' + output + ' (' + str(len(landmarks)) + ' templates of ' + str(len(set(names))) + ' gestures)')
+    elif verbose:
+        print('No hands found, ' + output + ' not written.')
+    return counters
+
+def extract(inputs, entries, journal, workers, stride, rotate, label, verbose):
+    """
+    extract() runs the units not in entries on the pool and journals them as
+    they finish
+
+    :param inputs: files or folders
+    :param entries: journal entries by unit key (completed units are added)
+    :param journal: open journal file
+    :param workers: processes
+    :param stride: keep every nth frame of captures and videos
+    :param rotate: rotate frames like imageSetup
+    :param label: gesture name of every input (None = folder names)
+    :param verbose: print progress
+    :return: counters of this run
+    """
+    # the reader feeding the pool waits here, so captures are not read far ahead
+    slots = threading.BoundedSemaphore(workers*TASKS_PER_WORKER)
+    stopped = threading.Event()
+
+    def tasks():
+        for task in groupTasks(findUnits(inputs, stride, label, entries)):
+            # gives up when the run stops, so the pool can shut down
+            while not slots.acquire(timeout=0.1):
+                if stopped.is_set():
+                    return
+            yield task
+
+    frames = hands = unreadable = units = 0
+    start = reportTime = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=workerInit, initargs=(rotate,)) as pool:
+        try:
+            for results in pool.imap_unordered(extractTask, tasks()):
+                slots.release()
+                for unit, landmarks, seen, failed in results:
+                    entries[unit.key] = {'key': unit.key, 'label': unit.label, 'frames': seen, 'landmarks': landmarks}
+                    journal.write(json.dumps(entries[unit.key]) + '\n')
+                    frames += seen
+                    hands += len(landmarks)
+                    unreadable += failed
+                    units += 1
+                journal.flush()
+                if verbose and time.perf_counter() - reportTime > REPORT_INTERVAL:
+                    reportTime = time.perf_counter()
+                    fps = frames/(reportTime - start)
+                    print('{} frames, {} hands, {:.1f} frames/s ({:.1f} per worker)'.format(frames, hands, fps, fps/workers))
+        finally:
+            stopped.set()
+    elapsed = time.perf_counter() - start
+    fps = frames/elapsed if elapsed > 0 else 0.
+    return {'units': units, 'frames': frames, 'hands': hands, 'unreadable': unreadable, 'seconds': round(elapsed, 2),
+        'frames_per_second': round(fps, 1), 'frames_per_second_per_worker': round(fps/workers, 1)}
+
+def readJournal(path, settings, restart):
+    """
+    readJournal() loads the units earlier runs finished
+
+    :param path: journal file
+    :param settings: extraction settings the journal has to have been made with
+    :param restart: start over (the journal is removed)
+    :return: entries by unit key
+    """
+    if restart and os.path.exists(path):
+        os.remove(path)
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path) as f:
+        lines = f.readlines()
+    try:
+        made = json.loads(lines[0]).get('settings') if lines else None
+    except ValueError:
+        made = None
+    if made is None:
+        # killed before anything was extracted
+        os.remove(path)
+        return entries
+    if made != settings:
+        raise SystemExit('Error: ' + path + ' was made with ' + json.dumps(made) +
+            ', use --restart to extract with ' + json.dumps(settings) + '.')
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # a line cut short when the last run was killed
+            continue
+        entries[entry['key']] = entry
+    return entries
+
+def openJournal(path, settings):
+    """
+    openJournal() opens the journal for appending, starting it with the settings
+
+    :param path: journal file
+    :param settings: extraction settings
+    :return: file
+    """
+    exists = os.path.exists(path) and os.path.getsize(path) > 0
+    journal = open(path, 'a+')
+    if not exists:
+        journal.write(json.dumps({'settings': settings}) + '\n')
+    else:
+        journal.seek(journal.tell() - 1)
+        if journal.read(1) != '\n':
+            # never append to a line cut short
+            journal.write('\n')
+    return journal
+
+def findUnits(inputs, stride, label, entries):
+    """
+    findUnits() walks the inputs in order and splits every file into units,
+    reading capture frames here (reading is cheap next to MediaPipe)
+
+    :param inputs: files or folders
+    :param stride: keep every nth frame of captures and videos
+    :param label: gesture name of every input (None = folder names)
+    :param entries: units already done, skipped
+    :return: generator of (Unit, JPEG bytes of a capture unit or None)
+    """
+    for path in walkInputs(inputs):
+        extension = os.path.splitext(path)[1].lower()
+        name = label or os.path.basename(os.path.dirname(path))
+        if extension in JPEG_EXTENSIONS:
+            if path not in entries:
+                yield Unit(path, name, 'jpeg', path, 0, 1, 1), None
+        elif extension in CAPTURE_EXTENSIONS:
+            for unit, jpgs in captureUnits(path, name, stride, entries):
+                yield unit, jpgs
+        elif extension in VIDEO_EXTENSIONS:
+            for unit in videoUnits(path, name, stride):
+                if unit.key not in entries:
+                    yield unit, None
+
+def walkInputs(inputs):
+    """
+    walkInputs() lists the files under the inputs in a stable order
+
+    :param inputs: files or folders
+    :return: generator of absolute paths
+    """
+    for source in inputs:
+        source = os.path.abspath(source)
+        if os.path.isfile(source):
+            yield source
+            continue
+        for directory, folders, files in os.walk(source):
+            folders.sort()
+            for name in sorted(files):
+                yield os.path.join(directory, name)
+
+def captureUnits(path, name, stride, entries):
+    """
+    captureUnits() cuts a recorded stream into SEGMENT_FRAMES long units
+
+    :param path: capture file
+    :param name: gesture name
+    :param stride: keep every nth frame
+    :param entries: units already done (their frames are not kept)
+    :return: generator of (Unit, JPEG bytes)
+    """
+    stream = CaptureStream(path, realtime=False)
+    reader = MJPEGReader(stream)
+    start = 0
+    jpgs = []
+    try:
+        while True:
+            try:
+                jpg = reader.readFrame()
+            except ConnectionError:
+                break
+            index = reader.framesRead - 1
+            key = path + '#' + str(start)
+            if key not in entries and index % stride == 0:
+                jpgs.append(bytes(jpg))
+            if index - start + 1 == SEGMENT_FRAMES:
+                if key not in entries:
+                    yield Unit(key, name, 'capture', path, start, SEGMENT_FRAMES, stride), jpgs
+                start += SEGMENT_FRAMES
+                jpgs = []
+        key = path + '#' + str(start)
+        if reader.framesRead > start and key not in entries:
+            yield Unit(key, name, 'capture', path, start, reader.framesRead - start, stride), jpgs
+    finally:
+        stream.close()
+
+def videoUnits(path, name, stride):
+    """
+    videoUnits() cuts a video into SEGMENT_FRAMES long units, decoded by the workers
+
+    :param path: video file
+    :param name: gesture name
+    :param stride: keep every nth frame
+    :return: list of Unit
+    """
+    video = cv2.VideoCapture(path)
+    total = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+    video.release()
+    if total <= 0:
+        # containers without a frame count are read start to end by one worker
+        return [Unit(path + '#0', name, 'video', path, 0, -1, stride)]
+    return [Unit(path + '#' + str(start), name, 'video', path, start, min(SEGMENT_FRAMES, total - start), stride)
+        for start in range(0, total, SEGMENT_FRAMES)]
+
+def groupTasks(units):
+    """
+    groupTasks() batches JPEG files into one task, segments are tasks on their own
+
+    :param units: generator of (Unit, payload)
+    :return: generator of [(Unit, payload)]
+    """
+    batch = []
+    for unit, payload in units:
+        if unit.kind != 'jpeg':
+            yield [(unit, payload)]
+            continue
+        batch.append((unit, payload))
+        if len(batch) == BATCH_FILES:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def workerInit(rotate):
+    """
+    workerInit() builds the worker's one Hands instance and preprocessor
+
+    :param rotate: rotate frames like imageSetup
+    """
+    # one process per core, OpenCV threads would only compete with the other workers
+    cv2.setNumThreads(1)
+    # every frame is detected on its own, so results do not depend on how files were split up
+    workerState['hands'] = mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=1,
+        model_complexity=0,
+        min_detection_confidence=0.5)
+    workerState['preprocessor'] = FramePreprocessor(OUTPUT_SIZE, cv2.ROTATE_90_CLOCKWISE if rotate else None)
+    workerState['myHand'] = landmarkBuffer()
+
+def extractTask(task):
+    """
+    extractTask() extracts the landmarks of every unit in a task (in a worker)
+
+    :param task: [(Unit, JPEG bytes or None)]
+    :return: [(Unit, landmarks, frames looked at, unreadable frames)]
+    """
+    return [extractUnit(unit, jpgs) for unit, jpgs in task]
+
+def extractUnit(unit, jpgs):
+    """
+    extractUnit() runs MediaPipe on the frames of one unit
+
+    :param unit: Unit
+    :param jpgs: JPEG bytes of a capture unit
+    :return: Unit, landmarks ([[x, y]] per hand found), frames looked at, unreadable frames
+    """
+    preprocessor = workerState['preprocessor']
+    landmarks = []
+    frames = unreadable = 0
+    for image in unitImages(unit, jpgs):
+        frames += 1
+        try:
+            if isinstance(image, bytes):
+                _, rgbImage = preprocessor.process(image)
+            else:
+                _, rgbImage = preprocessor.prepare(image)
+        except ValueError:
+            unreadable += 1
+            continue
+        handResults = workerState['hands'].process(rgbImage)
+        if handResults.multi_hand_landmarks:
+            myHand = extractLandmarks(handResults, workerState['myHand'], WIDTH, HEIGHT)
+            landmarks.append(myHand.astype(int).tolist())
+    return unit, landmarks, frames, unreadable
+
+def unitImages(unit, jpgs):
+    """
+    unitImages() yields the frames of a unit: JPEG bytes, or decoded video frames
+
+    :param unit: Unit
+    :param jpgs: JPEG bytes of a capture unit
+    :return: generator of JPEG bytes or BGR images
+    """
+    if unit.kind == 'jpeg':
+        with open(unit.path, 'rb') as f:
+            yield f.read()
+    elif unit.kind == 'capture':
+        for jpg in jpgs:
+            yield jpg
+    else:
+        video = cv2.VideoCapture(unit.path)
+        try:
+            video.set(cv2.CAP_PROP_POS_FRAMES, unit.start)
+            index = 0
+            while unit.count < 0 or index < unit.count:
+                found, frame = video.read()
+                if not found:
+                    break
+                if (unit.start + index) % unit.stride == 0:
+                    yield frame
+                index += 1
+        finally:
+            video.release()
+
+if __name__ == "__main__":
+   main()
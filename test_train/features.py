@@ -0,0 +1,103 @@
+#----------------------------------------------------------------------------
+# features.py - vectorized hand feature extraction shared by testing and training
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from functools import lru_cache
+import numpy as np
+
+# number of landmarks MediaPipe Hands produces per hand
+NUM_LANDMARKS=21
+
+# landmarks used to normalize for palm size (wrist and middle finger base)
+PALM_NODES=(0,9)
+
+# dtype of handNodes feature vectors (what the matcher and the library keep)
+FEATURE_DTYPE=np.float32
+
+def landmarkArray(gestureDataPoints):
+    """
+    landmarkArray() converts one hand (list of (x, y) tuples) or a batch of
+    hands into a float array of shape (N, 21, 2)
+
+    :param gestureDataPoints: single hand or batch of hands
+    :return: landmarks
+    """
+    landmarks = np.asarray(gestureDataPoints, dtype=np.float64)
+    if landmarks.ndim == 2:
+        landmarks = landmarks[np.newaxis]
+    return landmarks
+
+def palmSizes(landmarks):
+    """
+    palmSizes() calculates size of palm for every hand in the batch
+
+    :param landmarks: (N, 21, 2) landmark array
+    :return: palmSizes (N,)
+    """
+    palm = landmarks[:, PALM_NODES[0]] - landmarks[:, PALM_NODES[1]]
+    return np.sqrt(np.einsum('nk,nk->n', palm, palm))
+
+def distanceMatrices(gestureDataPoints):
+    """
+    distanceMatrices() calculates the palm-normalized distances between every
+    pair of hand nodes for a whole batch of hands in one broadcast
+
+    :param gestureDataPoints: single hand or batch of hands
+    :return: distanceMatrices (N, 21, 21)
+    """
+    landmarks = landmarkArray(gestureDataPoints)
+    deltas = landmarks[:, :, np.newaxis, :] - landmarks[:, np.newaxis, :, :]
+    distances = np.sqrt(np.einsum('nijk,nijk->nij', deltas, deltas))
+    distances /= palmSizes(landmarks)[:, np.newaxis, np.newaxis]
+    return distances
+
+def handNodePairs(handNodes):
+    """
+    handNodePairs() lists the (row, column) pairs of the upper triangle of the
+    handNodes block of a distance matrix
+
+    :param handNodes: key nodes to track
+    :return: rows, columns
+    """
+    return nodePairs(tuple(int(node) for node in handNodes))
+
+@lru_cache(maxsize=None)
+def nodePairs(handNodes):
+    # every frame asks for the same few handNodes, build their pairs once
+    handNodes = np.asarray(handNodes)
+    rows, columns = np.triu_indices(len(handNodes), k=1)
+    rows, columns = handNodes[rows], handNodes[columns]
+    rows.flags.writeable = columns.flags.writeable = False
+    return rows, columns
+
+def handNodeFeatures(distanceMatrices, handNodes):
+    """
+    handNodeFeatures() flattens the upper triangle of the handNodes block, the
+    only part of a distance matrix gesture matching looks at
+
+    :param distanceMatrices: (..., 21, 21) distance matrices
+    :param handNodes: key nodes to track
+    :return: (..., n*(n-1)/2) feature vectors
+    """
+    rows, columns = handNodePairs(handNodes)
+    return np.ascontiguousarray(np.asarray(distanceMatrices)[..., rows, columns], dtype=FEATURE_DTYPE)
+
+def handNodeDistances(gestureDataPoints, handNodes):
+    """
+    handNodeDistances() calculates the palm-normalized distances of only the
+    handNodes pairs handNodeFeatures() keeps, without the full distance
+    matrix (same values as handNodeFeatures(distanceMatrices(...)))
+
+    :param gestureDataPoints: single hand or batch of hands
+    :param handNodes: key nodes to track
+    :return: (N, n*(n-1)/2) feature vectors
+    """
+    landmarks = landmarkArray(gestureDataPoints)
+    rows, columns = handNodePairs(handNodes)
+    deltas = landmarks[:, rows] - landmarks[:, columns]
+    distances = np.sqrt(np.einsum('npk,npk->np', deltas, deltas))
+    distances /= palmSizes(landmarks)[:, np.newaxis]
+    return np.ascontiguousarray(distances, dtype=FEATURE_DTYPE)
@@ -0,0 +1,167 @@
+#----------------------------------------------------------------------------
+# headless.py - display-free recognition: landmark buffer, control channel and preview
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import os
+import queue
+import sys
+import threading
+import time
+import cv2
+import numpy as np
+from features import NUM_LANDMARKS
+
+# preview images written per second
+PREVIEW_FPS=2
+
+# control channel words and the command they stand for
+CONTROL_COMMANDS={'q': 'quit', 'quit': 'quit', 'exit': 'quit',
+    's': 'stats', 'stats': 'stats',
+    'r': 'reset', 'reset': 'reset',
+    'e': 'enroll', 'enroll': 'enroll'}
+
+# control commands followed by an argument (enroll <gesture name>)
+ARGUMENT_COMMANDS={'enroll'}
+
+def landmarkBuffer():
+    """
+    landmarkBuffer() allocates the array landmarks are extracted into
+
+    :return: (21, 2) float array
+    """
+    return np.zeros((NUM_LANDMARKS, 2))
+
+def extractLandmarks(handResults, myHand, width, height):
+    """
+    extractLandmarks() writes the last hand's landmark pixel positions into
+    myHand, truncated the same way int() does in setLandmarks()
+
+    :param handResults: handResults with at least one hand
+    :param myHand: (21, 2) float array from landmarkBuffer()
+    :param width: frame width landmarks are scaled to
+    :param height: frame height landmarks are scaled to
+    :return: myHand
+    """
+    for i, landMark in enumerate(handResults.multi_hand_landmarks[-1].landmark):
+        myHand[i, 0] = landMark.x
+        myHand[i, 1] = landMark.y
+    myHand[:, 0] *= width
+    myHand[:, 1] *= height
+    np.trunc(myHand, out=myHand)
+    return myHand
+
+class ControlChannel:
+    """
+    ControlChannel reads commands typed on stdin (quit, stats, reset,
+    enroll <name>) on a background thread, so the frame loop polls for them
+    instead of blocking in cv2.waitKey()
+    """
+
+    def __init__(self, stream=None):
+        """
+        :param stream: text stream to read commands from (defaults to stdin)
+        """
+        self.stream = sys.stdin if stream is None else stream
+        self.commands = queue.Queue()
+        # argument of the command poll() returned last
+        self.argument = None
+        self.thread = threading.Thread(target=self.readLoop, name='control', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def readLoop(self):
+        """
+        readLoop() queues every known command until the stream closes
+        """
+        for line in self.stream:
+            word, _, argument = line.strip().partition(' ')
+            command = CONTROL_COMMANDS.get(word.lower())
+            if command is None:
+                print('Unknown command, use one of: quit, stats, reset, enroll <name>')
+                continue
+            argument = argument.strip()
+            if command in ARGUMENT_COMMANDS and not argument:
+                print('Usage: ' + command + ' <name>')
+                continue
+            self.commands.put((command, argument or None))
+
+    def poll(self):
+        """
+        poll() takes the next command without waiting
+
+        :return: command name, None when nothing was typed (its argument is in self.argument)
+        """
+        try:
+            command, self.argument = self.commands.get_nowait()
+        except queue.Empty:
+            return None
+        return command
+
+class PreviewWriter:
+    """
+    PreviewWriter draws the most recent frame a few times per second on its
+    own thread and writes it to an image file for debugging, so headless
+    runs still have something to look at without paying for it every frame
+    """
+
+    def __init__(self, path, draw, fps=PREVIEW_FPS):
+        """
+        :param path: JPEG file the preview is written to
+        :param draw: function drawing hand results onto a BGR image
+        :param fps: previews written per second
+        """
+        self.path = path
+        self.draw = draw
+        self.interval = 1/fps
+        self.latest = None
+        self.due = 0.
+        self.written = 0
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread(target=self.writeLoop, name='preview', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopEvent.set()
+
+    def offer(self, image, handResults, rgb):
+        """
+        offer() hands over a frame when a preview is due, copied because the
+        image is one of FramePreprocessor's reused buffers (other frames
+        return right away)
+
+        :param image: frame the inference thread is done with
+        :param handResults: handResults for the frame
+        :param rgb: image is RGB rather than BGR
+        """
+        now = time.perf_counter()
+        if now < self.due:
+            return
+        self.due = now + self.interval
+        self.latest = (image.copy(), handResults, rgb)
+
+    def writeLoop(self):
+        """
+        writeLoop() renders and writes the latest frame at the preview rate
+        """
+        temporary = self.path + '.tmp.jpg'
+        while not self.stopEvent.wait(self.interval):
+            latest, self.latest = self.latest, None
+            if latest is None:
+                continue
+            image, handResults, rgb = latest
+            # the copy made in offer() belongs to this thread
+            if rgb:
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            if handResults.multi_hand_landmarks:
+                self.draw(image, handResults)
+            cv2.imwrite(temporary, cv2.flip(image, 1))
+            os.replace(temporary, self.path)
+            self.written += 1
@@ -0,0 +1,447 @@
+#----------------------------------------------------------------------------
+# indexes.py - nearest-neighbour indexes over gesture feature vectors (L1 distance)
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import numpy as np
+from features import FEATURE_DTYPE
+
+class TemplateRows:
+    """
+    TemplateRows keeps rows in a buffer with spare capacity, so appending
+    copies only the new rows (the buffer doubles when it is full). The arrays
+    it hands out are snapshots: rows appended later never show up in them,
+    so a query can keep using the array it started with
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows: (K, ...) initial rows (not copied until the first append)
+        """
+        self.buffer = rows
+        self.count = len(rows)
+
+    def append(self, rows):
+        """
+        append() adds rows after the ones already kept
+
+        :param rows: (N, ...) rows to add
+        :return: (K+N, ...) snapshot of all rows
+        """
+        needed = self.count + len(rows)
+        if needed > len(self.buffer) or not self.buffer.flags.writeable:
+            buffer = np.empty((max(needed, 2*self.count, 16),) + self.buffer.shape[1:], dtype=self.buffer.dtype)
+            buffer[:self.count] = self.buffer[:self.count]
+            self.buffer = buffer
+        self.buffer[self.count:needed] = rows
+        self.count = needed
+        return self.buffer[:needed]
+
+def checkVectors(vectors, dimensions):
+    """
+    checkVectors() validates feature vectors before they are added to an index
+
+    :param vectors: (N, D) feature vectors
+    :param dimensions: D of the vectors already indexed
+    :return: (N, D) FEATURE_DTYPE vectors
+    """
+    vectors = np.asarray(vectors, dtype=FEATURE_DTYPE).reshape(-1, dimensions)
+    if not np.all(np.isfinite(vectors)):
+        raise ValueError('feature vectors must be finite')
+    return vectors
+
+class BruteForceIndex:
+    """
+    BruteForceIndex scans every template, exact and fastest for small libraries
+    """
+
+    def __init__(self, vectors):
+        """
+        :param vectors: (K, D) feature vectors of the known gestures
+        """
+        self.vectors = np.ascontiguousarray(vectors, dtype=FEATURE_DTYPE)
+        self.rows = TemplateRows(self.vectors)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def add(self, vectors):
+        """
+        add() appends templates; queries already running keep the old ones
+
+        :param vectors: (N, D) feature vectors of the new templates
+        """
+        self.vectors = self.rows.append(checkVectors(vectors, self.vectors.shape[1]))
+
+    def distances(self, vector):
+        """
+        distances() calculates the L1 distance from vector to every template
+
+        :param vector: (D,) feature vector of gesture from user
+        :return: distances (K,)
+        """
+        return l1Distances(self.vectors, vector)
+
+    def query(self, vector, k=1, bound=None):
+        """
+        query() finds the k nearest templates, closest first
+
+        :param vector: (D,) feature vector of gesture from user
+        :param k: how many templates to return
+        :param bound: only return templates strictly closer than bound
+        :return: indices, distances
+        """
+        distances = self.distances(vector)
+        order = rankErrors(distances, k)
+        if bound is not None:
+            order = order[distances[order] < bound]
+        return order, distances[order]
+
+class KDTreeIndex:
+    """
+    KDTreeIndex answers queries with a KD-tree built with scipy, pruning whole
+    subtrees once the errorTolerance bound is known
+    """
+
+    def __init__(self, vectors, leafSize=32):
+        """
+        :param vectors: (K, D) feature vectors of the known gestures
+        :param leafSize: templates per leaf before the tree stops splitting
+        """
+        # scipy is only needed when this backend is selected (its trees always keep float64)
+        from scipy.spatial import cKDTree
+        self.tree = cKDTree(np.asarray(vectors, dtype=FEATURE_DTYPE), leafsize=leafSize)
+
+    def __len__(self):
+        return self.tree.n
+
+    def add(self, vectors):
+        """
+        add() appends templates by building a new tree (scipy trees cannot
+        grow), queries already running keep the old one
+
+        :param vectors: (N, D) feature vectors of the new templates
+        """
+        from scipy.spatial import cKDTree
+        data = np.concatenate((self.tree.data, checkVectors(vectors, self.tree.m)))
+        self.tree = cKDTree(data, leafsize=self.tree.leafsize)
+
+    def distances(self, vector):
+        """
+        distances() calculates the L1 distance from vector to every template
+
+        :param vector: (D,) feature vector of gesture from user
+        :return: distances (K,)
+        """
+        return l1Distances(self.tree.data, vector)
+
+    def query(self, vector, k=1, bound=None):
+        """
+        query() finds the k nearest templates, closest first
+
+        :param vector: (D,) feature vector of gesture from user
+        :param k: how many templates to return
+        :param bound: only return templates strictly closer than bound
+        :return: indices, distances
+        """
+        k = max(1, min(k, len(self)))
+        distances, indices = self.tree.query(vector, k=np.arange(1, k+1), p=1,
+            distance_upper_bound=np.inf if bound is None else bound)
+        found = np.isfinite(distances)
+        return np.asarray(indices)[found], np.asarray(distances)[found]
+
+class QuantizedIndex:
+    """
+    QuantizedIndex scans 8-bit codes of the templates to shortlist candidates
+    and re-ranks the shortlist with the exact vectors, so results stay exact
+    """
+
+    def __init__(self, vectors, levels=255):
+        """
+        :param vectors: (K, D) feature vectors of the known gestures
+        :param levels: number of quantization steps (at most 255)
+        """
+        self.levels = levels
+        self.rows = TemplateRows(np.ascontiguousarray(vectors, dtype=FEATURE_DTYPE))
+        self.requantize(self.rows.buffer)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def vectors(self):
+        return self.arrays[0]
+
+    def requantize(self, vectors):
+        """
+        requantize() picks the code range from the templates and codes all of them
+
+        :param vectors: (K, D) feature vectors of every template
+        """
+        offset = float(vectors.min()) if vectors.size else 0.
+        span = float(vectors.max()) - offset if vectors.size else 0.
+        scale = span/self.levels if span > 0 else 1.
+        self.codeRows = TemplateRows(quantize(vectors, offset, scale).astype(np.uint8))
+        # the query reads the templates, codes and range as one snapshot
+        self.arrays = (vectors, self.codeRows.buffer[:len(vectors)], offset, scale)
+
+    def add(self, vectors):
+        """
+        add() appends templates, only coding everything again when the new
+        ones fall outside the code range; queries already running keep the
+        old templates
+
+        :param vectors: (N, D) feature vectors of the new templates
+        """
+        old, _, offset, scale = self.arrays
+        vectors = checkVectors(vectors, old.shape[1])
+        allVectors = self.rows.append(vectors)
+        codes = quantize(vectors, offset, scale)
+        if len(vectors) and (codes.min() < 0 or codes.max() > self.levels):
+            self.requantize(allVectors)
+            return
+        self.arrays = (allVectors, self.codeRows.append(codes.astype(np.uint8)), offset, scale)
+
+    def distances(self, vector):
+        """
+        distances() calculates the exact L1 distance from vector to every template
+
+        :param vector: (D,) feature vector of gesture from user
+        :return: distances (K,)
+        """
+        return l1Distances(self.vectors, vector)
+
+    def query(self, vector, k=1, bound=None):
+        """
+        query() finds the k nearest templates, closest first
+
+        :param vector: (D,) feature vector of gesture from user
+        :param k: how many templates to return
+        :param bound: only return templates strictly closer than bound
+        :return: indices, distances
+        """
+        vectors, templateCodes, offset, scale = self.arrays
+        k = max(1, min(k, len(vectors)))
+        # rounding the template and the query each moves a value by at most
+        # half a step, so the code distance is off by at most one step per value
+        slack = vectors.shape[1]*scale
+        codes = quantize(vector, offset, scale)
+        clipped = np.clip(codes, 0, self.levels)
+        # query values outside the template range add the same excess to every template
+        excess = np.abs(codes - clipped).sum()*scale
+        approximate = np.abs(templateCodes - clipped.astype(np.int16)).sum(axis=1, dtype=np.int32)*scale + excess
+        kth = np.partition(approximate, k-1)[k-1]
+        limit = kth + 2*slack
+        if bound is not None:
+            limit = min(limit, bound + slack)
+        candidates = np.flatnonzero(approximate <= limit)
+        distances = l1Distances(vectors[candidates], vector)
+        order = rankErrors(distances, k, candidates)
+        if bound is not None:
+            order = order[distances[order] < bound]
+        return candidates[order], distances[order]
+
+class EarlyAbandonIndex:
+    """
+    EarlyAbandonIndex scores templates one block of features at a time (the
+    rows of the handNodes upper triangle) and abandons a template as soon as
+    its partial error plus a lower bound on the blocks left passes the best
+    error found so far. The previous query's nearest templates are scored
+    first, since consecutive frames usually match the same template, so the
+    bound is tight from the start. Survivors are scored like BruteForceIndex,
+    so results are identical to the exhaustive scan
+    """
+
+    def __init__(self, vectors, minColumns=6):
+        """
+        :param vectors: (K, D) feature vectors of the known gestures
+        :param minColumns: short triangle rows are merged into blocks of at least this many features
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=FEATURE_DTYPE)
+        bounds = blockBounds(vectors.shape[1], minColumns)
+        # blocks that vary most between templates first, so bad templates are abandoned early
+        spread = [vectors[:, start:end].sum(axis=1).std() for start, end in bounds]
+        self.bounds = [bounds[i] for i in np.argsort(spread, kind='stable')[::-1]]
+        # sums a vector's features per block, |template block sum - query block sum|
+        # never exceeds the block's L1 distance
+        self.membership = np.zeros((vectors.shape[1], len(self.bounds)))
+        for b, (start, end) in enumerate(self.bounds):
+            self.membership[start:end, b] = 1
+        self.rows = TemplateRows(vectors)
+        self.blockRows = [TemplateRows(np.ascontiguousarray(vectors[:, start:end])) for start, end in self.bounds]
+        self.sumRows = TemplateRows(vectors @ self.membership)
+        # the query reads templates, blocks and block sums as one snapshot
+        self.arrays = (vectors, [rows.buffer for rows in self.blockRows], self.sumRows.buffer)
+        self.previous = np.zeros(0, dtype=np.intp)
+        self.queries = 0
+        self.scored = 0
+        self.abandoned = 0
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def vectors(self):
+        return self.arrays[0]
+
+    def add(self, vectors):
+        """
+        add() appends templates; queries already running keep the old ones
+
+        :param vectors: (N, D) feature vectors of the new templates
+        """
+        vectors = checkVectors(vectors, self.vectors.shape[1])
+        blocks = [rows.append(vectors[:, start:end]) for rows, (start, end) in zip(self.blockRows, self.bounds)]
+        self.arrays = (self.rows.append(vectors), blocks, self.sumRows.append(vectors @ self.membership))
+
+    def distances(self, vector):
+        """
+        distances() calculates the L1 distance from vector to every template
+
+        :param vector: (D,) feature vector of gesture from user
+        :return: distances (K,)
+        """
+        return l1Distances(self.vectors, vector)
+
+    def query(self, vector, k=1, bound=None):
+        """
+        query() finds the k nearest templates, closest first
+
+        :param vector: (D,) feature vector of gesture from user
+        :param k: how many templates to return
+        :param bound: only return templates strictly closer than bound
+        :return: indices, distances
+        """
+        vectors, blocks, blockSums = self.arrays
+        k = max(1, min(k, len(vectors)))
+        vector = np.asarray(vector, dtype=vectors.dtype)
+        self.queries += 1
+        querySums = vector @ self.membership
+        lowerParts = np.abs(blockSums - querySums)
+        lower = lowerParts.sum(axis=1)
+
+        # seed the best-so-far with last frame's matches and the templates with the loosest bound
+        seeds = np.union1d(self.previous[self.previous < len(vectors)], np.argpartition(lower, k-1)[:k])
+        seedDistances = l1Distances(vectors[seeds], vector)
+        limit = np.partition(seedDistances, k-1)[k-1] if len(seeds) >= k else np.inf
+        if bound is not None:
+            limit = min(limit, bound)
+        # differences are rounded to the template dtype, so a distance can come out
+        # a rounding step under the block sum bound; never abandon a tie
+        limit += np.finfo(vectors.dtype).eps*(1 + abs(limit)) if np.isfinite(limit) else 0
+
+        candidates = np.flatnonzero(lower <= limit)
+        # lower bound of the blocks not scored yet, per candidate
+        remaining = np.cumsum(lowerParts[candidates][:, ::-1], axis=1)[:, ::-1]
+        partial = np.zeros(len(candidates))
+        for b, block in enumerate(blocks):
+            if len(candidates) == 0:
+                break
+            partial += l1Distances(block[candidates], vector[self.bounds[b][0]:self.bounds[b][1]])
+            rest = remaining[:, b+1] if b + 1 < remaining.shape[1] else 0
+            keep = partial + rest <= limit
+            candidates, partial, remaining = candidates[keep], partial[keep], remaining[keep]
+
+        self.scored += len(candidates)
+        self.abandoned += len(vectors) - len(candidates)
+        distances = l1Distances(vectors[candidates], vector)
+        order = rankErrors(distances, k, candidates)
+        if bound is not None:
+            order = order[distances[order] < bound]
+        self.previous = candidates[order]
+        return candidates[order], distances[order]
+
+    def counters(self):
+        return {'queries': self.queries, 'scored': self.scored, 'abandoned': self.abandoned,
+            'abandon_rate': self.abandoned/max(1, self.scored + self.abandoned)}
+
+# backends selectable by name
+BACKENDS = {
+    'brute': BruteForceIndex,
+    'kdtree': KDTreeIndex,
+    'quantized': QuantizedIndex,
+    'early': EarlyAbandonIndex,
+}
+
+def buildIndex(backend, vectors):
+    """
+    buildIndex() creates the index backend with the given name
+
+    :param backend: 'brute', 'kdtree', 'quantized' or 'early'
+    :param vectors: (K, D) feature vectors of the known gestures
+    :return: index
+    """
+    if backend not in BACKENDS:
+        raise ValueError('unknown index backend: ' + str(backend))
+    return BACKENDS[backend](vectors)
+
+def quantize(vectors, offset, scale):
+    """
+    quantize() maps feature values onto integer codes
+
+    :param vectors: feature values
+    :param offset: value of code 0
+    :param scale: value step per code
+    :return: codes
+    """
+    return np.rint((np.asarray(vectors, dtype=np.float64) - offset)/scale)
+
+def l1Distances(templates, vector):
+    """
+    l1Distances() calculates the L1 distance from vector to every template,
+    subtracting in the templates' dtype and summing in float64 so every
+    backend adds up the same differences the same way
+
+    :param templates: (K, D) feature vectors
+    :param vector: (D,) feature vector
+    :return: distances (K,) float64
+    """
+    return np.abs(templates - np.asarray(vector, dtype=templates.dtype)).sum(axis=1, dtype=np.float64)
+
+def rankErrors(gestureErrors, topK, tieBreak=None):
+    """
+    rankErrors() returns the positions of the topK smallest errors, ties broken
+    by template order so the first is always the argmin
+
+    :param gestureErrors: error margin per template
+    :param topK: how many positions to return
+    :param tieBreak: template index per position (defaults to the position)
+    :return: order
+    """
+    if tieBreak is None:
+        tieBreak = np.arange(len(gestureErrors))
+    topK = max(0, min(topK, len(gestureErrors)))
+    if topK < len(gestureErrors):
+        kth = np.partition(gestureErrors, topK-1)[topK-1] if topK else -np.inf
+        # include every tie with the kth error so the tie break is honoured
+        positions = np.flatnonzero(gestureErrors <= kth)
+    else:
+        positions = np.arange(len(gestureErrors))
+    order = positions[np.lexsort((tieBreak[positions], gestureErrors[positions]))]
+    return order[:topK]
+
+def blockBounds(dimensions, minColumns):
+    """
+    blockBounds() splits feature vectors into the rows of the upper triangle
+    they were flattened from, merging rows shorter than minColumns
+
+    :param dimensions: length of a feature vector
+    :param minColumns: fewest features in a block
+    :return: [(start, end)] column ranges
+    """
+    nodes = int(round((1 + np.sqrt(1 + 8*dimensions))/2))
+    if nodes*(nodes - 1)//2 == dimensions:
+        rows = list(range(nodes - 1, 0, -1))
+    else:
+        rows = [minColumns]*(dimensions//minColumns) + ([dimensions % minColumns] if dimensions % minColumns else [])
+    bounds = []
+    start = 0
+    for width in rows:
+        if bounds and bounds[-1][1] - bounds[-1][0] < minColumns:
+            bounds[-1] = (bounds[-1][0], start + width)
+        else:
+            bounds.append((start, start + width))
+        start += width
+    return bounds
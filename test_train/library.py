@@ -0,0 +1,363 @@
+#----------------------------------------------------------------------------
+# library.py - versioned, memory-mappable binary gesture library
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import numpy as np
+from features import FEATURE_DTYPE, handNodeDistances
+
+# version of the bundle layout written by saveLibrary()
+## 1: float64 features, 2: FEATURE_DTYPE (float32) features
+FORMAT_VERSION=2
+
+# older versions loadLibrary() still reads (their features are converted)
+READABLE_VERSIONS=(1,)
+
+# default locations (run from repository root)
+LIBRARY_PATH='./aggregate_gesture_data/gesture_library'
+GESTURE_DATA='./aggregate_gesture_data/gesture_data.csv'
+GESTURE_NAMES='./aggregate_gesture_data/gesture_names.csv'
+
+# which hand nodes to extract data from (same as testing.py)
+HAND_NODES=[0,4,5,9,13,17,8,12,16,20]
+
+# seconds the library writer waits for more templates before saving (an enrollment adds a burst)
+FLUSH_DELAY=2.
+
+# failed saves in a row before the library writer stops retrying (until the next templates arrive)
+MAX_WRITE_FAILURES=5
+
+# files making up a library bundle
+## meta.json: version, handNodes, label names, creation time, user metadata
+## landmarks.npy: (K, 21, 2) int32 raw landmark positions
+## features.npy: (K, n*(n-1)/2) float32 handNodes features (what GestureMatcher indexes)
+## labels.npy: (K,) int32 index into the label names
+META_FILE='meta.json'
+LANDMARKS_FILE='landmarks.npy'
+FEATURES_FILE='features.npy'
+LABELS_FILE='labels.npy'
+
+class GestureLibrary:
+    """
+    GestureLibrary is a loaded library bundle; its arrays are memory-mapped
+    so loading costs nothing until templates are touched
+    """
+
+    def __init__(self, landmarks, features, labels, labelNames, handNodes, metadata):
+        self.landmarks = landmarks
+        self.features = features
+        self.labels = labels
+        self.labelNames = list(labelNames)
+        self.handNodes = list(handNodes)
+        self.metadata = metadata
+
+    def __len__(self):
+        return len(self.labels)
+
+    def gestureNames(self):
+        """
+        gestureNames() lists the gesture name of every template
+
+        :return: gestNames
+        """
+        return [self.labelNames[label] for label in self.labels]
+
+def saveLibrary(path, handsData, gestureNames, handNodes, metadata=None):
+    """
+    saveLibrary() writes raw landmarks, precomputed features and labels as a
+    library bundle, replacing any bundle at path in one step
+
+    :param path: bundle directory
+    :param handsData: (K, 21, 2) landmark positions
+    :param gestureNames: gesture name per template
+    :param handNodes: key nodes to compute features for
+    :param metadata: extra JSON-serializable information to keep
+    """
+    landmarks = np.asarray(handsData, dtype=np.int32).reshape(-1, 21, 2)
+    if len(landmarks) != len(gestureNames):
+        raise ValueError('need one gesture name per template')
+    labelNames = list(dict.fromkeys(gestureNames))
+    labels = np.array([labelNames.index(name) for name in gestureNames], dtype=np.int32)
+    features = handNodeDistances(landmarks, handNodes)
+    meta = {
+        'version': FORMAT_VERSION,
+        'count': len(labels),
+        'handNodes': [int(node) for node in handNodes],
+        'labelNames': labelNames,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metadata': metadata or {},
+    }
+
+    temporary = path + '.tmp'
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+    np.save(os.path.join(temporary, LANDMARKS_FILE), landmarks)
+    np.save(os.path.join(temporary, FEATURES_FILE), features)
+    np.save(os.path.join(temporary, LABELS_FILE), labels)
+    with open(os.path.join(temporary, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    replaceDirectory(temporary, path)
+
+def loadLibrary(path, handNodes=None, mmap=True):
+    """
+    loadLibrary() opens a library bundle; features are only recomputed when
+    they were stored for different handNodes, and read into memory as
+    FEATURE_DTYPE when the bundle is an older version
+
+    :param path: bundle directory
+    :param handNodes: key nodes the caller matches on (None keeps the stored ones)
+    :param mmap: memory-map the arrays instead of reading them
+    :return: GestureLibrary
+    """
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION and meta.get('version') not in READABLE_VERSIONS:
+        raise ValueError('unsupported gesture library version: ' + str(meta.get('version')))
+    mode = 'r' if mmap else None
+    landmarks = np.load(os.path.join(path, LANDMARKS_FILE), mmap_mode=mode)
+    features = np.load(os.path.join(path, FEATURES_FILE), mmap_mode=mode)
+    labels = np.load(os.path.join(path, LABELS_FILE), mmap_mode=mode)
+    storedNodes = meta['handNodes']
+    if handNodes is not None and list(handNodes) != storedNodes:
+        features = handNodeDistances(landmarks, handNodes)
+        storedNodes = list(handNodes)
+    elif features.dtype != FEATURE_DTYPE:
+        features = np.ascontiguousarray(features, dtype=FEATURE_DTYPE)
+    return GestureLibrary(landmarks, features, labels, meta['labelNames'], storedNodes, meta['metadata'])
+
+def readCSV(dataPath=GESTURE_DATA, namesPath=GESTURE_NAMES):
+    """
+    readCSV() reads the original CSV gesture data and names
+
+    :param dataPath: CSV of "(x, y)" landmark tuples, one template per row
+    :param namesPath: CSV with the gesture names on its first row
+    :return: handsData, gestNames
+    """
+    with open(dataPath, 'r', newline='') as f:
+        examples = list(csv.reader(f))
+    handsData = [[tuple(map(int, re.findall(r'\d+', string[1:-1]))) for string in example] for example in examples]
+    with open(namesPath, newline='') as f:
+        gestNames = list(csv.reader(f))[0]
+    return handsData, gestNames[:len(handsData)]
+
+def convertCSV(dataPath=GESTURE_DATA, namesPath=GESTURE_NAMES, libraryPath=LIBRARY_PATH, handNodes=HAND_NODES, force=False):
+    """
+    convertCSV() converts the CSV gesture data into a library bundle
+
+    :param dataPath: CSV of landmark tuples
+    :param namesPath: CSV of gesture names
+    :param libraryPath: bundle directory to write
+    :param handNodes: key nodes to compute features for
+    :param force: replace a bundle that holds more than the CSV data (enrolled or trained
+        templates), raises ValueError otherwise
+    """
+    if not force and os.path.exists(os.path.join(libraryPath, META_FILE)):
+        with open(os.path.join(libraryPath, META_FILE)) as f:
+            metadata = json.load(f).get('metadata', {})
+        if metadata.get('enrolled') or metadata.get('source') != os.path.basename(dataPath):
+            raise ValueError(libraryPath + ' holds templates that are not in ' + dataPath +
+                ' (enrolled or trained), converting would lose them')
+    handsData, gestNames = readCSV(dataPath, namesPath)
+    saveLibrary(libraryPath, handsData, gestNames, handNodes, {'source': os.path.basename(dataPath)})
+
+def openLibrary(handNodes, libraryPath=LIBRARY_PATH, dataPath=GESTURE_DATA, namesPath=GESTURE_NAMES, mmap=True):
+    """
+    openLibrary() loads the gesture library, converting the CSV data first
+    when no bundle exists yet. An existing bundle is never rebuilt here (it
+    may hold enrolled or trained templates, and a checkout alone makes the
+    CSV look newer), a newer CSV is only pointed out
+
+    :param handNodes: key nodes the caller matches on
+    :param libraryPath: bundle directory
+    :param dataPath: CSV of landmark tuples
+    :param namesPath: CSV of gesture names
+    :param mmap: memory-map the arrays (off when a LibraryWriter will replace the bundle,
+        Windows cannot rename a directory with mapped files in it)
+    :return: GestureLibrary
+    """
+    metaPath = os.path.join(libraryPath, META_FILE)
+    if not os.path.exists(metaPath):
+        if os.path.exists(dataPath):
+            print('Converting ' + dataPath + ' to gesture library ' + libraryPath)
+            convertCSV(dataPath, namesPath, libraryPath, handNodes)
+    elif os.path.exists(dataPath) and os.path.getmtime(dataPath) > os.path.getmtime(metaPath):
+        print('Note: ' + dataPath + ' is newer than gesture library ' + libraryPath + ', run library.py to convert it again.')
+    return loadLibrary(libraryPath, handNodes, mmap)
+
+def replaceDirectory(source, target):
+    """
+    replaceDirectory() moves source to target, removing the old target
+
+    :param source: directory to move
+    :param target: where it should end up
+    """
+    if os.path.exists(target):
+        old = target + '.old'
+        shutil.rmtree(old, ignore_errors=True)
+        os.rename(target, old)
+        os.rename(source, target)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.rename(source, target)
+
+class LibraryWriter:
+    """
+    LibraryWriter saves templates enrolled into a running matcher from a
+    background thread, so the frame loop never waits on disk. Appends that
+    arrive close together are saved together, and every save writes the
+    whole bundle through saveLibrary(), so a crash leaves either the old or
+    the new library. After maxFailures failed saves in a row it stops
+    retrying until more templates are appended
+    """
+
+    def __init__(self, path, library, flushDelay=FLUSH_DELAY, maxFailures=MAX_WRITE_FAILURES):
+        """
+        :param path: bundle directory to keep up to date
+        :param library: GestureLibrary the matcher was built from (loaded with mmap=False, the
+            bundle is replaced while it is in use)
+        :param flushDelay: seconds to wait for more templates before saving
+        :param maxFailures: failed saves in a row before giving up on the pending templates
+        """
+        self.path = path
+        self.handNodes = library.handNodes
+        self.metadata = dict(library.metadata)
+        self.flushDelay = flushDelay
+        self.maxFailures = maxFailures
+        # everything saved so far, read into memory so no file of the old bundle stays mapped
+        self.landmarks = np.array(library.landmarks)
+        self.gestureNames = library.gestureNames()
+        self.pending = []
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopped = False
+        self.writes = 0
+        self.errors = 0
+        self.failures = 0
+        self.halted = False
+        self.lastError = None
+        self.lastWrite = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.writeLoop, name='library-writer', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self, wait=True):
+        """
+        stop() saves what is still pending and lets the thread exit
+
+        :param wait: block until it has exited
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if wait and self.thread is not None:
+            self.thread.join()
+
+    def append(self, handsData, gestureNames):
+        """
+        append() queues templates to be saved, returns right away
+
+        :param handsData: (N, 21, 2) landmark positions
+        :param gestureNames: gesture name per template
+        """
+        landmarks = np.asarray(handsData, dtype=np.int32).reshape(-1, 21, 2)
+        if len(landmarks) != len(gestureNames):
+            raise ValueError('need one gesture name per template')
+        with self.condition:
+            self.pending.append((landmarks, list(gestureNames)))
+            # new templates get a fresh round of attempts
+            self.failures = 0
+            self.halted = False
+            self.condition.notify_all()
+
+    def writeLoop(self):
+        """
+        writeLoop() saves pending templates a flushDelay after they arrive
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.stopped or (self.pending and not self.halted))
+                if not self.pending or self.halted:
+                    return
+                # the rest of an enrollment's templates usually follow right away
+                self.condition.wait_for(lambda: self.stopped, self.flushDelay)
+                stopped = self.stopped
+            if not self.flush() and stopped:
+                return
+
+    def flush(self):
+        """
+        flush() writes the bundle with every pending template
+
+        :return: True when it was written (failed templates stay pending)
+        """
+        with self.condition:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return True
+        landmarks = np.concatenate([self.landmarks] + [hands for hands, _ in pending])
+        gestureNames = self.gestureNames + [name for _, names in pending for name in names]
+        metadata = dict(self.metadata, enrolled=self.metadata.get('enrolled', 0) + len(gestureNames) - len(self.gestureNames))
+        start = time.perf_counter()
+        try:
+            saveLibrary(self.path, landmarks, gestureNames, self.handNodes, metadata)
+        except OSError as error:
+            with self.condition:
+                self.pending = pending + self.pending
+                self.errors += 1
+                self.failures += 1
+                self.lastError = str(error)
+                self.halted = self.failures >= self.maxFailures
+            print('Error: gesture library not saved (' + str(error) + ').')
+            if self.halted:
+                print('Error: gave up saving ' + self.path + ' after ' + str(self.failures) + ' attempts, enrolled '
+                    'gestures are only kept in memory until the next enrollment.')
+            return False
+        self.failures = 0
+        self.lastError = None
+        self.landmarks = landmarks
+        self.gestureNames = gestureNames
+        self.metadata = metadata
+        self.writes += 1
+        self.lastWrite = time.perf_counter() - start
+        return True
+
+    def counters(self):
+        with self.condition:
+            pending = sum(len(names) for _, names in self.pending)
+        return {'writes': self.writes, 'errors': self.errors, 'pending': pending, 'templates': len(self.gestureNames),
+            'gave_up': self.halted, 'last_error': self.lastError,
+            'last_write_ms': round(self.lastWrite*1e3, 1) if self.lastWrite is not None else None}
+
+def main():
+    """
+    main() converts CSV gesture data given on the command line (or the
+    default files) to a gesture library bundle
+    """
+    parser = argparse.ArgumentParser(description='Convert CSV gesture data to a binary gesture library.')
+    parser.add_argument('--data', default=GESTURE_DATA)
+    parser.add_argument('--names', default=GESTURE_NAMES)
+    parser.add_argument('--output', default=LIBRARY_PATH)
+    parser.add_argument('--hand-nodes', dest='handNodes', default=','.join(map(str, HAND_NODES)))
+    parser.add_argument('--force', action='store_true', help='replace a library holding enrolled or trained templates')
+    args = parser.parse_args()
+    try:
+        convertCSV(args.data, args.names, args.output, [int(node) for node in args.handNodes.split(',')], args.force)
+    except ValueError as error:
+        parser.exit(1, 'Error: ' + str(error) + ', pass --force to replace it.\n')
+    print('Wrote ' + args.output + ' (' + str(len(loadLibrary(args.output))) + ' templates)')
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,145 @@
+#----------------------------------------------------------------------------
+# matcher.py - batched template matching of user gestures against known gestures
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from collections import namedtuple
+import threading
+import numpy as np
+from features import FEATURE_DTYPE, NUM_LANDMARKS, handNodeFeatures
+from indexes import buildIndex
+
+# result of matching one unknown gesture against the whole library
+## gesture: matched name or 'Unknown', index: best template (argmin), error: its margin
+## names/errors: top-k template names and margins, best first
+MatchResult = namedtuple('MatchResult', ['gesture', 'index', 'error', 'names', 'errors'])
+
+class GestureMatcher:
+    """
+    GestureMatcher scores an unknown gesture against every known gesture using
+    the L1 error over the handNodes block of the distance matrix. The block is
+    symmetric with a zero diagonal, so its L1 error is twice the L1 error of
+    the flattened upper triangle, which is what the index backend stores.
+    Gestures can be given as full distance matrices or as the compact
+    handNodeDistances() vectors, which skip the rest of the matrix
+    """
+
+    def __init__(self, knownGestures, gestureNames, handNodes, errorTolerance, backend='brute'):
+        """
+        :param knownGestures: distance matrices or feature vectors of gestures that were already trained
+        :param gestureNames: gesture names that were trained
+        :param handNodes: key nodes to track
+        :param errorTolerance: to what error level algorithm should match to
+        :param backend: index backend ('brute', 'kdtree', 'quantized' or 'early')
+        """
+        self.setup(gestureNames, handNodes, errorTolerance)
+        self.index = buildIndex(backend, self.featureVectors(knownGestures)[:len(self.gestureNames)])
+
+    @classmethod
+    def fromFeatures(cls, features, gestureNames, handNodes, errorTolerance, backend='brute'):
+        """
+        fromFeatures() builds a matcher from precomputed handNodes feature
+        vectors (as stored in the gesture library)
+
+        :param features: (K, n*(n-1)/2) feature vectors
+        :param gestureNames: gesture names that were trained
+        :param handNodes: key nodes the features were computed for
+        :param errorTolerance: to what error level algorithm should match to
+        :param backend: index backend ('brute', 'kdtree', 'quantized' or 'early')
+        :return: GestureMatcher
+        """
+        matcher = cls.__new__(cls)
+        matcher.setup(gestureNames, handNodes, errorTolerance)
+        matcher.index = buildIndex(backend, features[:len(matcher.gestureNames)])
+        return matcher
+
+    def setup(self, gestureNames, handNodes, errorTolerance):
+        self.handNodes = np.asarray(handNodes)
+        self.gestureNames = list(gestureNames)
+        self.errorTolerance = errorTolerance
+        # serializes add(), matching never takes it
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.gestureNames)
+
+    def add(self, features, gestureNames):
+        """
+        add() enrolls new templates while the matcher is in use. Names go in
+        before the index publishes the templates, so a match running at the
+        same time sees either the old templates or the new ones with their
+        names, never a template without a name
+
+        :param features: (N, n*(n-1)/2) feature vectors of the new templates
+        :param gestureNames: gesture name per new template
+        """
+        gestureNames = list(gestureNames)
+        if len(gestureNames) != len(features):
+            raise ValueError('need one gesture name per template')
+        with self.lock:
+            count = len(self.gestureNames)
+            self.gestureNames.extend(gestureNames)
+            try:
+                self.index.add(features)
+            except Exception:
+                del self.gestureNames[count:]
+                raise
+
+    def featureVectors(self, distanceMatrices):
+        """
+        featureVectors() flattens the upper triangle of the handNodes block,
+        feature vectors are passed through
+
+        :param distanceMatrices: (..., 21, 21) distance matrices or (..., n*(n-1)/2) feature vectors
+        :return: (..., n*(n-1)/2) feature vectors
+        """
+        if np.shape(distanceMatrices)[-2:] == (NUM_LANDMARKS, NUM_LANDMARKS):
+            return handNodeFeatures(distanceMatrices, self.handNodes)
+        return np.asarray(distanceMatrices, dtype=FEATURE_DTYPE)
+
+    def errors(self, unknownGesture):
+        """
+        errors() calculates the error margin between the unknown gesture and
+        every known gesture
+
+        :param unknownGesture: distance matrix or feature vector of gesture from user
+        :return: gestureErrors (K,)
+        """
+        return 2*self.index.distances(self.featureVectors(unknownGesture))
+
+    def match(self, unknownGesture, topK=1):
+        """
+        match() finds the closest known gestures, reporting 'Unknown' when the
+        best margin is not within errorTolerance
+
+        :param unknownGesture: distance matrix or feature vector of gesture from user
+        :param topK: how many of the closest templates to report
+        :return: MatchResult
+        """
+        vector = self.featureVectors(unknownGesture)
+        order, distances = self.index.query(vector, topK)
+        gestureErrors = 2*distances
+        minIndex = int(order[0])
+        minimumError = float(gestureErrors[0])
+        if minimumError < self.errorTolerance:
+            gesture = self.gestureNames[minIndex]
+        else:
+            gesture = 'Unknown'
+        return MatchResult(gesture, minIndex, minimumError,
+            [self.gestureNames[i] for i in order], gestureErrors)
+
+    def classify(self, unknownGesture):
+        """
+        classify() returns only the matched gesture name, letting the index
+        stop searching beyond errorTolerance
+
+        :param unknownGesture: distance matrix or feature vector of gesture from user
+        :return: gesture
+        """
+        vector = self.featureVectors(unknownGesture)
+        order, distances = self.index.query(vector, 1, bound=self.errorTolerance/2)
+        if len(order) == 0:
+            return 'Unknown'
+        return self.gestureNames[int(order[0])]
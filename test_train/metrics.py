@@ -0,0 +1,229 @@
+#----------------------------------------------------------------------------
+# metrics.py - low-overhead timers, rolling histograms and metrics export
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+import time
+import numpy as np
+
+# upper bounds (seconds) of the cumulative histogram buckets
+BUCKETS=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5.)
+
+# most recent samples each histogram keeps for percentiles
+HISTOGRAM_WINDOW=1024
+
+# prefix of every exported metric name
+METRIC_PREFIX='gesture_'
+
+class Histogram:
+    """
+    Histogram keeps cumulative bucket counts (for Prometheus) and a ring of
+    the most recent samples (for rolling percentiles). Each histogram is
+    meant to be fed from one thread
+    """
+
+    def __init__(self, window=HISTOGRAM_WINDOW):
+        """
+        :param window: recent samples kept for percentiles
+        """
+        self.buckets = [0]*(len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.recent = np.zeros(window)
+
+    def observe(self, seconds):
+        """
+        observe() records one sample
+
+        :param seconds: duration
+        """
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.recent[self.count % len(self.recent)] = seconds
+        self.count += 1
+        self.sum += seconds
+
+    def summary(self):
+        """
+        summary() describes the recent samples
+
+        :return: dict of count, mean, p50 and p99 (milliseconds)
+        """
+        recent = self.recent[:min(self.count, len(self.recent))]
+        if not len(recent):
+            return {'count': 0, 'mean_ms': 0., 'p50_ms': 0., 'p99_ms': 0.}
+        p50, p99 = np.percentile(recent, (50, 99))
+        return {'count': self.count, 'mean_ms': round(float(recent.mean())*1e3, 3),
+            'p50_ms': round(float(p50)*1e3, 3), 'p99_ms': round(float(p99)*1e3, 3)}
+
+class Metrics:
+    """
+    Metrics is the registry for timers, counters and collected counters of
+    other components. When disabled, timed() hands back the undecorated
+    function, so instrumented code runs exactly as if it never was
+    """
+
+    def __init__(self, enabled=True, window=HISTOGRAM_WINDOW):
+        """
+        :param enabled: record anything at all
+        :param window: recent samples kept per histogram
+        """
+        self.enabled = enabled
+        self.window = window
+        self.histograms = {}
+        self.counts = {}
+        self.collectors = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, Histogram(self.window))
+        return histogram
+
+    def timed(self, name):
+        """
+        timed() decorates a function so every call is timed
+
+        :param name: metric name
+        :return: decorator
+        """
+        def decorator(function):
+            if not self.enabled:
+                return function
+            histogram = self.histogram(name)
+            clock = time.perf_counter
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    histogram.observe(clock() - start)
+            return wrapper
+        return decorator
+
+    def observe(self, name, seconds):
+        if self.enabled:
+            self.histogram(name).observe(seconds)
+
+    def increment(self, name, count=1):
+        if self.enabled:
+            with self.lock:
+                self.counts[name] = self.counts.get(name, 0) + count
+
+    def collect(self, group, counters):
+        """
+        collect() adds another component's counters to every snapshot
+
+        :param group: name the counters are reported under
+        :param counters: function returning a dict of counters
+        """
+        if self.enabled:
+            self.collectors[group] = counters
+
+    def snapshot(self):
+        """
+        snapshot() gathers everything recorded so far
+
+        :return: dict of timers, counters and collected counters
+        """
+        snapshot = {'timers': {name: histogram.summary() for name, histogram in list(self.histograms.items())},
+            'counters': dict(self.counts)}
+        for group, counters in list(self.collectors.items()):
+            snapshot[group] = counters()
+        return snapshot
+
+    def prometheus(self):
+        """
+        prometheus() renders the metrics in the Prometheus text format
+
+        :return: text
+        """
+        lines = []
+        for name, histogram in list(self.histograms.items()):
+            metric = METRIC_PREFIX + name + '_seconds'
+            lines.append('# TYPE ' + metric + ' histogram')
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.buckets):
+                cumulative += count
+                lines.append('{}_bucket{{le="{}"}} {}'.format(metric, bound, cumulative))
+            lines.append('{}_bucket{{le="+Inf"}} {}'.format(metric, histogram.count))
+            lines.append('{}_sum {}'.format(metric, histogram.sum))
+            lines.append('{}_count {}'.format(metric, histogram.count))
+        for name, count in list(self.counts.items()):
+            lines.append('# TYPE ' + METRIC_PREFIX + name + '_total counter')
+            lines.append('{}{}_total {}'.format(METRIC_PREFIX, name, count))
+        for group, counters in list(self.collectors.items()):
+            for key, value in counters().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append('{}{}_{} {}'.format(METRIC_PREFIX, group, key, value))
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """
+        dump() writes a JSON snapshot, replacing the previous one atomically
+
+        :param path: JSON file
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temporary, path)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    MetricsHandler serves /metrics (Prometheus text) and /metrics.json
+    """
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = self.server.metrics.prometheus().encode()
+            contentType = 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body = json.dumps(self.server.metrics.snapshot()).encode()
+            contentType = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    MetricsServer exposes a Metrics registry over HTTP for scraping
+    """
+    daemon_threads = True
+
+    def __init__(self, metrics, port=9100, host='0.0.0.0'):
+        """
+        :param metrics: Metrics registry
+        :param port: port to listen on
+        :param host: address to listen on
+        """
+        super().__init__((host, port), MetricsHandler)
+        self.metrics = metrics
+        self.thread = threading.Thread(target=self.serve_forever, name='metrics-server', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
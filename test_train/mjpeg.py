@@ -0,0 +1,209 @@
+#----------------------------------------------------------------------------
+# mjpeg.py - streaming parser for the ESP-EYE multipart MJPEG live stream
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import re
+
+# JPEG markers
+SOI=b'\xff\xd8'
+EOI=0xd9
+SOS=0xda
+
+# markers that are not followed by a segment length
+STANDALONE_MARKERS=set([0x01]+list(range(0xd0, 0xd8)))
+
+# most bytes of part headers expected before giving up on finding them
+MAX_HEADER_SIZE=1024
+
+# initial size of the frame buffer (grown when a larger frame arrives)
+INITIAL_BUFFER_SIZE=256*1024
+
+CONTENT_LENGTH=re.compile(rb'content-length\s*:\s*(\d+)', re.IGNORECASE)
+
+class MJPEGReader:
+    """
+    MJPEGReader pulls complete JPEG frames out of a multipart MJPEG stream.
+    Each part's Content-Length header is used to read the JPEG straight into
+    a reusable buffer; parts without one are split by walking the JPEG
+    markers, so thumbnails embedded in APP segments are skipped over
+    """
+
+    def __init__(self, stream, chunkSize=4096):
+        """
+        :param stream: file-like live stream (urlopen response, file, socket file)
+        :param chunkSize: bytes requested per read when the frame size is unknown
+        """
+        self.stream = stream
+        self.chunkSize = chunkSize
+        self.buffer = bytearray(max(INITIAL_BUFFER_SIZE, 2*chunkSize))
+        self.view = memoryview(self.buffer)
+        # unread stream data lives in buffer[start:end]
+        self.start = 0
+        self.end = 0
+        self.framesRead = 0
+        self.bytesRead = 0
+
+    def readFrame(self):
+        """
+        readFrame() blocks until the next complete JPEG has arrived
+
+        :return: memoryview of the JPEG, valid until the next readFrame() call
+        """
+        while True:
+            self.skipSeparators()
+            if self.buffer.startswith(SOI, self.start, self.end):
+                return self.scanFrame()
+            headerEnd = self.buffer.find(b'\r\n\r\n', self.start, self.end)
+            if headerEnd == -1:
+                if self.end - self.start > MAX_HEADER_SIZE or self.buffer.find(SOI, self.start, self.end) > -1:
+                    # no part headers in this stream, fall back to marker scanning
+                    return self.scanFrame()
+                self.fill(self.chunkSize)
+                continue
+            match = CONTENT_LENGTH.search(self.buffer, self.start, headerEnd)
+            self.start = headerEnd + 4
+            if match is None:
+                return self.scanFrame()
+            return self.lengthFrame(int(match.group(1)))
+
+    def lengthFrame(self, length):
+        """
+        lengthFrame() reads a part whose size is known from its header
+
+        :param length: Content-Length of the part
+        :return: memoryview of the JPEG
+        """
+        if self.end - self.start < length:
+            self.fill(length - (self.end - self.start), exact=True)
+        frame = self.view[self.start:self.start + length]
+        self.start += length
+        self.framesRead += 1
+        return frame
+
+    def scanFrame(self):
+        """
+        scanFrame() finds the next JPEG by walking its segment markers, only
+        scanning new data after each read
+
+        :return: memoryview of the JPEG
+        """
+        while True:
+            head = self.buffer.find(SOI, self.start, self.end)
+            if head > -1:
+                break
+            # keep a trailing 0xff in case it starts the next marker
+            self.start = max(self.start, self.end - 1)
+            self.fill(self.chunkSize)
+        self.start = head
+        position = head + 2
+        inScan = False
+        while True:
+            if inScan:
+                marker = self.buffer.find(b'\xff', position, self.end)
+                if marker == -1 or marker + 1 >= self.end:
+                    position = self.end if marker == -1 else marker
+                    self.fill(self.chunkSize)
+                    position = position - head + self.start
+                    head = self.start
+                    continue
+                code = self.buffer[marker + 1]
+                if code == 0x00 or code in STANDALONE_MARKERS or code == 0xff:
+                    # byte stuffing, restart markers and fill bytes stay in the scan
+                    position = marker + 1 if code == 0xff else marker + 2
+                    continue
+                inScan = False
+                position = marker
+            code = self.buffer[position + 1] if self.end - position >= 2 else None
+            if code is None or (code != EOI and code not in STANDALONE_MARKERS and code != 0xff and self.end - position < 4):
+                offset = position - head
+                self.fill(self.chunkSize)
+                head = self.start
+                position = head + offset
+                continue
+            if self.buffer[position] != 0xff:
+                # corrupt frame, resynchronise on the next start of image
+                self.start = head + 1
+                return self.scanFrame()
+            if code == 0xff:
+                position += 1
+            elif code == EOI:
+                frame = self.view[head:position + 2]
+                self.start = position + 2
+                self.framesRead += 1
+                return frame
+            elif code in STANDALONE_MARKERS:
+                position += 2
+            else:
+                position += 2 + (self.buffer[position + 2] << 8 | self.buffer[position + 3])
+                inScan = code == SOS
+                if position > self.end:
+                    offset = position - head
+                    self.fill(position - self.end, exact=True)
+                    head = self.start
+                    position = head + offset
+
+    def skipSeparators(self):
+        """
+        skipSeparators() drops CRLFs and multipart boundary lines between parts
+        """
+        while True:
+            if self.end - self.start < 2:
+                self.fill(self.chunkSize)
+                continue
+            if self.buffer.startswith(b'\r\n', self.start, self.end):
+                self.start += 2
+            elif self.buffer.startswith(b'--', self.start, self.end):
+                lineEnd = self.buffer.find(b'\r\n', self.start, self.end)
+                if lineEnd == -1:
+                    if self.end - self.start > MAX_HEADER_SIZE:
+                        return
+                    self.fill(self.chunkSize)
+                    continue
+                self.start = lineEnd + 2
+            else:
+                return
+
+    def fill(self, size, exact=False):
+        """
+        fill() reads more stream data into the buffer, moving the unread bytes
+        to the front or growing the buffer when it runs out of room
+
+        :param size: bytes to read
+        :param exact: keep reading until exactly size bytes arrived
+        """
+        pending = self.end - self.start
+        if self.end + size > len(self.buffer):
+            if pending + size > len(self.buffer):
+                # a new buffer leaves frames handed out earlier untouched
+                buffer = bytearray(max(2*len(self.buffer), pending + size))
+                buffer[:pending] = self.view[self.start:self.end]
+                self.buffer = buffer
+                self.view = memoryview(buffer)
+            else:
+                self.view[:pending] = bytes(self.view[self.start:self.end])
+            self.start, self.end = 0, pending
+        target = self.end + size
+        while self.end < target:
+            count = self.readInto(self.view[self.end:target])
+            if not count:
+                raise ConnectionError('live stream closed')
+            self.end += count
+            self.bytesRead += count
+            if not exact:
+                break
+
+    def readInto(self, view):
+        """
+        readInto() reads from the stream directly into view when supported
+
+        :param view: memoryview to read into
+        :return: number of bytes read
+        """
+        if hasattr(self.stream, 'readinto'):
+            return self.stream.readinto(view)
+        data = self.stream.read(len(view))
+        view[:len(data)] = data
+        return len(data)
@@ -0,0 +1,217 @@
+#----------------------------------------------------------------------------
+# pipeline.py - threaded capture / inference / display pipeline for the live stream
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from collections import deque
+import queue
+import threading
+import time
+from connection import ConnectionManager
+from preprocess import FrameError
+
+# frames kept to compute a stage's rolling FPS
+FPS_WINDOW=60
+
+class LatestQueue:
+    """
+    LatestQueue is a single-slot mailbox: a new item replaces an unread one,
+    so the consumer always gets the most recent frame ("latest frame wins")
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.item = None
+        self.hasItem = False
+        self.dropped = 0
+
+    def put(self, item):
+        """
+        put() stores item, dropping the previous one if it was never read
+
+        :param item: item to store
+        """
+        with self.condition:
+            if self.hasItem:
+                self.dropped += 1
+            self.item = item
+            self.hasItem = True
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """
+        get() waits for the next item
+
+        :param timeout: seconds to wait
+        :return: item (raises queue.Empty on timeout)
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.hasItem, timeout):
+                raise queue.Empty
+            item = self.item
+            self.item = None
+            self.hasItem = False
+            return item
+
+    def qsize(self):
+        return int(self.hasItem)
+
+class StageStats:
+    """
+    StageStats counts the items a pipeline stage handled and its rolling FPS
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.times = deque(maxlen=FPS_WINDOW)
+
+    def tick(self):
+        self.count += 1
+        self.times.append(time.perf_counter())
+
+    def fps(self):
+        if len(self.times) < 2 or self.times[-1] == self.times[0]:
+            return 0.
+        return (len(self.times) - 1)/(self.times[-1] - self.times[0])
+
+class RecognitionPipeline:
+    """
+    RecognitionPipeline runs the stream reader and the decode + inference
+    worker on their own threads. The reader hands frames to the worker through
+    a LatestQueue so a slow MediaPipe frame never stalls the socket, and the
+    worker hands results to the caller (UI / actions) through a bounded queue
+    that drops the oldest result when the caller falls behind
+    """
+
+    def __init__(self, openStream, inference, chunkSize=4096, resultQueueSize=2, frameErrors=(FrameError,)):
+        """
+        :param openStream: function returning a connected live stream (raises OSError on failure)
+        :param inference: function taking JPEG bytes and returning a result (None skips the frame)
+        :param chunkSize: bytes requested per stream read
+        :param resultQueueSize: results buffered for the consumer
+        :param frameErrors: exceptions that only spoil the frame they came from (counted and skipped)
+        """
+        self.connection = ConnectionManager(openStream, chunkSize)
+        self.inference = inference
+        self.frameErrors = frameErrors
+        self.badFrames = 0
+        self.lastFrameError = None
+        self.frames = LatestQueue()
+        self.results = queue.Queue(maxsize=resultQueueSize)
+        self.stats = {'read': StageStats(), 'inference': StageStats(), 'consume': StageStats()}
+        self.droppedResults = 0
+        self.latency = 0.
+        # capture time of the result getResult() returned last
+        self.resultCapturedAt = None
+        self.error = None
+        self.stopEvent = threading.Event()
+        self.threads = [
+            threading.Thread(target=self.readLoop, name='stream-reader', daemon=True),
+            threading.Thread(target=self.inferenceLoop, name='inference', daemon=True),
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self.stopEvent.set()
+
+    @property
+    def reconnects(self):
+        return self.connection.reconnects
+
+    def readLoop(self):
+        """
+        readLoop() reads frames off the live stream, the connection manager
+        reconnects in place on errors
+        """
+        for jpg in self.connection.frames(self.stopEvent):
+            # copy out of the reader's buffer before handing to another thread
+            self.frames.put((time.perf_counter(), bytes(jpg)))
+            self.stats['read'].tick()
+
+    def inferenceLoop(self):
+        """
+        inferenceLoop() decodes and runs inference on the most recent frame
+        """
+        try:
+            while not self.stopEvent.is_set():
+                try:
+                    capturedAt, jpg = self.frames.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                try:
+                    result = self.inference(jpg)
+                except self.frameErrors as error:
+                    # a corrupt frame is dropped, the next one is likely fine
+                    self.badFrames += 1
+                    if self.lastFrameError is None:
+                        print('Warning: skipping unreadable frames (' + str(error) + ').')
+                    self.lastFrameError = str(error)
+                    continue
+                # inference returns None for frames it chose to skip
+                if result is None:
+                    continue
+                self.stats['inference'].tick()
+                self.putResult((capturedAt, result))
+        except Exception as error:
+            # anything else is a real failure, surface it to the consumer instead of dying silently
+            self.error = error
+            self.putResult(None)
+
+    def putResult(self, item):
+        """
+        putResult() queues a result, dropping the oldest one when full
+
+        :param item: (capture time, result)
+        """
+        while True:
+            try:
+                self.results.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.results.get_nowait()
+                    self.droppedResults += 1
+                except queue.Empty:
+                    pass
+
+    def getResult(self, timeout=None):
+        """
+        getResult() waits for the next inference result
+
+        :param timeout: seconds to wait
+        :return: result (raises queue.Empty on timeout)
+        """
+        item = self.results.get(timeout=timeout)
+        if item is None:
+            raise self.error
+        capturedAt, result = item
+        self.resultCapturedAt = capturedAt
+        self.latency = time.perf_counter() - capturedAt
+        self.stats['consume'].tick()
+        return result
+
+    def counters(self):
+        """
+        counters() reports per-stage FPS, queue depths and drop counts
+
+        :return: dict of counters
+        """
+        counters = {}
+        for stage, stats in self.stats.items():
+            counters[stage + '_fps'] = round(stats.fps(), 1)
+            counters[stage + '_count'] = stats.count
+        counters['frame_queue_depth'] = self.frames.qsize()
+        counters['result_queue_depth'] = self.results.qsize()
+        counters['dropped_frames'] = self.frames.dropped
+        counters['dropped_results'] = self.droppedResults
+        counters['bad_frames'] = self.badFrames
+        counters['reconnects'] = self.reconnects
+        counters['time_to_first_frame_ms'] = self.connection.counters()['time_to_first_frame_ms']
+        counters['latency_ms'] = round(self.latency*1e3, 1)
+        return counters
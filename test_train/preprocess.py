@@ -0,0 +1,164 @@
+#----------------------------------------------------------------------------
+# preprocess.py - fused JPEG decode, resize, rotate and colour conversion
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import cv2
+import numpy as np
+from mjpeg import SOI, STANDALONE_MARKERS
+
+# image MediaPipe is fed (width, height after rotation, same as imageSetup)
+OUTPUT_SIZE=(480,640)
+
+# frames whose buffers stay valid at once (results queued + one on screen + one in progress)
+BUFFER_COUNT=4
+
+# decode flag for every reduction factor libjpeg can decode at directly
+REDUCED_DECODE={1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+# start-of-frame markers (every SOFn except DHT, JPG and DAC)
+SOF_MARKERS=set(range(0xc0, 0xd0)) - {0xc4, 0xc8, 0xcc}
+
+class FrameError(ValueError):
+    """
+    FrameError is raised for a frame that cannot be decoded (cut short or
+    corrupted on the way), only that frame is lost
+    """
+
+def jpegSize(jpg):
+    """
+    jpegSize() reads the image size from the JPEG's frame header without
+    decoding anything
+
+    :param jpg: JPEG image
+    :return: (width, height), None when no frame header was found
+    """
+    data = memoryview(jpg)
+    if bytes(data[:2]) != SOI:
+        return None
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xff:
+            return None
+        marker = data[position + 1]
+        if marker == 0xff:
+            # fill byte
+            position += 1
+            continue
+        if marker in STANDALONE_MARKERS:
+            position += 2
+            continue
+        length = (data[position + 2] << 8) | data[position + 3]
+        if marker in SOF_MARKERS:
+            if position + 9 > len(data):
+                return None
+            height = (data[position + 5] << 8) | data[position + 6]
+            width = (data[position + 7] << 8) | data[position + 8]
+            return width, height
+        position += 2 + length
+    return None
+
+class FramePreprocessor:
+    """
+    FramePreprocessor turns a JPEG into the images imageSetup() produced:
+    it decodes at a reduced size when the JPEG is larger than needed, then
+    resizes, rotates and converts colour into preallocated buffers. Buffers
+    are used round robin, so an image stays valid for the next
+    BUFFER_COUNT - 1 frames
+    """
+
+    def __init__(self, size=OUTPUT_SIZE, rotation=cv2.ROTATE_90_CLOCKWISE, reducedDecode=True, bufferCount=BUFFER_COUNT):
+        """
+        :param size: (width, height) of the output image
+        :param rotation: cv2 rotate code (None = no rotation)
+        :param reducedDecode: let libjpeg scale large frames down while decoding
+        :param bufferCount: frames whose images stay valid at once
+        """
+        self.size = size
+        self.rotation = rotation
+        self.reducedDecode = reducedDecode
+        width, height = size
+        # size to resize to before the rotation swaps the axes
+        quarterTurn = rotation in (cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        self.unrotated = (height, width) if quarterTurn else (width, height)
+        self.resized = [np.empty((self.unrotated[1], self.unrotated[0], 3), np.uint8) for _ in range(bufferCount)]
+        self.bgr = [np.empty((height, width, 3), np.uint8) for _ in range(bufferCount)]
+        self.rgb = [np.empty((height, width, 3), np.uint8) for _ in range(bufferCount)]
+        self.slot = 0
+        self.factors = {}
+        self.frames = 0
+        self.reducedFrames = 0
+
+    def factor(self, jpg):
+        """
+        factor() picks the largest decode reduction that still leaves at
+        least the output size
+
+        :param jpg: JPEG image
+        :return: 1, 2, 4 or 8
+        """
+        if not self.reducedDecode:
+            return 1
+        size = jpegSize(jpg)
+        factor = self.factors.get(size)
+        if factor is None:
+            factor = 1
+            if size is not None:
+                for candidate in (8, 4, 2):
+                    if size[0]//candidate >= self.unrotated[0] and size[1]//candidate >= self.unrotated[1]:
+                        factor = candidate
+                        break
+            self.factors[size] = factor
+        return factor
+
+    def process(self, jpg, rgb=True):
+        """
+        process() decodes and prepares a frame
+
+        :param jpg: JPEG image
+        :param rgb: also produce the RGB image MediaPipe takes
+        :return: BGR image, RGB image (None when rgb is off), raises FrameError for a corrupt JPEG
+        """
+        factor = self.factor(jpg)
+        try:
+            decoded = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), REDUCED_DECODE[factor])
+        except cv2.error as error:
+            # an empty buffer is refused before libjpeg sees it
+            raise FrameError('frame is not a readable JPEG (' + str(error).strip() + ')')
+        if decoded is None:
+            raise FrameError('frame is not a readable JPEG')
+        if factor > 1:
+            self.reducedFrames += 1
+        return self.prepare(decoded, rgb)
+
+    def prepare(self, decoded, rgb=True):
+        """
+        prepare() resizes, rotates and converts an image that is already
+        decoded (video frames)
+
+        :param decoded: BGR image
+        :param rgb: also produce the RGB image MediaPipe takes
+        :return: BGR image, RGB image (None when rgb is off)
+        """
+        self.frames += 1
+        slot = self.slot
+        self.slot = (slot + 1) % len(self.bgr)
+
+        # resizing first means the rotation only touches output-sized pixels
+        if self.rotation is None:
+            image = cv2.resize(decoded, self.size, dst=self.bgr[slot])
+        else:
+            resized = decoded
+            if decoded.shape[1] != self.unrotated[0] or decoded.shape[0] != self.unrotated[1]:
+                resized = cv2.resize(decoded, self.unrotated, dst=self.resized[slot])
+            image = cv2.rotate(resized, self.rotation, dst=self.bgr[slot])
+        if not rgb:
+            return image, None
+        return image, cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.rgb[slot])
+
+    def counters(self):
+        return {'frames': self.frames, 'reduced_decodes': self.reducedFrames,
+            'decode_factors': {str(size): factor for size, factor in self.factors.items()}}
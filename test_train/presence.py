@@ -0,0 +1,140 @@
+#----------------------------------------------------------------------------
+# presence.py - cheap motion/skin check that skips MediaPipe on empty, static scenes
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import cv2
+import numpy as np
+
+# size of the grayscale image the check runs on (width, height)
+GATE_SIZE=(64,48)
+
+# grey levels a pixel has to change by to count as moving
+PIXEL_THRESHOLD=12
+
+# fraction of the check image that has to move for MediaPipe to run
+MOTION_AREA=0.01
+
+# inferences after the last tracked hand during which MediaPipe always runs
+HOLD_FRAMES=5
+
+# seconds MediaPipe may be skipped in a row (catches a hand that entered without being seen)
+REFRESH_INTERVAL=1.
+
+# skin tone range in YCrCb (lower, upper)
+SKIN_RANGE=((0, 133, 77), (255, 173, 127))
+
+class PresenceGate:
+    """
+    PresenceGate decodes each JPEG at 1/8 size and compares it with the last
+    checked frame. While no hand has been tracked for HOLD_FRAMES inferences
+    and too little of the scene moved (optionally counting only skin-coloured
+    pixels), the frame is not worth running MediaPipe on. A frame is let
+    through at least every refreshInterval so a hand that slipped in is
+    still found
+    """
+
+    def __init__(self, pixelThreshold=PIXEL_THRESHOLD, motionArea=MOTION_AREA, holdFrames=HOLD_FRAMES,
+            refreshInterval=REFRESH_INTERVAL, skinOnly=False, size=GATE_SIZE):
+        """
+        :param pixelThreshold: grey level change that counts as moving
+        :param motionArea: fraction of moving pixels that lets a frame through
+        :param holdFrames: inferences after a tracked hand during which every frame goes through
+        :param refreshInterval: longest time frames are skipped in a row (None = no limit)
+        :param skinOnly: only count moving pixels that are skin coloured
+        :param size: (width, height) of the check image
+        """
+        self.pixelThreshold = pixelThreshold
+        self.motionArea = motionArea
+        self.holdFrames = holdFrames
+        self.refreshInterval = refreshInterval
+        self.skinOnly = skinOnly
+        self.size = size
+        self.current = np.empty((size[1], size[0]), np.uint8)
+        self.previous = None
+        self.colour = np.empty((size[1], size[0], 3), np.uint8)
+        self.ycrcb = np.empty((size[1], size[0], 3), np.uint8)
+        self.sinceHand = holdFrames
+        self.lastPass = None
+        self.lastArea = 0.
+        self.held = 0
+        self.moved = 0
+        self.refreshed = 0
+        self.skipped = 0
+
+    def area(self, jpg):
+        """
+        area() decodes a small grayscale copy of the frame and measures how
+        much of it moved since the last check
+
+        :param jpg: JPEG image
+        :return: fraction of moving pixels (1 when there is nothing to compare with)
+        """
+        try:
+            decoded = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_REDUCED_COLOR_8)
+        except cv2.error:
+            decoded = None
+        if decoded is None:
+            # passed on, the decode that follows skips the frame
+            return 1.
+        cv2.resize(decoded, self.size, dst=self.colour, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.colour, cv2.COLOR_BGR2GRAY, dst=self.current)
+        # smooths JPEG block noise that would otherwise count as motion
+        cv2.GaussianBlur(self.current, (3, 3), 0, dst=self.current)
+        previous = self.previous
+        if previous is None:
+            self.previous = self.current.copy()
+            return 1.
+        moving = cv2.absdiff(self.current, previous) > self.pixelThreshold
+        if self.skinOnly:
+            cv2.cvtColor(self.colour, cv2.COLOR_BGR2YCrCb, dst=self.ycrcb)
+            moving &= cv2.inRange(self.ycrcb, SKIN_RANGE[0], SKIN_RANGE[1]) > 0
+        # swap so the next frame is compared with this one without copying
+        self.previous, self.current = self.current, previous
+        return float(np.count_nonzero(moving))/moving.size
+
+    def shouldRun(self, jpg, now):
+        """
+        shouldRun() checks if MediaPipe should look at this frame
+
+        :param jpg: JPEG image
+        :param now: time of the frame
+        :return: boolean
+        """
+        if self.sinceHand < self.holdFrames:
+            # a hand was just tracked, there is no need to look; compare afresh once it is gone
+            self.previous = None
+            self.held += 1
+            self.lastPass = now
+            return True
+        self.lastArea = self.area(jpg)
+        if self.lastArea >= self.motionArea:
+            self.moved += 1
+            self.lastPass = now
+            return True
+        if self.refreshInterval is not None and (self.lastPass is None or now - self.lastPass >= self.refreshInterval):
+            self.refreshed += 1
+            self.lastPass = now
+            return True
+        self.skipped += 1
+        return False
+
+    def record(self, handFound):
+        """
+        record() feeds back whether MediaPipe found a hand in a frame that went through
+
+        :param handFound: boolean
+        """
+        self.sinceHand = 0 if handFound else self.sinceHand + 1
+
+    def reset(self):
+        self.previous = None
+        self.sinceHand = self.holdFrames
+        self.lastPass = None
+
+    def counters(self):
+        total = self.held + self.moved + self.refreshed + self.skipped
+        return {'held': self.held, 'moved': self.moved, 'refreshed': self.refreshed, 'skipped': self.skipped,
+            'skip_rate': round(self.skipped/total, 3) if total else 0., 'last_area': round(self.lastArea, 4)}
@@ -0,0 +1,360 @@
+#----------------------------------------------------------------------------
+# replay.py - serve recorded MJPEG captures the way the ESP-EYE streams them
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import ssl
+import threading
+import time
+from urllib.request import urlopen
+from mjpeg import MJPEGReader
+
+# same boundary and part header as esp_camera.ino
+PART_BOUNDARY='123456789000000000000987654321'
+STREAM_CONTENT_TYPE='multipart/x-mixed-replace;boundary=' + PART_BOUNDARY
+STREAM_BOUNDARY=b'\r\n--' + PART_BOUNDARY.encode() + b'\r\n'
+STREAM_PART=b'Content-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
+# frame rate of the ESP-EYE stream
+CAMERA_FPS=25
+
+# sidecar file next to a capture logging when each chunk of it arrived
+TIMES_SUFFIX='.times'
+
+def loadCapture(path):
+    """
+    loadCapture() reads every JPEG out of a recorded stream file
+
+    :param path: file holding the raw multipart stream
+    :return: list of JPEG bytes
+    """
+    return loadRecording(path)[0]
+
+def loadRecording(path):
+    """
+    loadRecording() reads every JPEG out of a recorded stream file together
+    with when it arrived (from the timestamp sidecar, or at CAMERA_FPS when
+    the capture has none)
+
+    :param path: file holding the raw multipart stream
+    :return: list of JPEG bytes, list of seconds since the first frame
+    """
+    frames = []
+    times = []
+    stream = CaptureStream(path, realtime=False)
+    reader = MJPEGReader(stream)
+    try:
+        while True:
+            frames.append(bytes(reader.readFrame()))
+            times.append(stream.elapsed)
+    except ConnectionError:
+        pass
+    finally:
+        stream.close()
+    if stream.chunks is None:
+        times = [i/CAMERA_FPS for i in range(len(frames))]
+    elif times:
+        times = [t - times[0] for t in times]
+    return frames, times
+
+def loadTimes(path):
+    """
+    loadTimes() reads the timestamp sidecar of a capture
+
+    :param path: capture file
+    :return: list of (end offset, seconds since recording started), None without a sidecar
+    """
+    if not os.path.exists(path + TIMES_SUFFIX):
+        return None
+    chunks = []
+    with open(path + TIMES_SUFFIX) as f:
+        for line in f:
+            offset, arrived = line.split(',')
+            chunks.append((int(offset), float(arrived)))
+    if chunks:
+        first = chunks[0][1]
+        chunks = [(offset, arrived - first) for offset, arrived in chunks]
+    return chunks
+
+class StreamRecorder:
+    """
+    StreamRecorder wraps a live stream and tees every byte read from it into a
+    capture file, logging when each chunk arrived in a sidecar file. Reads
+    pass straight through, so it can stand in for the stream anywhere
+    """
+
+    def __init__(self, stream, path):
+        """
+        :param stream: live stream (urlopen response)
+        :param path: capture file to append to
+        """
+        self.stream = stream
+        self.capture = open(path, 'ab')
+        self.times = open(path + TIMES_SUFFIX, 'a')
+        self.offset = self.capture.tell()
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.record(data)
+        return data
+
+    def readinto(self, buffer):
+        if hasattr(self.stream, 'readinto'):
+            count = self.stream.readinto(buffer)
+        else:
+            data = self.stream.read(len(buffer))
+            count = len(data)
+            buffer[:count] = data
+        if count:
+            self.record(memoryview(buffer)[:count])
+        return count
+
+    def record(self, data):
+        """
+        record() appends a chunk to the capture and logs its arrival time
+
+        :param data: bytes just read from the stream
+        """
+        if not len(data):
+            return
+        self.capture.write(data)
+        self.offset += len(data)
+        self.times.write(str(self.offset) + ',' + repr(time.time()) + '\n')
+
+    def close(self):
+        self.capture.close()
+        self.times.close()
+        self.stream.close()
+
+class CaptureStream:
+    """
+    CaptureStream is a file-backed live stream over a recorded capture. In
+    real time it hands out each recorded chunk when it arrived during the
+    recording, otherwise as fast as it is read (captures without a timestamp
+    sidecar are always unthrottled)
+    """
+
+    def __init__(self, path, realtime=True, speed=1.):
+        """
+        :param path: capture file
+        :param realtime: replay at recorded speed
+        :param speed: playback speed multiplier in real time
+        """
+        self.file = open(path, 'rb')
+        self.chunks = loadTimes(path)
+        self.realtime = realtime and self.chunks is not None
+        self.speed = speed
+        self.chunk = 0
+        self.offset = 0
+        # recorded arrival time of the last chunk handed out
+        self.elapsed = 0.
+        self.start = time.perf_counter()
+
+    def available(self, size):
+        """
+        available() limits a read to the current recorded chunk, waiting for
+        it to be due in real time
+
+        :param size: bytes requested
+        :return: bytes that can be handed out now
+        """
+        if self.chunks is None:
+            return size
+        while self.chunk < len(self.chunks) and self.chunks[self.chunk][0] <= self.offset:
+            self.chunk += 1
+        if self.chunk == len(self.chunks):
+            return size
+        end, arrived = self.chunks[self.chunk]
+        if self.realtime:
+            delay = self.start + arrived/self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.elapsed = arrived
+        return min(size, end - self.offset)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self.file.read()
+        else:
+            data = self.file.read(self.available(size))
+        self.offset += len(data)
+        return data
+
+    def readinto(self, buffer):
+        view = memoryview(buffer)
+        count = self.file.readinto(view[:self.available(len(view))])
+        self.offset += count
+        return count
+
+    def close(self):
+        self.file.close()
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    ReplayHandler streams the server's frames to every client that connects
+    """
+
+    def do_GET(self):
+        server = self.server
+        self.send_response(200)
+        self.send_header('Content-Type', STREAM_CONTENT_TYPE)
+        if server.chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        start = time.perf_counter()
+        count = 0
+        try:
+            while not server.stopped:
+                for jpg in server.frames:
+                    due = server.frameDue(count)
+                    if due is not None:
+                        # pace frames like the camera would send them
+                        delay = start + due - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    part = STREAM_PART % len(jpg) + jpg + STREAM_BOUNDARY
+                    count += 1
+                    drop = server.dropAfter and count % server.dropAfter == 0
+                    if server.chunked:
+                        # one chunk per part like httpd_resp_send_chunk, a drop cuts it off halfway
+                        self.wfile.write(b'%x\r\n' % len(part))
+                        if drop:
+                            self.wfile.write(part[:len(part)//2])
+                            return
+                        self.wfile.write(part + b'\r\n')
+                    else:
+                        self.wfile.write(part)
+                    if drop:
+                        # stand in for a network blip by cutting the client off
+                        return
+                if not server.loop:
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def log_message(self, format, *args):
+        pass
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    ReplayServer is a local stand-in for the ESP-EYE live stream
+    """
+    daemon_threads = True
+
+    def __init__(self, frames, fps=CAMERA_FPS, loop=True, port=0, host='127.0.0.1', dropAfter=0, times=None, chunked=False):
+        """
+        :param frames: list of JPEG bytes to serve
+        :param fps: frames per second sent to each client (None/0 = unthrottled)
+        :param loop: start over when the capture ends
+        :param port: port to listen on (0 picks a free one)
+        :param host: address to listen on
+        :param dropAfter: close each connection after this many frames (0 = never)
+        :param times: recorded seconds of every frame, replaces fps pacing
+        :param chunked: send the stream with Transfer-Encoding: chunked, one chunk per part (like the ESP firmware)
+        """
+        super().__init__((host, port), ReplayHandler)
+        self.frames = frames
+        self.fps = fps
+        self.loop = loop
+        self.dropAfter = dropAfter
+        self.times = times
+        self.chunked = chunked
+        self.stopped = False
+        self.thread = threading.Thread(target=self.serve_forever, name='replay-server', daemon=True)
+
+    def frameDue(self, count):
+        """
+        frameDue() tells when a client's count-th frame should go out
+
+        :param count: frames already sent to the client
+        :return: seconds since the client connected, None for unthrottled
+        """
+        if self.times:
+            # a looped capture restarts one frame interval after its last frame
+            cycle, index = divmod(count, len(self.frames))
+            duration = self.times[-1] + (self.times[-1]/(len(self.times) - 1) if len(self.times) > 1 else 1/CAMERA_FPS)
+            return cycle*duration + self.times[index]
+        if self.fps:
+            return count/self.fps
+        return None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return 'http://' + host + ':' + str(port) + '/'
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped = True
+        self.shutdown()
+        self.server_close()
+
+def record(url, path, seconds=None, frames=None):
+    """
+    record() tees a live stream into a capture file
+
+    :param url: live stream url
+    :param path: capture file to append to
+    :param seconds: stop after this many seconds (None = until interrupted)
+    :param frames: stop after this many frames (None = until interrupted)
+    :return: frames recorded
+    """
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    stream = StreamRecorder(urlopen(url, context=ctx, timeout=2), path)
+    reader = MJPEGReader(stream)
+    start = time.time()
+    try:
+        while (seconds is None or time.time() - start < seconds) and (frames is None or reader.framesRead < frames):
+            reader.readFrame()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.close()
+    return reader.framesRead
+
+def main():
+    """
+    main() records a live stream to disk or serves a recording like the ESP-EYE
+    """
+    parser = argparse.ArgumentParser(description='Record or replay ESP-EYE MJPEG streams.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    recordParser = commands.add_parser('record', help='tee a live stream into a capture file')
+    recordParser.add_argument('url', help='live stream url')
+    recordParser.add_argument('capture', help='capture file to append to')
+    recordParser.add_argument('--seconds', type=float, default=None)
+    recordParser.add_argument('--frames', type=int, default=None)
+    serveParser = commands.add_parser('serve', help='serve a capture over HTTP')
+    serveParser.add_argument('capture', help='recorded MJPEG stream file')
+    serveParser.add_argument('--port', type=int, default=8080)
+    serveParser.add_argument('--host', default='127.0.0.1')
+    serveParser.add_argument('--fps', type=float, default=CAMERA_FPS, help='frame rate (0 = unthrottled)')
+    serveParser.add_argument('--realtime', action='store_true', help='pace frames by the recorded timestamps')
+    serveParser.add_argument('--once', action='store_true', help='do not loop the capture')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        print('recorded {} frames to {}'.format(record(args.url, args.capture, args.seconds, args.frames), args.capture))
+        return
+    frames, times = loadRecording(args.capture)
+    server = ReplayServer(frames, args.fps, not args.once, args.port, args.host,
+        times=times if args.realtime else None).start()
+    print('serving {} frames at {}'.format(len(frames), server.url))
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+   main()
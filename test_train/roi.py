@@ -0,0 +1,119 @@
+#----------------------------------------------------------------------------
+# roi.py - region-of-interest tracking so MediaPipe only sees the area around the hand
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import cv2
+
+# padding added on every side of the previous hand, as a fraction of its size
+ROI_PADDING=0.6
+
+# smallest crop side in pixels (smaller crops hurt detection)
+MIN_ROI_SIZE=192
+
+# crops covering more than this share of the frame are not worth it
+MAX_ROI_AREA=0.7
+
+class ROITracker:
+    """
+    ROITracker crops each frame around the previous frame's hand before running
+    MediaPipe, maps the landmarks back to full-frame coordinates, and falls back
+    to full-frame detection whenever the hand is not found in the crop
+    """
+
+    def __init__(self, padding=ROI_PADDING, minSize=MIN_ROI_SIZE):
+        """
+        :param padding: padding per side as a fraction of the hand's size
+        :param minSize: smallest crop side in pixels
+        """
+        self.padding = padding
+        self.minSize = minSize
+        # previous hand's bounding box, normalized to the full frame
+        self.box = None
+        self.cropFrames = 0
+        self.fullFrames = 0
+        self.lost = 0
+
+    def region(self, width, height):
+        """
+        region() computes the crop around the previous hand
+
+        :param width: frame width
+        :param height: frame height
+        :return: (left, top, right, bottom) in pixels, None for the full frame
+        """
+        if self.box is None:
+            return None
+        x0, y0, x1, y1 = self.box
+        side = max((x1 - x0)*width, (y1 - y0)*height)*(1 + 2*self.padding)
+        side = max(side, self.minSize)
+        centreX, centreY = (x0 + x1)/2*width, (y0 + y1)/2*height
+        left = int(max(0, centreX - side/2))
+        top = int(max(0, centreY - side/2))
+        right = int(min(width, centreX + side/2))
+        bottom = int(min(height, centreY + side/2))
+        if right - left < 2 or bottom - top < 2 or (right - left)*(bottom - top) > MAX_ROI_AREA*width*height:
+            return None
+        return left, top, right, bottom
+
+    def process(self, hands, image):
+        """
+        process() runs MediaPipe on the region of interest of a BGR frame
+
+        :param hands: mediapipe Hands context
+        :param image: full BGR frame
+        :return: handResults with landmarks in full-frame coordinates
+        """
+        height, width = image.shape[:2]
+        region = self.region(width, height)
+        if region is not None:
+            left, top, right, bottom = region
+            crop = cv2.cvtColor(image[top:bottom, left:right], cv2.COLOR_BGR2RGB)
+            handResults = hands.process(crop)
+            if handResults.multi_hand_landmarks:
+                self.cropFrames += 1
+                mapLandmarks(handResults, left/width, top/height, (right - left)/width, (bottom - top)/height)
+                self.update(handResults)
+                return handResults
+            # tracking lost, look at the whole frame again
+            self.lost += 1
+        handResults = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        self.fullFrames += 1
+        self.update(handResults)
+        return handResults
+
+    def update(self, handResults):
+        """
+        update() remembers where the hand was for the next frame
+
+        :param handResults: handResults in full-frame coordinates
+        """
+        if not handResults.multi_hand_landmarks:
+            self.box = None
+            return
+        # setLandmarks() uses the last hand, so track that one
+        landmarks = handResults.multi_hand_landmarks[-1].landmark
+        xs = [landMark.x for landMark in landmarks]
+        ys = [landMark.y for landMark in landmarks]
+        self.box = (min(xs), min(ys), max(xs), max(ys))
+
+    def counters(self):
+        return {'roi_frames': self.cropFrames, 'full_frames': self.fullFrames, 'roi_lost': self.lost}
+
+def mapLandmarks(handResults, left, top, width, height):
+    """
+    mapLandmarks() converts landmarks normalized to the crop into landmarks
+    normalized to the full frame (in place)
+
+    :param handResults: handResults from the crop
+    :param left: crop left edge, normalized to the frame
+    :param top: crop top edge, normalized to the frame
+    :param width: crop width, normalized to the frame
+    :param height: crop height, normalized to the frame
+    """
+    for hand_landmarks in handResults.multi_hand_landmarks:
+        for landMark in hand_landmarks.landmark:
+            landMark.x = left + landMark.x*width
+            landMark.y = top + landMark.y*height
@@ -0,0 +1,197 @@
+#----------------------------------------------------------------------------
+# router.py - routing table from (command mode, gesture) to actions, reloaded when its file changes
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import threading
+
+# routes of every command mode (edited while testing.py runs, picked up without a restart)
+ROUTES_PATH='./aggregate_gesture_data/routes.json'
+
+# seconds between checks of the routes file
+RELOAD_INTERVAL=1.
+
+def compileRoutes(config, actions):
+    """
+    compileRoutes() turns a routes config into a lookup table, checking every
+    action before anything is swapped in
+
+    :param config: {'modes': {mode: {'name': banner, 'routes': {gesture: {'action': name, 'argument': value}}}}}
+    :param actions: action name -> function(argument, issuedAt=None), or -> {argument: function()} for a fixed set of arguments
+    :return: {(mode, gesture): (function, args, takes issuedAt)}, {mode: banner name}, {mode: action names its routes use}
+    """
+    table = {}
+    names = {}
+    uses = {}
+    modes = checkType(config, dict, 'routes file').get('modes', {})
+    for commandMode, mode in checkType(modes, dict, 'modes').items():
+        checkType(mode, dict, 'mode ' + commandMode)
+        names[commandMode] = mode.get('name', commandMode)
+        uses[commandMode] = set()
+        for myGesture, route in checkType(mode.get('routes', {}), dict, 'routes of mode ' + commandMode).items():
+            name = checkType(route, dict, 'route of {} in mode {}'.format(myGesture, commandMode)).get('action')
+            if not isinstance(name, str) or name not in actions:
+                raise ValueError('unknown action {!r} for {} in mode {}'.format(name, myGesture, commandMode))
+            uses[commandMode].add(name)
+            action = actions[name]
+            argument = route.get('argument')
+            if isinstance(action, dict):
+                if not isinstance(argument, str) or argument not in action:
+                    raise ValueError('unknown {} argument {!r} for {} in mode {}'.format(name, argument, myGesture, commandMode))
+                table[(commandMode, myGesture)] = (action[argument], (), False)
+            else:
+                table[(commandMode, myGesture)] = (action, () if argument is None else (argument,), True)
+    return table, names, uses
+
+def checkType(value, expected, what):
+    """
+    checkType() checks a part of the routes config has the JSON type it needs
+
+    :param value: part of the config
+    :param expected: type it has to be
+    :param what: where it is in the config (for the error)
+    :return: value
+    """
+    if not isinstance(value, expected):
+        raise ValueError('{} is a {}, not a {}'.format(what, type(value).__name__, expected.__name__))
+    return value
+
+class CommandRouter:
+    """
+    CommandRouter issues commands through a table compiled from the routes
+    file, one dict lookup per command. A background thread watches the file
+    and swaps in the new table when it changes; a file that does not load
+    keeps the table that was running. Entering a mode can tell the actions
+    it routes to get ready before its first command
+    """
+
+    def __init__(self, actions, path=ROUTES_PATH, reloadInterval=RELOAD_INTERVAL, verbose=True, prepare=None):
+        """
+        :param actions: action name -> function(argument, issuedAt=None), or -> {argument: function()}
+        :param path: routes file (JSON)
+        :param reloadInterval: seconds between checks of the file
+        :param verbose: print mode banners and issued gestures like testing.py always has
+        :param prepare: function taking the action names of a mode, called when it is entered (None = nothing to prepare)
+        """
+        self.actions = actions
+        self.prepare = prepare
+        self.path = path
+        self.reloadInterval = reloadInterval
+        self.verbose = verbose
+        # swapped as one tuple so a command never sees half of a reload
+        self.routes = ({}, {}, {})
+        self.signature = None
+        self.stopEvent = threading.Event()
+        self.thread = None
+        self.counts = {'reloads': 0, 'reload_errors': 0, 'routed': 0, 'unrouted': 0}
+        self.lastError = None
+        self.load()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.watchLoop, name='routes-watcher', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def fileSignature(self):
+        """
+        fileSignature() tells whether the routes file changed since the last load
+
+        :return: (mtime, size), None when the file does not exist
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        """
+        load() compiles the routes file and swaps it in
+
+        :return: True when the new table is in use
+        """
+        self.signature = self.fileSignature()
+        if self.signature is None:
+            self.lastError = 'no routes file at ' + self.path
+            self.log('Warning: ' + self.lastError + ', gestures will not issue commands.')
+            self.routes = ({}, {}, {})
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                self.routes = compileRoutes(json.load(f), self.actions)
+        except (OSError, ValueError, AttributeError, TypeError) as error:
+            self.counts['reload_errors'] += 1
+            self.lastError = str(error)
+            self.log('Error: routes not reloaded, keeping the previous ones (' + self.lastError + ').')
+            return False
+        self.counts['reloads'] += 1
+        self.lastError = None
+        return True
+
+    def watchLoop(self):
+        """
+        watchLoop() reloads the routes whenever the file changes
+        """
+        while not self.stopEvent.wait(self.reloadInterval):
+            if self.fileSignature() != self.signature:
+                self.load()
+
+    def enter(self, commandMode):
+        """
+        enter() is called when a command mode is picked and prepares the
+        actions its routes use
+
+        :param commandMode: gesture that picked the command mode
+        """
+        _, _, uses = self.routes
+        if self.prepare is not None and uses.get(commandMode):
+            self.prepare(sorted(uses[commandMode]))
+
+    def handle(self, commandMode, myGesture, issuedAt=None):
+        """
+        handle() takes recognized gesture and match to functionality
+
+        :param commandMode: gesture that picked the command mode
+        :param myGesture: gesture issued in that mode
+        :param issuedAt: time.perf_counter() the gesture was recognized at, handed to the
+            action so its latency counts from recognition (None = the action's own clock)
+        :return: True when a route ran
+        """
+        table, names, _ = self.routes
+        if(commandMode == 'Unknown'):
+            self.log('Invalid command-mode, please try again.')
+        if(myGesture == 'Unknown'):
+            self.log('Invalid gesture, please try again.')
+        if commandMode in names:
+            self.log('-----------------' + names[commandMode] + ' Mode-----------------')
+        route = table.get((commandMode, myGesture))
+        if route is not None:
+            function, args, timed = route
+            if issuedAt is None or not timed:
+                function(*args)
+            else:
+                function(*args, issuedAt=issuedAt)
+            self.counts['routed'] += 1
+        else:
+            self.counts['unrouted'] += 1
+        self.log('Gesture issued: ' + myGesture)
+        return route is not None
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def counters(self):
+        table, names, _ = self.routes
+        return dict(self.counts, routes=len(table), modes=len(names), last_error=self.lastError)
@@ -0,0 +1,117 @@
+#----------------------------------------------------------------------------
+# scheduler.py - adaptive inference rate driven by hand presence and gesture stability
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import numpy as np
+from features import landmarkArray, palmSizes
+
+# seconds between inferences while no hand is in view
+IDLE_INTERVAL=0.25
+
+# seconds between inferences while the same gesture is held still
+STABLE_INTERVAL=0.2
+
+# matches of the same gesture in a row before it counts as stable
+STABLE_FRAMES=5
+
+# mean landmark movement (in palm sizes) that counts as the hand moving
+MOTION_THRESHOLD=0.05
+
+# seconds before a command window closes when full rate is restored
+WINDOW_MARGIN=0.5
+
+class InferenceScheduler:
+    """
+    InferenceScheduler decides frame by frame whether MediaPipe and matching
+    should run. It drops to a low rate while no hand is present or the matched
+    gesture has stayed the same with the hand still, and goes back to full rate
+    as soon as landmarks move, the gesture changes or a command window is about
+    to close
+    """
+
+    def __init__(self, deadline=None, idleInterval=IDLE_INTERVAL, stableInterval=STABLE_INTERVAL,
+            stableFrames=STABLE_FRAMES, motionThreshold=MOTION_THRESHOLD, windowMargin=WINDOW_MARGIN):
+        """
+        :param deadline: function returning when the current command window closes
+        :param idleInterval: seconds between inferences without a hand
+        :param stableInterval: seconds between inferences while the gesture is stable
+        :param stableFrames: same matches in a row before the gesture is stable
+        :param motionThreshold: landmark movement (palm sizes) that counts as moving
+        :param windowMargin: seconds before the deadline when full rate is restored
+        """
+        self.deadline = deadline
+        self.idleInterval = idleInterval
+        self.stableInterval = stableInterval
+        self.stableFrames = stableFrames
+        self.motionThreshold = motionThreshold
+        self.windowMargin = windowMargin
+        self.lastRun = None
+        self.lastHand = None
+        self.lastGesture = None
+        self.sameCount = 0
+        self.moving = True
+        self.ran = 0
+        self.skipped = 0
+
+    def interval(self, now):
+        """
+        interval() picks the time to wait between inferences right now
+
+        :param now: current time
+        :return: seconds (0 means every frame)
+        """
+        if self.deadline is not None and now >= self.deadline() - self.windowMargin:
+            if self.lastHand is not None:
+                return 0.
+        if self.lastHand is None:
+            return self.idleInterval
+        if not self.moving and self.sameCount >= self.stableFrames:
+            return self.stableInterval
+        return 0.
+
+    def shouldRun(self, now):
+        """
+        shouldRun() checks if this frame should go through inference
+
+        :param now: time of the frame
+        :return: boolean
+        """
+        if self.lastRun is None or now - self.lastRun >= self.interval(now):
+            self.lastRun = now
+            self.ran += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def record(self, myHand, myGesture):
+        """
+        record() feeds back what inference found in a frame
+
+        :param myHand: hand landmark positions (None when no hand was found)
+        :param myGesture: matched gesture (None when no hand was found)
+        """
+        if myHand is None:
+            self.lastHand = None
+            self.lastGesture = None
+            self.sameCount = 0
+            self.moving = True
+            return
+        # copy, the caller may reuse its landmark array for the next frame
+        hand = landmarkArray(myHand).copy()
+        if self.lastHand is None:
+            self.moving = True
+        else:
+            palm = max(float(palmSizes(hand)[0]), 1.)
+            movement = float(np.linalg.norm(hand - self.lastHand, axis=2).mean())/palm
+            self.moving = movement > self.motionThreshold
+        self.sameCount = self.sameCount + 1 if myGesture == self.lastGesture else 1
+        self.lastHand = hand
+        self.lastGesture = myGesture
+
+    def counters(self):
+        total = self.ran + self.skipped
+        return {'inferences': self.ran, 'skipped': self.skipped,
+            'skip_rate': round(self.skipped/total, 3) if total else 0.}
@@ -0,0 +1,304 @@
+#----------------------------------------------------------------------------
+# server.py - recognize gestures from many ESP-EYE live streams in one process
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+from collections import deque
+import json
+import multiprocessing
+import os
+import queue
+import ssl
+import threading
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from commands import CommandState
+from connection import ConnectionManager, openURL
+from features import handNodeDistances
+from library import openLibrary
+from matcher import GestureMatcher
+from pipeline import StageStats
+
+# set buffer size
+CAMERA_BUFFER_SIZE=4096
+
+# image size
+WIDTH=1280
+HEIGHT=720
+
+# which hand nodes to extract data from
+handNodes=[0,4,5,9,13,17,8,12,16,20]
+
+# level of error for prediction
+errorTolerance=20
+
+# latencies kept per device for percentiles
+LATENCY_WINDOW=1000
+
+class Device:
+    """
+    Device holds the per-glasses state: stream url, command mode and the
+    stream of command events it produced
+    """
+
+    def __init__(self, deviceId, url):
+        self.id = deviceId
+        self.url = url
+        self.commands = CommandState(verbose=False)
+        self.events = queue.Queue()
+        self.stats = StageStats()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.framesRead = 0
+        # reconnects in place with backoff, errors show up in the counters
+        self.connection = ConnectionManager(lambda: openURL(url, ctxDefinition()), CAMERA_BUFFER_SIZE, verbose=False)
+
+class InferenceWorker:
+    """
+    InferenceWorker owns one worker process holding a Hands context per device
+    it serves. Only the latest unprocessed frame of each device is kept and
+    one frame at a time is in flight, so latency stays bounded under load
+    """
+
+    def __init__(self, server, context, library):
+        self.server = server
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=workerMain, args=(child, library), daemon=True)
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.thread = threading.Thread(target=self.dispatchLoop, name='dispatch', daemon=True)
+
+    def start(self):
+        self.process.start()
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.pending[None] = (0., None)
+            self.condition.notify()
+
+    def submit(self, device, capturedAt, jpg):
+        """
+        submit() queues a frame, replacing the device's unprocessed frame
+
+        :param device: Device the frame came from
+        :param capturedAt: time the frame was read
+        :param jpg: JPEG bytes
+        """
+        with self.condition:
+            if device.id in self.pending:
+                self.dropped += 1
+            self.pending[device.id] = (capturedAt, jpg)
+            self.condition.notify()
+
+    def dispatchLoop(self):
+        """
+        dispatchLoop() sends the oldest pending frame to the worker process and
+        hands the result back to the server
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                deviceId = min(self.pending, key=lambda key: self.pending[key][0])
+                capturedAt, jpg = self.pending.pop(deviceId)
+            if deviceId is None:
+                self.connection.send(None)
+                return
+            try:
+                self.connection.send((deviceId, jpg))
+                gesture = self.connection.recv()
+            except (EOFError, OSError):
+                print('Error: inference worker exited.')
+                return
+            self.server.handleResult(self.server.devices[deviceId], capturedAt, gesture)
+
+class StreamServer:
+    """
+    StreamServer reads every stream on its own thread and spreads inference
+    over a pool of worker processes sharing one gesture library
+    """
+
+    def __init__(self, urls, numWorkers=None, library=None):
+        """
+        :param urls: live stream url per pair of glasses
+        :param numWorkers: worker processes (defaults to the CPU core count)
+        :param library: (features, gestNames), loaded from the gesture library when None
+        """
+        self.devices = [Device(deviceId, url) for deviceId, url in enumerate(urls)]
+        numWorkers = numWorkers or os.cpu_count() or 1
+        numWorkers = max(1, min(numWorkers, len(self.devices)))
+        library = library or loadLibrary()
+        context = multiprocessing.get_context()
+        self.workers = [InferenceWorker(self, context, library) for i in range(numWorkers)]
+        self.stopEvent = threading.Event()
+        self.readers = [threading.Thread(target=self.readLoop, args=(device,), name='reader-' + str(device.id), daemon=True)
+            for device in self.devices]
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        for reader in self.readers:
+            reader.start()
+        return self
+
+    def stop(self):
+        self.stopEvent.set()
+        for worker in self.workers:
+            worker.stop()
+
+    def workerFor(self, device):
+        return self.workers[device.id % len(self.workers)]
+
+    def readLoop(self, device):
+        """
+        readLoop() reads the device's stream, reconnecting on errors
+
+        :param device: Device to read
+        """
+        worker = self.workerFor(device)
+        for jpg in device.connection.frames(self.stopEvent):
+            device.framesRead += 1
+            worker.submit(device, time.perf_counter(), bytes(jpg))
+
+    def handleResult(self, device, capturedAt, gesture):
+        """
+        handleResult() updates the device's command mode with a recognized
+        frame and emits its command events
+
+        :param device: Device the frame came from
+        :param capturedAt: time the frame was read
+        :param gesture: matched gesture (None when no hand was found)
+        """
+        device.latencies.append(time.perf_counter() - capturedAt)
+        device.stats.tick()
+        if gesture is None:
+            return
+        update = device.commands.update(gesture)
+        if update.command is not None:
+            commandMode, myGesture = update.command
+            device.events.put({'device': device.id, 'url': device.url, 'time': time.time(),
+                'mode': commandMode, 'gesture': myGesture})
+
+    def counters(self):
+        """
+        counters() reports FPS, drops and latency per device
+
+        :return: list of dicts, one per device
+        """
+        counters = []
+        for device in self.devices:
+            latencies = np.array(device.latencies) if device.latencies else np.zeros(1)
+            counters.append({
+                'device': device.id,
+                'read': device.framesRead,
+                'processed': device.stats.count,
+                'fps': round(device.stats.fps(), 1),
+                'reconnects': device.connection.reconnects,
+                'time_to_first_frame_ms': device.connection.counters()['time_to_first_frame_ms'],
+                'latency_p50_ms': round(float(np.percentile(latencies, 50))*1e3, 1),
+                'latency_p99_ms': round(float(np.percentile(latencies, 99))*1e3, 1),
+            })
+        return counters
+
+def workerMain(connection, library):
+    """
+    workerMain() runs in a worker process: builds the matcher once, then
+    recognizes frames for its devices until told to stop
+
+    :param connection: pipe to the server
+    :param library: (features, gestNames)
+    """
+    features, gestNames = library
+    matcher = GestureMatcher.fromFeatures(features, gestNames, handNodes, errorTolerance)
+    contexts = {}
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                return
+            deviceId, jpg = message
+            if deviceId not in contexts:
+                contexts[deviceId] = mp.solutions.hands.Hands(
+                    model_complexity=0,
+                    min_detection_confidence=0.5,
+                    min_tracking_confidence=0.5)
+            connection.send(recognize(jpg, contexts[deviceId], matcher))
+    finally:
+        for hands in contexts.values():
+            hands.close()
+
+def recognize(jpg, hands, matcher):
+    """
+    recognize() applies the imageSetup transformations without the display
+    conversion and matches the hand found in the frame
+
+    :param jpg: JPEG image
+    :param hands: mediapipe Hands context of the device
+    :param matcher: GestureMatcher
+    :return: gesture (None when no hand was found)
+    """
+    image=cv2.imdecode(np.frombuffer(jpg,dtype=np.uint8),cv2.IMREAD_UNCHANGED)
+    image = cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    image=cv2.resize(image,(480,640))
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    handResults = hands.process(image)
+    if not handResults.multi_hand_landmarks:
+        return None
+    myHand = [(int(landMark.x*WIDTH),int(landMark.y*HEIGHT)) for landMark in handResults.multi_hand_landmarks[-1].landmark]
+    return matcher.classify(handNodeDistances(myHand, matcher.handNodes)[0])
+
+def loadLibrary():
+    """
+    loadLibrary() loads the gesture library once for all workers
+
+    :return: features, gestNames
+    """
+    library = openLibrary(handNodes)
+    return library.features, library.gestureNames()
+
+def ctxDefinition():
+    """
+    ctxDefinition() sets up the context to override SSL certification
+    when connecting to the live stream
+
+    :return: ctx (structure of security connection)
+    """
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+def main():
+    """
+    main() serves every stream url given on the command line and prints each
+    device's command events as JSON lines
+    """
+    parser = argparse.ArgumentParser(description='Recognize gestures from several ESP-EYE live streams.')
+    parser.add_argument('urls', nargs='+', help='live stream url per pair of glasses')
+    parser.add_argument('--workers', type=int, default=None, help='inference processes (default: CPU cores)')
+    parser.add_argument('--stats', type=float, default=10, help='seconds between FPS/latency reports')
+    args = parser.parse_args()
+
+    server = StreamServer(args.urls, args.workers).start()
+    statsTime = time.time()
+    try:
+        while True:
+            for device in server.devices:
+                while not device.events.empty():
+                    print(json.dumps(device.events.get()), flush=True)
+            if time.time() - statsTime > args.stats:
+                statsTime = time.time()
+                print(json.dumps({'stats': server.counters()}), flush=True)
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+   main()
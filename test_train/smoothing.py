@@ -0,0 +1,155 @@
+#----------------------------------------------------------------------------
+# smoothing.py - One-Euro landmark filter and temporal voting on matched gestures
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from collections import Counter, deque
+import math
+import numpy as np
+from features import landmarkArray
+
+# One-Euro cutoff (Hz) while the hand is still, lower = smoother
+MIN_CUTOFF=1.
+
+# how fast the cutoff rises with landmark speed (per pixel/second), higher = less lag when moving
+SPEED_COEFFICIENT=0.01
+
+# cutoff (Hz) of the landmark speed estimate
+DERIVATIVE_CUTOFF=1.
+
+# seconds of matched gestures the vote looks back over
+VOTE_SECONDS=0.6
+
+# fewest frames in the window before the vote can decide (at full frame rate)
+MIN_VOTES=4
+
+# fewest frames the vote decides on however slowly inference runs (InferenceScheduler skipping frames)
+FEWEST_VOTES=2
+
+# share of the window the winning gesture needs
+VOTE_FRACTION=0.7
+
+def smoothingFactor(cutoff, elapsed):
+    """
+    smoothingFactor() is the exponential smoothing weight of a low-pass
+    filter with the given cutoff
+
+    :param cutoff: cutoff frequency in Hz (scalar or array)
+    :param elapsed: seconds since the last sample
+    :return: weight of the new sample
+    """
+    tau = 1/(2*math.pi*cutoff)
+    return 1/(1 + tau/elapsed)
+
+class LandmarkFilter:
+    """
+    LandmarkFilter runs a One-Euro filter on every landmark coordinate: a low
+    pass whose cutoff rises with the landmark's speed, so a still hand stops
+    jittering and a moving hand barely lags. With speedCoefficient=0 it is a
+    plain exponential filter
+    """
+
+    def __init__(self, minCutoff=MIN_CUTOFF, speedCoefficient=SPEED_COEFFICIENT, derivativeCutoff=DERIVATIVE_CUTOFF):
+        """
+        :param minCutoff: cutoff (Hz) for a still hand
+        :param speedCoefficient: cutoff increase per pixel/second of speed
+        :param derivativeCutoff: cutoff (Hz) of the speed estimate
+        """
+        self.minCutoff = minCutoff
+        self.speedCoefficient = speedCoefficient
+        self.derivativeCutoff = derivativeCutoff
+        self.value = None
+        self.speed = None
+        self.lastTime = None
+
+    def reset(self):
+        """
+        reset() forgets the hand, the next landmarks pass through unfiltered
+        """
+        self.value = None
+        self.lastTime = None
+
+    def filter(self, myHand, now):
+        """
+        filter() smooths the landmarks of one frame
+
+        :param myHand: (21, 2) hand landmark positions
+        :param now: time of the frame
+        :return: (21, 2) smoothed landmarks (reused by the next call)
+        """
+        hand = landmarkArray(myHand)
+        if self.value is None or self.lastTime is None or now <= self.lastTime:
+            self.value = np.array(hand, dtype=np.float64)
+            self.speed = np.zeros_like(self.value)
+            self.lastTime = now
+            return self.value
+        elapsed = now - self.lastTime
+        self.lastTime = now
+        speed = (hand - self.value)/elapsed
+        self.speed += smoothingFactor(self.derivativeCutoff, elapsed)*(speed - self.speed)
+        cutoff = self.minCutoff + self.speedCoefficient*np.abs(self.speed)
+        self.value += smoothingFactor(cutoff, elapsed)*(hand - self.value)
+        return self.value
+
+class GestureVote:
+    """
+    GestureVote keeps the gestures matched over the last VOTE_SECONDS and
+    reports a gesture once it holds VOTE_FRACTION of the window, so single
+    mismatched frames never reach the command logic. The frames needed scale
+    down with the rate gestures arrive at, so a window that can only hold a
+    few inferences still decides
+    """
+
+    def __init__(self, seconds=VOTE_SECONDS, minVotes=MIN_VOTES, fraction=VOTE_FRACTION, fewestVotes=FEWEST_VOTES):
+        """
+        :param seconds: length of the voting window
+        :param minVotes: fewest frames before a decision at full rate
+        :param fraction: share of the window the winner needs
+        :param fewestVotes: fewest frames before a decision at any rate
+        """
+        self.seconds = seconds
+        self.minVotes = minVotes
+        self.fraction = fraction
+        self.fewestVotes = fewestVotes
+        self.votes = deque()
+        self.counts = Counter()
+
+    def reset(self):
+        self.votes.clear()
+        self.counts.clear()
+
+    def update(self, myGesture, now):
+        """
+        update() adds a frame's gesture and checks if the window agrees
+
+        :param myGesture: matched gesture (None when no hand was found)
+        :param now: time of the frame
+        :return: most common gesture in the window, whether the vote is confident in it
+        """
+        self.votes.append((now, myGesture))
+        self.counts[myGesture] += 1
+        while self.votes and now - self.votes[0][0] > self.seconds:
+            _, old = self.votes.popleft()
+            self.counts[old] -= 1
+            if not self.counts[old]:
+                del self.counts[old]
+        winner, count = self.counts.most_common(1)[0]
+        return winner, len(self.votes) >= self.required() and count >= self.fraction*len(self.votes)
+
+    def required(self):
+        """
+        required() tells how many frames the window needs before deciding:
+        minVotes, or as many as fit in the window at the rate frames arrived
+
+        :return: frames
+        """
+        if len(self.votes) < 2:
+            return self.minVotes
+        interval = (self.votes[-1][0] - self.votes[0][0])/(len(self.votes) - 1)
+        if interval <= 0:
+            return self.minVotes
+        # frames the window holds at this rate (the small slack absorbs clock rounding)
+        fits = int(self.seconds/interval + 1e-6)
+        return max(self.fewestVotes, min(self.minVotes, fits))
@@ -0,0 +1,76 @@
+#----------------------------------------------------------------------------
+# test_commands.py - command mode state machine fed synthetic gesture streams
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+from commands import AWAITING_MODE, IN_MODE, CommandState
+from scheduler import STABLE_INTERVAL
+from smoothing import GestureVote
+
+# seconds between frames of the synthetic streams (25 fps camera)
+FRAME_TIME=0.04
+
+def feed(commands, sequence, start=0., frameTime=FRAME_TIME):
+    """
+    feed() replays (gesture, frames) runs through CommandState on a simulated clock
+
+    :param commands: CommandState
+    :param sequence: [(gesture or None for no hand, frames)]
+    :param start: time of the first frame
+    :param frameTime: seconds between frames
+    :return: commands issued, time after the last frame
+    """
+    issued = []
+    now = start
+    for myGesture, frames in sequence:
+        for _ in range(frames):
+            update = commands.update(myGesture, now)
+            if update.command is not None:
+                issued.append(update.command)
+            now += frameTime
+    return issued, now
+
+def test_swipe_issues_command_with_vote():
+    commands = CommandState(verbose=False, vote=GestureVote(), motionGestures=['Left', 'Right'])
+    commands.preFrameTime = 0.
+    issued, _ = feed(commands, [('One', 20), (None, 10), ('Go', 20), ('Left', 1), ('Go', 20)])
+    assert commands.state == IN_MODE and commands.commandMode == 'One'
+    assert issued == [('One', 'Go'), ('One', 'Left')]
+
+def test_swipe_issues_command_with_timer():
+    commands = CommandState(holdTime=1, verbose=False, motionGestures=['Left'])
+    commands.preFrameTime = 0.
+    issued, _ = feed(commands, [('One', 30), ('Go', 10), ('Left', 1), ('Go', 5)])
+    assert issued == [('One', 'Left')]
+
+def test_swipe_picks_mode():
+    commands = CommandState(verbose=False, vote=GestureVote(), motionGestures=['Left'])
+    feed(commands, [('Left', 1)])
+    assert commands.state == IN_MODE and commands.commandMode == 'Left'
+
+def test_vote_decides_at_stable_interval():
+    # InferenceScheduler runs a held gesture every STABLE_INTERVAL, fewer than MIN_VOTES fit in the window
+    commands = CommandState(verbose=False, vote=GestureVote())
+    commands.preFrameTime = 0.
+    feed(commands, [('One', 4)], frameTime=STABLE_INTERVAL)
+    assert commands.state == IN_MODE and commands.commandMode == 'One'
+
+def test_vote_needs_min_votes_at_full_rate():
+    commands = CommandState(verbose=False, vote=GestureVote())
+    commands.preFrameTime = 0.
+    feed(commands, [('One', 3)])
+    assert commands.state == AWAITING_MODE
+    feed(commands, [('One', 1)], 3*FRAME_TIME)
+    assert commands.state == IN_MODE
+
+def test_reset_clears_vote():
+    commands = CommandState(verbose=False, vote=GestureVote())
+    commands.preFrameTime = 0.
+    _, now = feed(commands, [('One', 20)])
+    commands.reset()
+    assert commands.state == AWAITING_MODE and not commands.vote.votes
+    # the gesture still held after the reset picks the mode again
+    feed(commands, [('One', 5)], now)
+    assert commands.commandMode == 'One'
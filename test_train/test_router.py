@@ -0,0 +1,195 @@
+#----------------------------------------------------------------------------
+# test_router.py - routing table and command modes driven by synthetic gesture sequences
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import time
+import pytest
+from commands import AWAITING_MODE, IN_MODE, CommandState
+from router import CommandRouter, compileRoutes
+from smoothing import GestureVote
+
+# routes file shipped with the repository
+ROUTES_FILE=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'aggregate_gesture_data', 'routes.json')
+
+# frames per second of the synthetic sequences
+STREAM_FPS=25
+
+# Alexa request of the smart home Thumb-up
+THUMB_UP_URL='https://api.voicemonkey.io/trigger?access_token=$ACCESS_TOKEN'
+
+# (gesture, seconds shown) in order, None = no hand, and the actions expected
+# with the hold timer and with the vote (which repeats a gesture held past HOLD_TIME)
+SEQUENCES = [
+    ('pick a mode and issue', [('One', 5), ('Thumb-up', 5), ('Go', 5)],
+        [('request', THUMB_UP_URL), ('request', '')],
+        [('request', THUMB_UP_URL), ('request', THUMB_UP_URL), ('request', ''), ('request', '')]),
+    ('unknown is never issued', [('Two', 5), ('Unknown', 5), ('Go', 5)],
+        [('presentation', 'start')],
+        [('presentation', 'start'), ('presentation', 'start')]),
+    ('unknown mode waits', [('Unknown', 5), ('Three', 5), ('One', 5)],
+        [('request', '')],
+        [('request', ''), ('request', '')]),
+    ('stop resets the mode', [('Two', 5), ('Thumb-up', 5), ('Stop', 1), (None, 1), ('One', 5), ('Thumb-up', 5)],
+        [('presentation', 'next'), ('request', THUMB_UP_URL)],
+        [('presentation', 'next'), ('presentation', 'next'), ('request', THUMB_UP_URL), ('request', THUMB_UP_URL)]),
+    ('stop is not a mode', [('Stop', 5), ('Two', 5), ('Rock', 5)],
+        [('presentation', 'exit')],
+        [('presentation', 'exit'), ('presentation', 'exit')]),
+    ('unrouted gestures do nothing', [('Four', 5), ('Go', 5), ('Stop', 1), ('Two', 5), ('Five', 5), ('Go', 3)],
+        [('presentation', 'start')],
+        [('presentation', 'start')]),
+]
+
+def recordingActions(issued):
+    """
+    recordingActions() builds an action registry like ActionBackends.actions()
+    that records what it is asked to do
+
+    :param issued: list the (action, argument) pairs are appended to
+    :return: action registry
+    """
+    return {
+        'request': lambda url: issued.append(('request', url)),
+        'presentation': {command: (lambda command=command: issued.append(('presentation', command)))
+            for command in ['start', 'next', 'previous', 'exit']},
+    }
+
+def replay(router, sequence, commands):
+    """
+    replay() feeds a sequence frame by frame like testing.py's loop
+
+    :param router: CommandRouter
+    :param sequence: [(gesture, seconds)], None = no hand
+    :param commands: CommandState
+    """
+    now = 0.
+    commands.preFrameTime = now
+    for myGesture, seconds in sequence:
+        for _ in range(int(seconds*STREAM_FPS)):
+            now += 1/STREAM_FPS
+            if myGesture is None:
+                if commands.vote is not None:
+                    commands.update(None, now)
+                continue
+            update = commands.update(myGesture, now)
+            if update.command is not None:
+                router.handle(*update.command)
+
+def writeRoutes(path, text):
+    # a new mtime even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    with open(path, 'w') as f:
+        f.write(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def waitFor(condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, 'routes were not reloaded'
+        time.sleep(0.01)
+
+@pytest.fixture
+def routesPath(tmp_path):
+    path = str(tmp_path/'routes.json')
+    shutil.copy(ROUTES_FILE, path)
+    return path
+
+@pytest.fixture
+def issued():
+    return []
+
+@pytest.fixture
+def router(routesPath, issued):
+    router = CommandRouter(recordingActions(issued), routesPath, reloadInterval=0.02, verbose=False)
+    yield router
+    router.stop()
+
+@pytest.mark.parametrize('name, sequence, timerExpected, voteExpected', SEQUENCES, ids=[sequence[0] for sequence in SEQUENCES])
+@pytest.mark.parametrize('vote', [False, True], ids=['timer', 'vote'])
+def test_sequences(router, issued, name, sequence, timerExpected, voteExpected, vote):
+    replay(router, sequence, CommandState(verbose=False, vote=GestureVote() if vote else None))
+    assert issued == (voteExpected if vote else timerExpected)
+
+def test_mode_transitions_prepare_actions(router):
+    prepared = []
+    router.prepare = prepared.append
+    commands = CommandState(verbose=False, vote=GestureVote(), onMode=router.enter)
+    replay(router, [('Two', 1)], commands)
+    assert commands.state == IN_MODE and commands.commandMode == 'Two'
+    assert prepared == [['presentation']]
+    replay(router, [('Two', 1), ('Stop', 1)], commands)
+    assert commands.state == AWAITING_MODE and commands.commandMode == ''
+    replay(router, [('Four', 1)], commands)
+    # a mode without routes has nothing to prepare
+    assert commands.commandMode == 'Four' and prepared == [['presentation']]
+
+def test_counters(router):
+    router.handle('One', 'Go')
+    router.handle('Four', 'Go')
+    counters = router.counters()
+    assert (counters['routed'], counters['unrouted'], counters['modes'], counters['reloads']) == (1, 1, 3, 1)
+
+def test_missing_routes_file(tmp_path, issued):
+    router = CommandRouter(recordingActions(issued), str(tmp_path/'missing.json'), verbose=False)
+    assert not router.handle('One', 'Go') and issued == []
+    assert router.lastError.startswith('no routes file')
+
+def test_hot_reload(router, routesPath, issued):
+    router.start()
+    with open(routesPath, 'r') as f:
+        config = json.load(f)
+    config['modes']['Two']['routes']['Go'] = {'action': 'presentation', 'argument': 'next'}
+    writeRoutes(routesPath, json.dumps(config))
+    waitFor(lambda: router.counts['reloads'] == 2)
+    router.handle('Two', 'Go')
+    assert issued == [('presentation', 'next')]
+
+@pytest.mark.parametrize('text', [
+    '{"modes": ',
+    json.dumps({'modes': {'Two': {'routes': {'Go': {'action': 'shell'}}}}}),
+    json.dumps({'modes': {'Two': {'routes': {'Go': {'action': ['presentation']}}}}}),
+    json.dumps({'modes': {'Two': {'routes': {'Go': {'action': 'presentation', 'argument': ['start']}}}}}),
+    json.dumps({'modes': {'Two': {'routes': ['Go']}}}),
+    json.dumps(['modes']),
+], ids=['not json', 'unknown action', 'list action', 'list argument', 'list routes', 'list config'])
+def test_bad_reload_keeps_routes(router, routesPath, issued, text):
+    router.start()
+    writeRoutes(routesPath, text)
+    waitFor(lambda: router.counts['reload_errors'] == 1)
+    router.handle('Two', 'Go')
+    assert issued == [('presentation', 'start')]
+    # the watcher is still running and picks up the next good file
+    writeRoutes(routesPath, json.dumps({'modes': {'Two': {'routes': {'Go': {'action': 'presentation', 'argument': 'exit'}}}}}))
+    waitFor(lambda: router.counts['reloads'] == 2)
+    router.handle('Two', 'Go')
+    assert issued == [('presentation', 'start'), ('presentation', 'exit')]
+    assert router.lastError is None
+
+def test_compile_routes_uses():
+    with open(ROUTES_FILE, 'r') as f:
+        table, names, uses = compileRoutes(json.load(f), recordingActions([]))
+    assert names == {'One': 'Smart Home', 'Two': 'Presentation', 'Three': 'Music'}
+    assert uses == {'One': {'request'}, 'Two': {'presentation'}, 'Three': {'request'}}
+    assert len(table) == 13
+
+def test_issued_at_reaches_action(routesPath):
+    issued = []
+    actions = {'request': lambda url, issuedAt=None: issued.append((url, issuedAt)), 'presentation': {}}
+    router = CommandRouter(actions, routesPath, verbose=False)
+    with open(routesPath, 'r') as f:
+        config = json.load(f)
+    del config['modes']['Two']
+    router.routes = compileRoutes(config, actions)
+    router.handle('One', 'Go', issuedAt=12.5)
+    router.handle('One', 'Go')
+    assert issued == [('', 12.5), ('', None)]
+
+def test_issued_at_skips_fixed_argument_actions(router, issued):
+    router.handle('Two', 'Go', issuedAt=12.5)
+    assert issued == [('presentation', 'start')]
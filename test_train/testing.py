@@ -5,18 +5,31 @@
 # version = 1.0
 # ---------------------------------------------------------------------------
 
-import socket
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import queue
 import ssl
 from threading import Event
 import time
 import cv2
-import mediapipe as mp
-import numpy as np
-import csv
-from urllib.request import urlopen
-import requests
-import re
-import win32com.client
+from features import handNodeDistances
+from pipeline import RecognitionPipeline
+from connection import openURL
+from replay import CaptureStream, StreamRecorder
+from preprocess import FramePreprocessor
+from roi import ROITracker
+from scheduler import InferenceScheduler
+from presence import PresenceGate
+from matcher import GestureMatcher
+from library import LIBRARY_PATH, LibraryWriter, openLibrary
+from enrollment import GestureEnroller
+from commands import CommandState
+from router import CommandRouter
+from actions import ActionBackends
+from smoothing import GestureVote, LandmarkFilter
+from dynamics import DYNAMIC_LIBRARY_PATH, DynamicRecognizer, loadTemplates
+from metrics import Metrics, MetricsServer
+from headless import ControlChannel, PreviewWriter, extractLandmarks, landmarkBuffer
 
 # url for live video liveStream
 ## input your livestream url here
@@ -25,6 +38,12 @@ url = "http://192.168.999.999"
 # set buffer size
 CAMERA_BUFFER_SIZE=4096
 
+# tee the raw live stream into this capture file (None = off)
+RECORD_PATH=None
+
+# read a recorded capture at recorded speed instead of the live stream (None = live)
+REPLAY_PATH=None
+
 # image size
 WIDTH=1280
 HEIGHT=720
@@ -35,127 +54,369 @@ handNodes=[0,4,5,9,13,17,8,12,16,20]
 # level of error for prediction
 errorTolerance=20
 
-# start presentation example
-app = win32com.client.Dispatch("PowerPoint.Application")
-presentation = app.Presentations.Open(FileName=u'C:\\Users\\$USERNAME\\Downloads\\$NAME_OF_PRESENTATION.pptx', ReadOnly=1)
+# matcher index backend ('early' abandons templates once they cannot win, pays off for large libraries)
+MATCHER_BACKEND='brute'
+
+# image MediaPipe is fed (width, height), smaller is faster as long as hands are still found
+MODEL_INPUT_SIZE=(480,640)
+
+# let libjpeg decode large frames at 1/2, 1/4 or 1/8 size when that still covers MODEL_INPUT_SIZE
+REDUCED_DECODE=True
+
+# One-Euro filter on the landmarks before matching (steadier matches on a still hand)
+SMOOTH_LANDMARKS=True
+
+# act on a gesture as soon as most recent frames agree on it instead of after the HOLD_TIME timer
+VOTE_COMMANDS=True
+
+# spot motion gestures (swipes) recorded in the dynamic library
+MOTION_GESTURES=True
+
+# run MediaPipe on a crop around the previous frame's hand
+ROI_TRACKING=True
+
+# skip inference while no hand is in view or the gesture is held still
+ADAPTIVE_INFERENCE=True
+
+# skip MediaPipe while no hand was tracked and the scene is static
+PRESENCE_GATE=True
+
+# fraction of the scene that has to move to wake MediaPipe up (lower = more sensitive)
+PRESENCE_MOTION_AREA=0.01
+
+# take "enroll <name>" on stdin to add the gesture being shown to the running matcher (saved to the library)
+ONLINE_ENROLLMENT=True
+
+# no window: skip drawing, flipping and the colour round-trip, take commands on stdin
+HEADLESS=False
+
+# in headless mode, write a low-rate annotated preview to this JPEG (None = off)
+PREVIEW_PATH=None
+
+# seconds between pipeline FPS / queue depth reports
+STATS_INTERVAL=10
+
+# time the recognition loop (off = functions are left undecorated)
+METRICS_ENABLED=True
+
+# serve /metrics (Prometheus) and /metrics.json on this port (None = off)
+METRICS_PORT=None
+
+# write a JSON snapshot of the metrics every STATS_INTERVAL (None = off)
+METRICS_JSON=None
+
+# build the MediaPipe model while the library loads and the stream connects (off = one after the other)
+OVERLAP_STARTUP=True
+
+# timers and counters of the recognition loop
+metrics = Metrics(METRICS_ENABLED)
+
+# hand node styles (built once with the model instead of every frame)
+LANDMARK_SPEC = None
+CONNECTION_SPEC = None
 
 def main():
     """
     main() controls testing flow of gesture recognition and system interaction 
     by connecting to the live stream and matching user gestures to known ones
     """ 
-    mp_drawing, mp_hands = mediapipeDeclaration()
-    commandMode = ''
-    attempt = 1
-
-    with mp_hands.Hands(
-        model_complexity=0,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5) as hands:
-
-        # before getting first frame
-        preFrameTime = time.time()
-
-        liveStream = connectToStream()
+    startTime = time.perf_counter()
+    # seconds each startup step took, printed with the first frame
+    startup = {}
+
+    # MediaPipe is imported and the model built on its own thread
+    modelLoader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-loader')
+    model = modelLoader.submit(loadModel, startup)
+    if not OVERLAP_STARTUP:
+        model.result()
+
+    # action backends are only imported once a mode that uses them is entered
+    backends = ActionBackends()
+
+    # (command mode, gesture) -> action, reloaded when routes.json changes
+    router = CommandRouter(backends.actions(), prepare=backends.prepare).start()
+    handleGesture = metrics.timed('handle_gesture')(router.handle)
+
+    # stream reading and inference run on their own threads (LIVE), the
+    # inference thread waits for the recognizer set up below
+    recognizer = Future()
+    pipeline = RecognitionPipeline(connectToStream, lambda jpg: recognizer.result()(jpg), CAMERA_BUFFER_SIZE)
+    if OVERLAP_STARTUP:
+        pipeline.start()
+    writer = preview = metricsServer = None
+
+    try:
+        # landmark jitter filter, kept across frames of this stream
+        smoother = LandmarkFilter() if SMOOTH_LANDMARKS else None
 
         # gesture data arrays
-        knownGestures = loadKnownGestures()
-        gestNames = loadKnownGesturesNames()
-
-        # bit sequence to hold JPG data as it comes from stream (LIVE)
-        bitSequence=b''
+        libraryStart = time.perf_counter()
+        library = loadKnownGestures()
+        matcher = GestureMatcher.fromFeatures(library.features, library.gestureNames(), handNodes, errorTolerance, MATCHER_BACKEND)
+        motion = loadMotionGestures() if MOTION_GESTURES else None
+        startup['library_s'] = round(time.perf_counter() - libraryStart, 3)
+
+        # command mode state (timer starts before getting first frame), swipes are accepted as soon as they are spotted
+        commands = CommandState(vote=GestureVote() if VOTE_COMMANDS else None, onMode=router.enter,
+            motionGestures=motion.templates.labelNames if motion is not None else ())
+
+        # new gestures go into the running matcher, the library is saved in the background
+        writer = LibraryWriter(LIBRARY_PATH, library).start() if ONLINE_ENROLLMENT else None
+        enroller = GestureEnroller(matcher, writer) if ONLINE_ENROLLMENT else None
+
+        # decode, resize, rotate and colour conversion into reused buffers
+        preprocessor = FramePreprocessor(MODEL_INPUT_SIZE, reducedDecode=REDUCED_DECODE)
+
+        # only look around the previous frame's hand when ROI tracking is on
+        tracker = ROITracker() if ROI_TRACKING else None
+
+        # back to full rate before the held gesture is accepted
+        scheduler = InferenceScheduler(commands.deadline) if ADAPTIVE_INFERENCE else None
+
+        # cheap 1/8 size frame differencing in front of MediaPipe
+        gate = PresenceGate(motionArea=PRESENCE_MOTION_AREA) if PRESENCE_GATE else None
+
+        # headless runs take keyboard commands on stdin instead of the window (enrollment does in both)
+        control = ControlChannel().start() if HEADLESS or ONLINE_ENROLLMENT else None
+
+        mp_drawing, mp_hands, hands = model.result()
+        if HEADLESS and PREVIEW_PATH is not None:
+            preview = PreviewWriter(PREVIEW_PATH,
+                lambda image, handResults: drawHands(handResults, mp_drawing, image, mp_hands)).start()
+
+        if HEADLESS:
+            # landmarks of every frame land in the same array
+            myHand = landmarkBuffer()
+            recognizer.set_result(lambda jpg: recognizeHeadless(jpg, hands, matcher, myHand, preprocessor, tracker, scheduler, preview, motion, gate, smoother, enroller))
+        else:
+            recognizer.set_result(lambda jpg: recognizeFrame(jpg, hands, mp_drawing, mp_hands, matcher, preprocessor, tracker, scheduler, motion, gate, smoother, enroller))
+        if not OVERLAP_STARTUP:
+            pipeline.start()
+        statsTime = time.time()
+
+        # frame drops, reconnects and the rest are read when metrics are exported
+        metrics.collect('pipeline', pipeline.counters)
+        metrics.collect('actions', backends.counters)
+        metrics.collect('routes', router.counters)
+        metrics.collect('preprocess', preprocessor.counters)
+        metrics.collect('startup', lambda: dict(startup))
+        if tracker is not None:
+            metrics.collect('roi', tracker.counters)
+        if scheduler is not None:
+            metrics.collect('scheduler', scheduler.counters)
+        if gate is not None:
+            metrics.collect('presence', gate.counters)
+        if motion is not None:
+            metrics.collect('motion', motion.counters)
+        if enroller is not None:
+            metrics.collect('enrollment', enroller.counters)
+            metrics.collect('library_writer', writer.counters)
+        if hasattr(matcher.index, 'counters'):
+            metrics.collect('matcher', matcher.index.counters)
+        metricsServer = MetricsServer(metrics, METRICS_PORT).start() if METRICS_PORT else None
 
         while True:
+            if control is not None:
+                command = control.poll()
+                if command == 'quit':
+                    break
+                if command == 'reset':
+                    commands.reset()
+                if command == 'stats':
+                    statsTime = 0
+                if command == 'enroll':
+                    if enroller is not None:
+                        enroller.capture(control.argument)
+                    else:
+                        print('Online enrollment is off (ONLINE_ENROLLMENT).')
             try:
-                # begin decoding the JPGs in stream
-                myHands=[]
-                bitSequence+=liveStream.read(CAMERA_BUFFER_SIZE)
-                jpgHead=bitSequence.find(b'\xff\xd8')
-                jpgEnd=bitSequence.find(b'\xff\xd9')
-                # check if non-corrupted JPG (full data)
-                if isValidJPEG(jpgHead, jpgEnd):
-                    jpg=bitSequence[jpgHead:jpgEnd+2]
-                    bitSequence=bitSequence[jpgEnd+2:]
-
-                    # fully formed image ready to apply Mediapipe algorithm on
-                    image, handResults = imageSetup(jpg, hands)
-
-                    # check amount of landmarks
-                    if handResults.multi_hand_landmarks:
-                        # set nodes onto hand
-                        myHand, orientation = setLandmarks(handResults, mp_drawing, image, mp_hands)
-                        # extract data
-                        ## code to get left or right hand (discriminate against left or right gestures)
-                        # leftOrRight = orientation.multi_handedness[0].classification[0].label
-                        myHands.append(myHand)
-
-                        # track time that passed            
-                        elapsedTime = time.time() - preFrameTime
-                        # check if hand data points exist
-                        if myHands!=[]:
-                            if attempt == 1:
-                                unknownGesture=findDistances(myHands[0])
-                                myGesture=matchGesture(unknownGesture,knownGestures,handNodes,gestNames,errorTolerance)
-                                if elapsedTime > 4:
-                                    # track time from start of when command is sent
-                                    preFrameTime = time.time()
-                                    if(myGesture == 'Unknown'):
-                                        attempt = 1
-                                        commandMode = ''
-                                    else:
-                                        commandMode += myGesture
-                                        print('COMMAND MODE = ' + commandMode)
-                                        attempt += 1
-                            else:
-                                unknownGesture=findDistances(myHands[0])
-                                myGesture=matchGesture(unknownGesture,knownGestures,handNodes,gestNames,errorTolerance)
-                                if(myGesture == 'Unknown'):
-                                    print('Re-enter gesture!')
-                                else:
-                                    if(checkForReset(myGesture)):
-                                        attempt = 1
-                                        commandMode = ''
-                                    cv2.putText(image,myGesture,(100,100),cv2.FONT_HERSHEY_SIMPLEX,1.5,(255,0,0),8)
-                                    if elapsedTime > 4:
-                                        # track time from start of when command is sent
-                                        preFrameTime = time.time()
-                                        # issue command to system/Alexa
-                                        handleGesture(commandMode, myGesture)
-                    # Flip the img horizontally for a selfie-view display.
-                    cv2.imshow('MediaPipe Hands', cv2.flip(image, 1))
-                    if cv2.waitKey(5) & 0xFF == 27:
-                        break
-            # error handling for live stream
-            except socket.timeout as error:        
-                print("Error: timeout error encountered.")
-                return main()
-            except OSError as error:
-                print("Error: check connection to live stream.")
-                return main()
-
-def checkForReset(myGesture):
-    if(myGesture == 'Stop'):
-        print("Resetting system...issue new command mode in 4 seconds")
-        return True
+                image, myGesture = pipeline.getResult(timeout=1)
+            except queue.Empty:
+                continue
+            if 'first_frame_s' not in startup:
+                startup['first_frame_s'] = round(time.perf_counter() - startTime, 3)
+                startup['stream_s'] = pipeline.counters()['time_to_first_frame_ms']/1e3
+                print('Startup: ' + str(startup))
+
+            # check if a hand was recognized in the frame
+            if myGesture is not None:
+                update = commands.update(myGesture)
+                if update.label is not None and image is not None:
+                    cv2.putText(image,update.label,(100,100),cv2.FONT_HERSHEY_SIMPLEX,1.5,(255,0,0),8)
+                if update.command is not None:
+                    # issue command to system/Alexa, action latency counts from the frame the gesture was seen in
+                    handleGesture(*update.command, issuedAt=pipeline.resultCapturedAt)
+            elif commands.vote is not None:
+                # lets the vote see the hand go away, so showing the same gesture again counts
+                commands.update(None)
+            if not HEADLESS:
+                # Flip the img horizontally for a selfie-view display.
+                cv2.imshow('MediaPipe Hands', cv2.flip(image, 1))
+                if cv2.waitKey(5) & 0xFF == 27:
+                    break
+            if time.time() - statsTime > STATS_INTERVAL:
+                statsTime = time.time()
+                print('Pipeline: ' + str(pipeline.counters()))
+                if tracker is not None:
+                    print('ROI: ' + str(tracker.counters()))
+                if scheduler is not None:
+                    print('Scheduler: ' + str(scheduler.counters()))
+                if gate is not None:
+                    print('Presence: ' + str(gate.counters()))
+                print('Preprocess: ' + str(preprocessor.counters()))
+                print('Actions: ' + str(backends.counters()))
+                print('Routes: ' + str(router.counters()))
+                if enroller is not None:
+                    print('Enrollment: ' + str(enroller.counters()) + ' ' + str(writer.counters()))
+                if METRICS_JSON is not None:
+                    metrics.dump(METRICS_JSON)
+    finally:
+        pipeline.stop()
+        # an inference thread still waiting for the recognizer gives up
+        recognizer.cancel()
+        router.stop()
+        backends.close()
+        if writer is not None:
+            writer.stop()
+        if preview is not None:
+            preview.stop()
+        if metricsServer is not None:
+            metricsServer.stop()
+        modelLoader.shutdown(wait=False)
+        if model.done() and model.exception() is None:
+            model.result()[2].close()
+
+@metrics.timed('inference')
+def recognizeFrame(jpg, hands, mp_drawing, mp_hands, matcher, preprocessor, tracker=None, scheduler=None, motion=None, gate=None, smoother=None, enroller=None):
+    """
+    recognizeFrame() decodes a JPG, finds the hand and matches its gesture
+    (runs on the pipeline's inference thread)
+
+    :param jpg: JPEG image
+    :param hands: hands data
+    :param mp_drawing: mediapipe hand node (on open cv tab)
+    :param mp_hands: hands from mediapipe recognition
+    :param matcher: GestureMatcher holding the gestures that were already trained
+    :param preprocessor: FramePreprocessor
+    :param tracker: ROITracker (optional)
+    :param scheduler: InferenceScheduler deciding which frames to skip (optional)
+    :param motion: DynamicRecognizer spotting motion gestures (optional)
+    :param gate: PresenceGate skipping empty, static scenes (optional)
+    :param smoother: LandmarkFilter smoothing landmarks between frames (optional)
+    :param enroller: GestureEnroller recording landmarks for a new gesture (optional)
+    :return: image, gesture (None when no hand was found), None when the frame was skipped
+    """
+    # skipped frames are not even decoded, the window keeps the last image
+    if scheduler is not None and not scheduler.shouldRun(time.time()):
+        return None
+    if gate is not None and not gate.shouldRun(jpg, time.time()):
+        return None
+
+    # fully formed image ready to apply Mediapipe algorithm on
+    image, handResults = imageSetup(jpg, hands, preprocessor, tracker)
+
+    # check amount of landmarks
+    if not handResults.multi_hand_landmarks:
+        metrics.increment('frames_without_hand')
+        if scheduler is not None:
+            scheduler.record(None, None)
+        if gate is not None:
+            gate.record(False)
+        if smoother is not None:
+            smoother.reset()
+        if motion is not None:
+            motion.update(None, None, time.time())
+        return image, None
+    # set nodes onto hand
+    myHand, orientation = setLandmarks(handResults, mp_drawing, image, mp_hands)
+    if smoother is not None:
+        myHand = smoother.filter(myHand, time.time())
+    if enroller is not None:
+        enroller.observe(myHand)
+    ## code to get left or right hand (discriminate against left or right gestures)
+    # leftOrRight = orientation.multi_handedness[0].classification[0].label
+    unknownGesture=findDistances(myHand)
+    myGesture=matchGesture(unknownGesture,matcher)
+    myGesture=matchMotion(myHand, unknownGesture, myGesture, motion)
+    if scheduler is not None:
+        scheduler.record(myHand, myGesture)
+    if gate is not None:
+        gate.record(True)
+    return image, myGesture
+
+@metrics.timed('inference')
+def recognizeHeadless(jpg, hands, matcher, myHand, preprocessor, tracker=None, scheduler=None, preview=None, motion=None, gate=None, smoother=None, enroller=None):
+    """
+    recognizeHeadless() finds the hand and matches its gesture without
+    preparing anything for display (runs on the pipeline's inference thread)
+
+    :param jpg: JPEG image
+    :param hands: hands data
+    :param matcher: GestureMatcher holding the gestures that were already trained
+    :param myHand: preallocated array from landmarkBuffer() landmarks go into
+    :param preprocessor: FramePreprocessor
+    :param tracker: ROITracker (optional)
+    :param scheduler: InferenceScheduler deciding which frames to skip (optional)
+    :param preview: PreviewWriter for debugging visuals (optional)
+    :param motion: DynamicRecognizer spotting motion gestures (optional)
+    :param gate: PresenceGate skipping empty, static scenes (optional)
+    :param smoother: LandmarkFilter smoothing landmarks between frames (optional)
+    :param enroller: GestureEnroller recording landmarks for a new gesture (optional)
+    :return: None, gesture (None when no hand was found), None when the frame was skipped
+    """
+    if scheduler is not None and not scheduler.shouldRun(time.time()):
+        return None
+    if gate is not None and not gate.shouldRun(jpg, time.time()):
+        return None
+
+    # nothing is displayed, so the BGR image only matters to the tracker and preview
+    image, rgbImage = preprocessor.process(jpg, rgb=tracker is None)
+    if tracker is not None:
+        handResults = tracker.process(hands, image)
     else:
-        return False
+        handResults = hands.process(rgbImage)
+    if preview is not None:
+        preview.offer(image, handResults, False)
+
+    if not handResults.multi_hand_landmarks:
+        metrics.increment('frames_without_hand')
+        if scheduler is not None:
+            scheduler.record(None, None)
+        if gate is not None:
+            gate.record(False)
+        if smoother is not None:
+            smoother.reset()
+        if motion is not None:
+            motion.update(None, None, time.time())
+        return None, None
+    extractLandmarks(handResults, myHand, WIDTH, HEIGHT)
+    if smoother is not None:
+        myHand = smoother.filter(myHand, time.time())
+    if enroller is not None:
+        enroller.observe(myHand)
+    unknownGesture=findDistances(myHand)
+    myGesture=matchGesture(unknownGesture,matcher)
+    myGesture=matchMotion(myHand, unknownGesture, myGesture, motion)
+    if scheduler is not None:
+        scheduler.record(myHand, myGesture)
+    if gate is not None:
+        gate.record(True)
+    return None, myGesture
 
 def connectToStream():
     """
     connectToStream() establishes the connection between the live stream
-    and the python script, ongoing attempt until connection is established
+    and the python script (the pipeline's ConnectionManager retries with
+    backoff when it raises)
 
     :return: live stream data
     """ 
-    while True:
-        try:
-            ctx = ctxDefinition()
-            liveStream = urlopen(url, context=ctx, timeout=2)
-            return liveStream    
-        except socket.timeout as error:
-            print("Error: timeout error encountered.")
-        except OSError as error:
-            print("Error: check connection to live stream.")
+    if REPLAY_PATH is not None:
+        return CaptureStream(REPLAY_PATH)
+    liveStream = openURL(url, ctxDefinition())
+    if RECORD_PATH is not None:
+        return StreamRecorder(liveStream, RECORD_PATH)
+    return liveStream
 
 def ctxDefinition():
     """
@@ -175,134 +436,77 @@ def mediapipeDeclaration():
 
     :return: mp.solutions.drawing_utils, mp.solutions.hands (mediapipe solution tools)
     """ 
+    # imported on first use, it takes most of a second
+    import mediapipe as mp
     return mp.solutions.drawing_utils, mp.solutions.hands
 
+def loadModel(startup=None):
+    """
+    loadModel() imports MediaPipe and builds the hand model (runs on its own
+    thread while the library loads and the stream connects)
 
-def loadKnownGestures():
+    :param startup: dict the seconds it took are recorded in (optional)
+    :return: mp_drawing, mp_hands, hands
     """
-    loadKnownGestures() load gesture data in 
+    global LANDMARK_SPEC, CONNECTION_SPEC
+    start = time.perf_counter()
+    mp_drawing, mp_hands = mediapipeDeclaration()
+    LANDMARK_SPEC = mp_drawing.DrawingSpec(color=(0, 22, 200), thickness=2, circle_radius=4)
+    CONNECTION_SPEC = mp_drawing.DrawingSpec(color=(200, 50, 0), thickness=2, circle_radius=4)
+    hands = mp_hands.Hands(
+        model_complexity=0,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5)
+    hands.process = metrics.timed('hands_process')(hands.process)
+    if startup is not None:
+        startup['model_s'] = round(time.perf_counter() - start, 3)
+    return mp_drawing, mp_hands, hands
 
-    :return: knownGestures
-    """ 
-    knownGestures = []
-    with open('./aggregate_gesture_data/gesture_data.csv', 'r', newline='') as f:
-        reader = csv.reader(f)
-        examples = list(reader)  
-
-    for i in range(0, len(examples)):
-        handData = [tuple(map(int, re.findall('\d+', string[1:-1]))) for string in examples[i]]
-        knownGesture=findDistances(handData)
-        knownGestures.append(knownGesture)
-    return knownGestures
-
-def loadKnownGesturesNames():
+
+def loadKnownGestures():
     """
-    loadKnownGesturesNames() load gesture names in
+    loadKnownGestures() load gesture library in (memory-mapped binary bundle,
+    converted from the CSV gesture data when that is newer; read into memory
+    with ONLINE_ENROLLMENT, since saving replaces the bundle)
 
-    :return: gestNames
+    :return: library (features and gesture names of every template)
     """ 
-    gestNames = []
-    with open("./aggregate_gesture_data/gesture_names.csv", newline='') as f:
-        data = list(csv.reader(f))
-        for name in data[0]:
-            gestNames.append(name)
-    return gestNames
-
-def handleGesture(commandMode, myGesture):
+    return openLibrary(handNodes, mmap=not ONLINE_ENROLLMENT)
+
+def loadMotionGestures():
     """
-    handleGesture() take recognized gesture and match to functionality
+    loadMotionGestures() loads the recorded motion gesture clips
 
-    :param jpg: JPEG image
-    :return: gestNames
+    :return: DynamicRecognizer, None when no motion gestures were trained
     """ 
-    if(commandMode == 'Unknown'):
-        print('Invalid command-mode, please try again.')
-    if(myGesture == 'Unknown'):
-        print('Invalid gesture, please try again.')
-
-    # smart home mode
-    if(commandMode == 'One'):
-        print('-----------------Smart Home Mode-----------------')
-        if(myGesture == 'Thumb-up'):
-            url = 'https://api.voicemonkey.io/trigger?access_token=$ACCESS_TOKEN'
-            process_request(url)
-        if(myGesture == 'Thumb-down'):
-            url = ''
-            process_request(url)
-        if(myGesture == 'Go'):
-            url = ''
-            process_request(url)
-        if(myGesture == 'Rock'):
-            url = ''
-            process_request(url)
-
-    # presentation mode
-    if(commandMode == 'Two'):
-        print('-----------------Presentation Mode-----------------')
-        if(myGesture == 'Go'):
-            presentation.SlideShowSettings.Run()
-        if(myGesture == 'Thumb-up'):
-            presentation.SlideShowWindow.View.Next()
-        if(myGesture == 'Thumb-down'):
-            presentation.SlideShowWindow.View.Previous()
-        if(myGesture == 'Rock'):
-            presentation.SlideShowWindow.View.Exit()
-            app.Quit()
-    
-    # music mode
-    if(commandMode == 'Three'):
-        print('-----------------Music Mode-----------------')
-        if(myGesture == 'One'):
-            url = ''
-            process_request(url)
-        if(myGesture == 'Rock'):
-            url = ''
-            process_request(url)
-        if(myGesture == 'Go'):
-            url = ''
-            process_request(url)
-        if(myGesture == 'Thumb-up'):
-            url = ''
-            process_request(url)
-        if(myGesture == 'Thumb-down'):
-            url = ''
-            process_request(url)
-
-    print('Gesture issued: ' + myGesture)
-
-def imageSetup(jpg, hands):
+    if not os.path.exists(DYNAMIC_LIBRARY_PATH):
+        return None
+    return DynamicRecognizer(loadTemplates(DYNAMIC_LIBRARY_PATH, handNodes))
+
+@metrics.timed('image_setup')
+def imageSetup(jpg, hands, preprocessor, tracker=None):
     """
     imageSetup() take JPG image and apply transformations and filters to display
 
     :param jpg: JPEG image
     :param hands: hands data
-    :return: describe what it returns
+    :param preprocessor: FramePreprocessor (decodes, rotates and resizes into reused buffers)
+    :param tracker: ROITracker to only run MediaPipe around the last hand (optional)
+    :return: BGR image for display, handResults
     """ 
-    image=cv2.imdecode(np.frombuffer(jpg,dtype=np.uint8),cv2.IMREAD_UNCHANGED)
-    image = cv2.rotate(image, cv2.cv2.ROTATE_90_CLOCKWISE)
-    image=cv2.resize(image,(480,640))
-
-    image.flags.writeable = False
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    handResults = hands.process(image)
-
-    image.flags.writeable = True
-    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    if tracker is not None:
+        # tracker converts only the region it crops, image stays BGR for display
+        image, _ = preprocessor.process(jpg, rgb=False)
+        return image, tracker.process(hands, image)
+
+    # the BGR image is kept for display, so there is no conversion back
+    image, rgbImage = preprocessor.process(jpg)
+    rgbImage.flags.writeable = False
+    handResults = hands.process(rgbImage)
+    rgbImage.flags.writeable = True
     return image, handResults
 
-def isValidJPEG(jpgHead, jpgEnd):
-    """
-    isValidJPEG() checks if JPEG is not corrupt (allowing for stream to progress)
-
-    :param jpgHead: head of JPG file data
-    :param jpgEnd: tail of JPG file data
-    :return: boolean
-    """ 
-    if jpgHead>-1 and jpgEnd>-1:
-        return True
-    else:
-        return False
-
+@metrics.timed('set_landmarks')
 def setLandmarks(handResults, mp_drawing, image, mp_hands):
     """
     setLandmarks() takes hand data and sets landmarks from mediapipe algorithm
@@ -333,136 +537,59 @@ def landmarks(mp_drawing, image, hand_landmarks, mp_hands):
         image,
         hand_landmarks,
         mp_hands.HAND_CONNECTIONS,
-        mp_drawing.DrawingSpec(color=(0, 22, 200), thickness=2, circle_radius=4),
-        mp_drawing.DrawingSpec(color=(200, 50, 0), thickness=2, circle_radius=4))
+        LANDMARK_SPEC,
+        CONNECTION_SPEC)
 
-def findDistances(gestureDataPoints):
+def drawHands(handResults, mp_drawing, image, mp_hands):
     """
-    findDistances() takes gesture capture and calculates distances between
-    hand nodes (palm and fingers)
-
-    :param gestureDataPoints: distance between handNodes
-    :return: distanceMatrix
-    """ 
-    distanceMatrix, lengthOfGestureDataPoints = generateDistanceMatrix(gestureDataPoints)
-    palmSize=generatePalmSize(gestureDataPoints)
-    distanceMatrix = populateDistanceMatrix(gestureDataPoints, lengthOfGestureDataPoints, palmSize, distanceMatrix)
-    return distanceMatrix
-
-def generateDistanceMatrix(gestureDataPoints):
-    """
-    generateDistanceMatrix() creates an empty numpy array given of data points
-
-    :param gestureDataPoints: distance between handNodes
-    :return: distanceMatrix, lengthOfGestureDataPoints
-    """ 
-    lengthOfGestureDataPoints = len(gestureDataPoints)
-    distanceMatrix = np.zeros([lengthOfGestureDataPoints, lengthOfGestureDataPoints],dtype='float')
-    return distanceMatrix, lengthOfGestureDataPoints
+    drawHands() sets the nodes on every recognized hand (headless preview)
 
-def generatePalmSize(gestureDataPoints):
+    :param handResults: hand data from mediapipe
+    :param mp_drawing: mediapipe hand node (on open cv tab)
+    :param image: openCV image
+    :param mp_hands: hands from mediapipe recognition
     """
-    generatePalmSize() calculates size of palm given node data
-
-    :param gestureDataPoints: distance between handNodes
-    :return: palmSize
-    """ 
-    palmSize=((gestureDataPoints[0][0]-gestureDataPoints[9][0])**2+(gestureDataPoints[0][1]-gestureDataPoints[9][1])**2)**(1./2.)
-    return palmSize
+    for hand_landmarks in handResults.multi_hand_landmarks:
+        landmarks(mp_drawing, image, hand_landmarks, mp_hands)
 
-def populateDistanceMatrix(gestureDataPoints, lengthOfGestureDataPoints, palmSize, distanceMatrix):
+@metrics.timed('find_distances')
+def findDistances(gestureDataPoints):
     """
-    populateDistanceMatrix() matches data to matrix points from gesture hand nodes
+    findDistances() takes gesture capture and calculates distances between
+    hand nodes (palm and fingers)
 
     :param gestureDataPoints: distance between handNodes
-    :param lengthOfGestureDataPoints: number of data points
-    :param palmSize: computed palm size
-    :param distanceMatrix: empty matrix
-    :return: distanceMatrix
+    :return: handNodes feature vector
     """ 
-    for row in range(0, lengthOfGestureDataPoints):
-        for column in range(0, lengthOfGestureDataPoints):
-            distanceMatrix[row][column]=(((gestureDataPoints[row][0]-gestureDataPoints[column][0])**2+(gestureDataPoints[row][1]-gestureDataPoints[column][1])**2)**(1./2.))/palmSize
-    return distanceMatrix
+    return handNodeDistances(gestureDataPoints, handNodes)[0]
 
-def matchGesture(unknownGesture,knownGestures,handNodes,gestureNames,errorTolerance):
+@metrics.timed('match_gesture')
+def matchGesture(unknownGesture, matcher):
     """
     matchGesture() takes unknownGesture by user and matches it to known gestures
 
     :param unknownGesture: gesture from user
-    :param knownGestures: gestures that were already trained
-    :param handNodes: key nodes to track
-    :param gestureNames: gesture names that were trained
-    :param errorTolerance: to what error level algorithm should match to
+    :param matcher: GestureMatcher holding the gestures that were already trained
     :return: gesture
     """ 
-    minimumError, gestureErrors = gestureErrorCalculator(unknownGesture,knownGestures,handNodes,gestureNames)
-    minIndex=0
-    for i in range(0, len(gestureErrors)):
-        if gestureErrors[i]<minimumError:
-            minimumError=gestureErrors[i]
-            minIndex=i
-    gesture = gestureWithinTolerance(minimumError, errorTolerance, minIndex, gestureNames)
-    return gesture
-
-def gestureErrorCalculator(unknownGesture,knownGestures,handNodes,gestureNames):
-    """
-    gestureErrorCalculator() calculates errors between known and unknown user gesture
-    (yet to be matched)
+    return matcher.classify(unknownGesture)
 
-    :param unknownGesture: gesture from user
-    :param knownGestures: gestures that were already trained
-    :param handNodes: key nodes to track
-    :param gestureNames: gesture names that were trained
-    :return: minimumError, gestureErrors
-    """ 
-    gestureErrors=[]
-    for i in range(0,len(gestureNames)):
-        error=errorMargin(knownGestures[i],unknownGesture,handNodes)
-        gestureErrors.append(error)
-    minimumError=gestureErrors[0]
-    return minimumError, gestureErrors
-
-def gestureWithinTolerance(minimumError, errorTolerance, minIndex, gestureNames):
+@metrics.timed('match_motion')
+def matchMotion(myHand, unknownGesture, myGesture, motion):
     """
-    gestureWithinTolerance() checks if match is within error margin
+    matchMotion() feeds the hand to the motion recognizer; a motion gesture
+    that was just completed wins over the pose matched in this frame
 
-    :param minimumError: lowest error from known gestures
-    :param errorTolerance: to what error level algorithm should match to
-    :param minIndex: which index (gestureName) matched to
-    :param gestureNames: gesture names that were trained
+    :param myHand: hand landmark positions
+    :param unknownGesture: handNodes feature vector of the hand
+    :param myGesture: gesture matched on this frame alone
+    :param motion: DynamicRecognizer (None when motion gestures are off)
     :return: gesture
     """ 
-    if minimumError<errorTolerance:
-        gesture=gestureNames[minIndex]
-    if minimumError>=errorTolerance:
-        gesture='Unknown'
-    return gesture
+    if motion is None:
+        return myGesture
+    motionGesture = motion.update(myHand, unknownGesture, time.time())
+    return myGesture if motionGesture is None else motionGesture
 
-def errorMargin(gestureMatrix, userMatrix, handNodes):
-    """
-    errorMargin() calculates error rate between known gesture and unknown user gesture
-
-    :param gestureMatrix: gestures already known
-    :param userMatrix: gesture data from user
-    :param handNodes: key nodes to track
-    :return: currError
-    """ 
-    currError=0
-    for row in handNodes:
-        for column in handNodes:
-            difference = abs(gestureMatrix[row][column]-userMatrix[row][column])
-            currError += difference
-    return currError
-
-
-def process_request(url):
-    """
-    process_request() makes an API call to Alexa's services/systems
-
-    :param url: VoiceMonkey API url call
-    """ 
-    requests.get(url)
-    
 if __name__ == "__main__":
    result = main()
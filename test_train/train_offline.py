@@ -0,0 +1,316 @@
+#----------------------------------------------------------------------------
+# train_offline.py - augment recorded gestures and prune them to a compact gesture library
+# Created By  : Rakan AlZagha
+# Created Date: Fall '26
+# version = 1.0
+# ---------------------------------------------------------------------------
+
+import argparse
+import os
+import time
+import numpy as np
+from features import handNodeDistances
+from library import GESTURE_DATA, GESTURE_NAMES, HAND_NODES, LIBRARY_PATH, loadLibrary, readCSV, saveLibrary
+from matcher import GestureMatcher
+
+# level of error for prediction (same as testing.py)
+errorTolerance=20
+
+# augmented copies made of every recorded template
+AUGMENT_COPIES=20
+
+# out-of-plane tilt of the hand in radians (foreshortens it along a random axis)
+TILT_SIGMA=0.25
+
+# hand scale before rounding to pixels (small hands lose precision like distant ones do)
+SCALE_RANGE=(0.6,1.2)
+
+# landmark jitter in pixels (MediaPipe noise and finger pose variation)
+JITTER=4.
+
+# representative templates kept per gesture
+MEDOIDS=5
+
+# medoid counts compared by --sweep
+SWEEP_MEDOIDS=[1, 2, 3, 5, 10, 20]
+
+# share of each gesture's recordings held out to measure accuracy
+HOLDOUT=0.2
+
+# noisy copies of every held-out recording matched during evaluation
+TEST_COPIES=20
+
+# noise model of those copies, independent of augmentHands() so it does not favour augmented libraries
+## TEST_STRETCH: standard deviation of the stretch along x and y (camera perspective, hand proportions)
+## TEST_SHEAR: standard deviation of the shear (hand seen from the side)
+## TEST_JITTER: scale of the heavy-tailed (Laplace) landmark noise in pixels
+TEST_STRETCH=0.08
+TEST_SHEAR=0.1
+TEST_JITTER=3.
+
+# most templates per gesture the medoid search looks at (pairwise distances grow quadratically)
+MAX_CANDIDATES=2000
+
+def main():
+    """
+    main() reads recorded landmarks (CSV gesture data and/or library bundles),
+    augments them, keeps MEDOIDS representative templates per gesture and
+    writes the result as the gesture library, reporting the size/accuracy
+    trade-off against the raw recordings on held-out recordings (as recorded
+    and with independent noise)
+    """
+    parser = argparse.ArgumentParser(description='Augment recorded gestures and prune them to a compact gesture library.')
+    parser.add_argument('--data', default=GESTURE_DATA, help='CSV of landmark tuples ("" to skip)')
+    parser.add_argument('--names', default=GESTURE_NAMES)
+    parser.add_argument('--bundle', action='append', default=[], help='library bundle of recorded landmarks (repeatable)')
+    parser.add_argument('--output', default=LIBRARY_PATH)
+    parser.add_argument('--copies', type=int, default=AUGMENT_COPIES)
+    parser.add_argument('--medoids', type=int, default=MEDOIDS, help='templates kept per gesture')
+    parser.add_argument('--sweep', action='store_true', help='report accuracy for every count in SWEEP_MEDOIDS')
+    parser.add_argument('--dry-run', dest='dryRun', action='store_true', help='only report, do not write the library')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    hands, names = readRecordings(args.data, args.names, args.bundle)
+    rng = np.random.default_rng(args.seed)
+    print('{} recordings of {} gestures'.format(len(hands), len(set(names))))
+
+    train, test = splitRecordings(names, HOLDOUT, rng)
+    # held-out recordings as recorded, and noisy copies made with a different model than the augmentation
+    heldOut = (hands[test], [names[i] for i in test])
+    noisy = perturbed(hands[test], heldOut[1], TEST_COPIES, rng)
+    trainNames = [names[i] for i in train]
+    counts = SWEEP_MEDOIDS if args.sweep else [args.medoids]
+
+    print('\n{:<20} {:>10} {:>10} {:>10} {:>10} {:>10} {:>12}'.format('library', 'templates', 'held-out', 'unknown',
+        'perturbed', 'unknown', 'classify us'))
+    report('raw recordings', hands[train], trainNames, heldOut, noisy)
+    augmented, augmentedNames = augmentRecordings(hands[train], trainNames, args.copies, rng)
+    report('augmented', augmented, augmentedNames, heldOut, noisy)
+    for count in counts:
+        kept, keptNames = pruneTemplates(augmented, augmentedNames, count, rng)
+        report('{} medoids/gesture'.format(count), kept, keptNames, heldOut, noisy)
+
+    if args.dryRun:
+        return
+    # the written library learns from every recording, held-out ones included
+    augmented, augmentedNames = augmentRecordings(hands, names, args.copies, rng)
+    kept, keptNames = pruneTemplates(augmented, augmentedNames, args.medoids, rng)
+    saveLibrary(args.output, kept, keptNames, HAND_NODES, {'source': 'train_offline', 'recordings': len(hands),
+        'copies': args.copies, 'medoids': args.medoids})
+    print('\nWrote ' + args.output + ' (' + str(len(kept)) + ' templates)')
+
+def readRecordings(dataPath, namesPath, bundles):
+    """
+    readRecordings() collects recorded hands from CSV gesture data and
+    library bundles (like the still gesture clips training.py keeps)
+
+    :param dataPath: CSV of landmark tuples ('' or missing to skip)
+    :param namesPath: CSV of gesture names
+    :param bundles: library bundle directories
+    :return: (N, 21, 2) landmarks, gesture name per recording
+    """
+    hands = []
+    names = []
+    if dataPath and os.path.exists(dataPath):
+        handsData, gestNames = readCSV(dataPath, namesPath)
+        hands.append(np.asarray(handsData, dtype=np.float64).reshape(-1, 21, 2))
+        names += gestNames
+    for bundle in bundles:
+        library = loadLibrary(bundle)
+        hands.append(np.asarray(library.landmarks, dtype=np.float64))
+        names += library.gestureNames()
+    if not hands:
+        raise ValueError('no recordings to train on')
+    return np.concatenate(hands), names
+
+def splitRecordings(names, holdout, rng):
+    """
+    splitRecordings() holds out a share of every gesture's recordings
+
+    :param names: gesture name per recording
+    :param holdout: share held out (at least one when a gesture has two or more)
+    :param rng: numpy random generator
+    :return: training indices, held-out indices
+    """
+    names = np.asarray(names)
+    train = []
+    test = []
+    for name in dict.fromkeys(names):
+        indices = rng.permutation(np.flatnonzero(names == name))
+        count = max(1, int(round(holdout*len(indices)))) if len(indices) > 1 else 0
+        test += list(indices[:count])
+        train += list(indices[count:])
+    return np.sort(train), np.sort(test)
+
+def augmentHands(hands, copies, rng, tiltSigma=TILT_SIGMA, scaleRange=SCALE_RANGE, jitter=JITTER):
+    """
+    augmentHands() makes copies of every hand in one batch. Palm-normalized
+    distances do not change under in-plane rotation, uniform scaling or
+    mirroring, so the copies vary what does reach the features: tilt out of
+    the image plane, pixel rounding at smaller hand sizes and landmark noise
+
+    :param hands: (N, 21, 2) landmarks
+    :param copies: copies per hand
+    :param rng: numpy random generator
+    :param tiltSigma: standard deviation of the tilt in radians
+    :param scaleRange: (low, high) hand scale before rounding
+    :param jitter: landmark noise in pixels
+    :return: (N*copies, 21, 2) landmarks, copy i*copies + j comes from hand i
+    """
+    hands = np.asarray(hands, dtype=np.float64)
+    count = len(hands)*copies
+    centred = np.repeat(hands - hands.mean(axis=1, keepdims=True), copies, axis=0)
+    # foreshortening: shrink along a random axis by the cosine of the tilt
+    axes = rng.uniform(0, np.pi, count)
+    direction = np.stack([np.cos(axes), np.sin(axes)], axis=-1)
+    shrink = np.cos(rng.normal(0, tiltSigma, count)) - 1
+    along = np.einsum('nik,nk->ni', centred, direction)
+    tilted = centred + (shrink[:, np.newaxis]*along)[:, :, np.newaxis]*direction[:, np.newaxis, :]
+    scaled = tilted*rng.uniform(scaleRange[0], scaleRange[1], (count, 1, 1))
+    centres = np.repeat(hands.mean(axis=1, keepdims=True), copies, axis=0)
+    return np.rint(scaled + centres + rng.normal(0, jitter, scaled.shape))
+
+def augmentRecordings(hands, names, copies, rng):
+    """
+    augmentRecordings() keeps the recordings and adds their augmented copies
+
+    :param hands: (N, 21, 2) landmarks
+    :param names: gesture name per recording
+    :param copies: augmented copies per recording
+    :param rng: numpy random generator
+    :return: landmarks, gesture name per template
+    """
+    if copies <= 0:
+        return np.asarray(hands, dtype=np.float64), list(names)
+    augmented = augmentHands(hands, copies, rng)
+    return np.concatenate((hands, augmented)), list(names) + [name for name in names for _ in range(copies)]
+
+def perturbed(hands, names, copies, rng, stretch=TEST_STRETCH, shear=TEST_SHEAR, jitter=TEST_JITTER):
+    """
+    perturbed() makes live-like versions of held-out recordings with a noise
+    model of its own (random stretch and shear, Laplace noise), so accuracy
+    on them is not measured with the distortions the augmented library was
+    built from
+
+    :param hands: (N, 21, 2) landmarks
+    :param names: gesture name per recording
+    :param copies: versions per recording
+    :param rng: numpy random generator
+    :param stretch: standard deviation of the stretch along x and y
+    :param shear: standard deviation of the shear
+    :param jitter: scale of the landmark noise in pixels
+    :return: landmarks, gesture name per version
+    """
+    hands = np.asarray(hands, dtype=np.float64)
+    count = len(hands)*copies
+    centres = np.repeat(hands.mean(axis=1, keepdims=True), copies, axis=0)
+    centred = np.repeat(hands, copies, axis=0) - centres
+    transforms = np.zeros((count, 2, 2))
+    transforms[:, 0, 0] = 1 + rng.normal(0, stretch, count)
+    transforms[:, 1, 1] = 1 + rng.normal(0, stretch, count)
+    transforms[:, 0, 1] = rng.normal(0, shear, count)
+    distorted = np.einsum('nij,nkj->nki', transforms, centred)
+    return np.rint(distorted + centres + rng.laplace(0, jitter, distorted.shape)), [name for name in names for _ in range(copies)]
+
+def pairwiseErrors(features):
+    """
+    pairwiseErrors() calculates the L1 distance between every pair of feature
+    vectors, a block of rows at a time
+
+    :param features: (n, D) feature vectors
+    :return: (n, n) distances
+    """
+    distances = np.empty((len(features), len(features)))
+    block = max(1, 2**22//max(1, features.size))
+    for start in range(0, len(features), block):
+        distances[start:start+block] = np.abs(features[start:start+block, np.newaxis] - features[np.newaxis]).sum(axis=2)
+    return distances
+
+def medoids(features, count, iterations=20):
+    """
+    medoids() picks count templates that best represent a gesture: seeded
+    farthest-first from the most central template, then refined by moving
+    every medoid to the member closest to the rest of its cluster
+
+    :param features: (n, D) feature vectors of one gesture
+    :param count: templates to keep
+    :param iterations: refinement rounds at most
+    :return: indices of the kept templates
+    """
+    if len(features) <= count:
+        return np.arange(len(features))
+    distances = pairwiseErrors(features)
+    chosen = [int(np.argmin(distances.sum(axis=1)))]
+    while len(chosen) < count:
+        chosen.append(int(np.argmax(distances[:, chosen].min(axis=1))))
+    chosen = np.array(chosen)
+    for _ in range(iterations):
+        assignment = np.argmin(distances[:, chosen], axis=1)
+        updated = chosen.copy()
+        for cluster in range(count):
+            members = np.flatnonzero(assignment == cluster)
+            if len(members):
+                updated[cluster] = members[np.argmin(distances[np.ix_(members, members)].sum(axis=1))]
+        if np.array_equal(updated, chosen):
+            break
+        chosen = updated
+    return np.unique(chosen)
+
+def pruneTemplates(hands, names, count, rng):
+    """
+    pruneTemplates() keeps count medoids of every gesture
+
+    :param hands: (N, 21, 2) landmarks
+    :param names: gesture name per template
+    :param count: templates kept per gesture
+    :param rng: numpy random generator (subsamples very large gestures)
+    :return: landmarks, gesture name per kept template
+    """
+    features = handNodeDistances(hands, HAND_NODES)
+    names = np.asarray(names)
+    kept = []
+    for name in dict.fromkeys(names):
+        indices = np.flatnonzero(names == name)
+        if len(indices) > MAX_CANDIDATES:
+            indices = np.sort(rng.choice(indices, MAX_CANDIDATES, replace=False))
+        kept += list(indices[medoids(features[indices], count)])
+    return hands[kept], list(names[kept])
+
+def evaluate(hands, names, testHands, testNames):
+    """
+    evaluate() matches held-out hands against a library
+
+    :param hands: (N, 21, 2) library landmarks
+    :param names: gesture name per library template
+    :param testHands: (M, 21, 2) held-out landmarks
+    :param testNames: gesture name per held-out hand
+    :return: accuracy, share matched as 'Unknown', seconds per classify
+    """
+    matcher = GestureMatcher(handNodeDistances(hands, HAND_NODES), names, HAND_NODES, errorTolerance)
+    queries = handNodeDistances(testHands, HAND_NODES)
+    start = time.perf_counter()
+    gestures = [matcher.classify(query) for query in queries]
+    elapsed = (time.perf_counter() - start)/max(1, len(queries))
+    correct = np.mean([gesture == name for gesture, name in zip(gestures, testNames)])
+    unknown = np.mean([gesture == 'Unknown' for gesture in gestures])
+    return correct, unknown, elapsed
+
+def report(label, hands, names, heldOut, noisy):
+    """
+    report() prints how a library does on the held-out recordings and on
+    their perturbed copies
+
+    :param label: library described in the row
+    :param hands: (N, 21, 2) library landmarks
+    :param names: gesture name per library template
+    :param heldOut: held-out landmarks, gesture name per recording
+    :param noisy: perturbed copies of them, gesture name per copy
+    """
+    accuracy, unknown, _ = evaluate(hands, names, *heldOut)
+    noisyAccuracy, noisyUnknown, elapsed = evaluate(hands, names, *noisy)
+    print('{:<20} {:>10} {:>10.1%} {:>10.1%} {:>10.1%} {:>10.1%} {:>12.1f}'.format(label, len(names), accuracy, unknown,
+        noisyAccuracy, noisyUnknown, elapsed*1e6))
+
+if __name__ == "__main__":
+   main()
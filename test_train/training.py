@@ -5,14 +5,17 @@
 # version = 1.0
 # ---------------------------------------------------------------------------
 
-import socket
 import ssl
+import time
 from unicodedata import name
 import cv2
 import mediapipe as mp
 import numpy as np
 import csv
-from urllib.request import urlopen
+from dynamics import DYNAMIC_LIBRARY_PATH, saveTemplates
+from features import handNodeDistances
+from library import LIBRARY_PATH, saveLibrary
+from connection import ConnectionManager, openURL
 
 # url for live video liveStream
 ## input your livestream url here
@@ -31,6 +34,15 @@ handNodes=[0,4,5,9,13,17,8,12,16,20]
 # level of error for prediction
 errorTolerance=10
 
+# seconds of landmarks recorded after R is pressed
+CLIP_SECONDS=1.5
+
+# fewest frames with a hand in them for a recording to count
+MIN_CLIP_FRAMES=5
+
+# every frame of the still gesture clips, for train_offline.py to augment and prune
+STILL_CLIPS_PATH='./aggregate_gesture_data/still_clips'
+
 def main():
     """
     main() controls training flow of gesture data collection 
@@ -48,76 +60,90 @@ def main():
         trainGestureCount=0
         knownGestures=[]
         finalHandsData = []
+        staticNames = []
 
-        # ask user for gesture data input
-        gestureNames, numGest = getTrainingData()
+        # motion gesture clips (landmarks and frame times)
+        clips = []
+        clipTimes = []
+        clipNames = []
 
-        liveStream = connectToStream()
+        # every frame of the still gesture clips
+        stillHands = []
+        stillNames = []
 
-        # bit sequence to hold JPG data as it comes from stream (LIVE)
-        bitSequence=b''
+        # (time, hand) of the clip being recorded, None while waiting for R
+        recording = None
+
+        # ask user for gesture data input
+        gestureNames, numGest, motionGestures = getTrainingData()
+
+        # pulls JPGs out of the stream as they come, reconnecting in place
+        # so the model and the gestures recorded so far survive drops (LIVE)
+        connection = ConnectionManager(connectToStream, CAMERA_BUFFER_SIZE)
 
         # while training is active
-        while True:
-            try:
-                # begin decoding the JPGs in stream
-                myHands=[]
-                bitSequence+=liveStream.read(CAMERA_BUFFER_SIZE)
-                jpgHead=bitSequence.find(b'\xff\xd8')
-                jpgEnd=bitSequence.find(b'\xff\xd9')
-                # check if non-corrupted JPG (full data)
-                if isValidJPEG(jpgHead, jpgEnd):
-                    jpg=bitSequence[jpgHead:jpgEnd+2]
-                    bitSequence=bitSequence[jpgEnd+2:]
-
-                    # fully formed image ready to apply Mediapipe algorithm on
-                    image, handResults = imageSetup(jpg, hands)
-
-                    # check amount of landmarks
-                    if handResults.multi_hand_landmarks:
-                        # set nodes onto hand
-                        myHand = setLandmarks(handResults, mp_drawing, image, mp_hands)
-                        # extract data
-                        myHands.append(myHand)
-                        # check if hand data points exist
-                        if myHands!=[]:
-                            print('Show gesture by the name of ',gestureNames[trainGestureCount],': Press R to record gesture (hold still)!')
-                            if cv2.waitKey(1) & 0xff==ord('r'):
-                                # record data and save to CSV
-                                finalHandsData, knownGestures = addTrainingData(myHands, finalHandsData, myHand, knownGestures)
-                                trainGestureCount=trainGestureCount+1
-                                if trainGestureCount==numGest:
-                                    saveToCSV(finalHandsData, gestureNames)
-                                    print("\nTraining has been completed. Please check CSV to ensure gestures were recorded.\n\nGoodbye!")
-                                    break
-                    # flip image for non-mirrored effect
-                    cv2.imshow('MediaPipe Hands', cv2.flip(image, 1))
-                    if cv2.waitKey(5) & 0xFF == 27:
-                        break
-            # error handling for live stream
-            except socket.timeout as error:        
-                print("Error: timeout error encountered.")
-                return main()
-            except OSError as error:
-                print("Error: check connection to live stream.")
-                return main()
+        for jpg in connection.frames():
+            # begin decoding the JPGs in stream
+            myHands=[]
+
+            # fully formed image ready to apply Mediapipe algorithm on
+            image, handResults = imageSetup(jpg, hands)
+
+            # check amount of landmarks
+            if handResults.multi_hand_landmarks:
+                # set nodes onto hand
+                myHand = setLandmarks(handResults, mp_drawing, image, mp_hands)
+                # extract data
+                myHands.append(myHand)
+                if recording is not None:
+                    # keep collecting the clip until CLIP_SECONDS have passed
+                    recording.append((time.time(), myHand))
+                # check if hand data points exist
+                elif myHands!=[]:
+                    if motionGestures[trainGestureCount]:
+                        print('Show gesture by the name of ',gestureNames[trainGestureCount],': Press R, then perform the motion!')
+                    else:
+                        print('Show gesture by the name of ',gestureNames[trainGestureCount],': Press R to record gesture (hold still)!')
+                    if cv2.waitKey(1) & 0xff==ord('r'):
+                        recording = [(time.time(), myHand)]
+
+            if recording is not None and time.time() - recording[0][0] >= CLIP_SECONDS:
+                clipHands = [hand for _, hand in recording]
+                if len(clipHands) < MIN_CLIP_FRAMES:
+                    print('Hand was lost while recording, press R to try again.')
+                elif motionGestures[trainGestureCount]:
+                    clips.append(clipHands)
+                    clipTimes.append([frameTime for frameTime, _ in recording])
+                    clipNames.append(gestureNames[trainGestureCount])
+                    trainGestureCount=trainGestureCount+1
+                else:
+                    # a still gesture keeps the middle frame of its clip
+                    middleHand = clipHands[len(clipHands)//2]
+                    finalHandsData, knownGestures = addTrainingData([middleHand], finalHandsData, middleHand, knownGestures)
+                    staticNames.append(gestureNames[trainGestureCount])
+                    stillHands += clipHands
+                    stillNames += [gestureNames[trainGestureCount]]*len(clipHands)
+                    trainGestureCount=trainGestureCount+1
+                recording = None
+                if trainGestureCount==numGest:
+                    # record data and save to CSV
+                    saveTrainingData(finalHandsData, staticNames, clips, clipTimes, clipNames, stillHands, stillNames)
+                    print("\nTraining has been completed. Please check CSV/library to ensure gestures were recorded.\n\nGoodbye!")
+                    break
+            # flip image for non-mirrored effect
+            cv2.imshow('MediaPipe Hands', cv2.flip(image, 1))
+            if cv2.waitKey(5) & 0xFF == 27:
+                break
+        print('Connection: ' + str(connection.counters()))
 
 def connectToStream():
     """
     connectToStream() establishes the connection between the live stream
-    and the python script, ongoing attempt until connection is established
+    and the python script (ConnectionManager retries with backoff when it raises)
 
     :return: live stream data
     """ 
-    while True:
-        try:
-            ctx = ctxDefinition()
-            liveStream = urlopen(url, context=ctx, timeout=2)
-            return liveStream    
-        except socket.timeout as error:
-            print("Error: timeout error encountered.")
-        except OSError as error:
-            print("Error: check connection to live stream.")
+    return openURL(url, ctxDefinition())
 
 def ctxDefinition():
     """
@@ -145,63 +171,27 @@ def findDistances(gestureDataPoints):
     hand nodes (palm and fingers)
 
     :param gestureDataPoints: distance between handNodes
-    :return: distanceMatrix
+    :return: handNodes feature vector
     """ 
-    distanceMatrix, lengthOfGestureDataPoints = generateDistanceMatrix(gestureDataPoints)
-    palmSize=generatePalmSize(gestureDataPoints)
-    distanceMatrix = populateDistanceMatrix(gestureDataPoints, lengthOfGestureDataPoints, palmSize, distanceMatrix)
-    return distanceMatrix
-
-def generateDistanceMatrix(gestureDataPoints):
-    """
-    generateDistanceMatrix() creates an empty numpy array given of data points
-
-    :param gestureDataPoints: distance between handNodes
-    :return: distanceMatrix, lengthOfGestureDataPoints
-    """ 
-    lengthOfGestureDataPoints = len(gestureDataPoints)
-    distanceMatrix = np.zeros([lengthOfGestureDataPoints, lengthOfGestureDataPoints],dtype='float')
-    return distanceMatrix, lengthOfGestureDataPoints
-
-def generatePalmSize(gestureDataPoints):
-    """
-    generatePalmSize() calculates size of palm given node data
-
-    :param gestureDataPoints: distance between handNodes
-    :return: palmSize
-    """ 
-    palmSize=((gestureDataPoints[0][0]-gestureDataPoints[9][0])**2+(gestureDataPoints[0][1]-gestureDataPoints[9][1])**2)**(1./2.)
-    return palmSize
-
-def populateDistanceMatrix(gestureDataPoints, lengthOfGestureDataPoints, palmSize, distanceMatrix):
-    """
-    populateDistanceMatrix() matches data to matrix points from gesture hand nodes
-
-    :param gestureDataPoints: distance between handNodes
-    :param lengthOfGestureDataPoints: number of data points
-    :param palmSize: computed palm size
-    :param distanceMatrix: empty matrix
-    :return: distanceMatrix
-    """ 
-    for row in range(0, lengthOfGestureDataPoints):
-        for column in range(0, lengthOfGestureDataPoints):
-            distanceMatrix[row][column]=(((gestureDataPoints[row][0]-gestureDataPoints[column][0])**2+(gestureDataPoints[row][1]-gestureDataPoints[column][1])**2)**(1./2.))/palmSize
-    return distanceMatrix
+    return handNodeDistances(gestureDataPoints, handNodes)[0]
 
 def getTrainingData():
     """
     getTrainingData() guides user through training process
 
-    :return: gestureNames, gestCount
+    :return: gestureNames, gestCount, motionGestures (True for gestures that move)
     """ 
     welcomeMessage()
     gestCount=int(input())
     gestureNames=[]
+    motionGestures=[]
     for gestureNum in range(1, gestCount+1):
         nameGestureX='What would you like to name gesture #'+ str(gestureNum) +'\n'
         gestureName=input(nameGestureX)
         gestureNames.append(gestureName)
-    return gestureNames, gestCount
+        isMotion=input('Is '+ gestureName +' a motion gesture, like a swipe? (y/n)\n')
+        motionGestures.append(isMotion.strip().lower().startswith('y'))
+    return gestureNames, gestCount, motionGestures
 
 def welcomeMessage():
     """
@@ -210,19 +200,6 @@ def welcomeMessage():
     print('Hello!\nWelcome to GESI (GESTURE ENABLED SYSTEM INTERACTION)...')
     print('How many gestures would you like to train on?\n')
 
-def isValidJPEG(jpgHead, jpgEnd):
-    """
-    isValidJPEG() checks if JPEG is not corrupt (allowing for stream to progress)
-
-    :param jpgHead: head of JPG file data
-    :param jpgEnd: tail of JPG file data
-    :return: boolean
-    """ 
-    if jpgHead>-1 and jpgEnd>-1:
-        return True
-    else:
-        return False
-
 def setLandmarks(handResults, mp_drawing, image, mp_hands):
     """
     setLandmarks() takes hand data and sets landmarks from mediapipe algorithm
@@ -291,6 +268,29 @@ def addTrainingData(myHands, finalHandsData, myHand, knownGestures):
     knownGestures.append(knownGesture)
     return finalHandsData, knownGestures
 
+def saveTrainingData(finalHandsData, staticNames, clips, clipTimes, clipNames, stillHands=(), stillNames=()):
+    """
+    saveTrainingData() saves still gestures to CSV and the gesture library,
+    and motion gesture clips to the dynamic library
+
+    :param finalHandsData: hand data of still gestures
+    :param staticNames: names of still gestures
+    :param clips: landmarks of every motion gesture clip
+    :param clipTimes: frame times of every motion gesture clip
+    :param clipNames: names of motion gestures
+    :param stillHands: every frame of the still gesture clips
+    :param stillNames: gesture name of every frame in stillHands
+    """ 
+    if staticNames:
+        saveToCSV(finalHandsData, staticNames)
+        saveLibrary(LIBRARY_PATH, finalHandsData, staticNames, handNodes)
+    if stillNames:
+        saveLibrary(STILL_CLIPS_PATH, stillHands, stillNames, handNodes, {'source': 'training'})
+        print('Kept ' + str(len(stillNames)) + ' frames of still gestures in ' + STILL_CLIPS_PATH
+            + ', run train_offline.py --bundle ' + STILL_CLIPS_PATH + ' to build a larger library from them')
+    if clipNames:
+        saveTemplates(DYNAMIC_LIBRARY_PATH, clips, clipTimes, clipNames, handNodes)
+
 def saveToCSV(finalHandsData, gestureNames):
     """
     saveToCSV() saves hand data and gesture names to CSV